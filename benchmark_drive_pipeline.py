@@ -0,0 +1,105 @@
+"""
+Drive Pipeline Benchmark
+Measures end-to-end Drive automation throughput (files/sec) on a fake drive
+
+Usage:
+    python benchmark_drive_pipeline.py [files] [latency_ms] [quota_per_second]
+
+Runs GoogleDriveAutomation.process_all_files against an in-memory
+FakeDriveService with simulated round-trip latency and a per-second request
+quota (requests over it fail with 429), once per mode:
+  - batched: listing, classification and batched moves in sequence
+  - pipeline: move batches sent from DRIVE_MAX_IN_FLIGHT worker threads
+    while listing and classification continue
+The token bucket runs at 90% of the fake quota so requests stay under it.
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+from fake_drive_service import FakeDriveService
+from gdrive_manager import GoogleDriveManager, TokenBucket
+from gdrive_automation import GoogleDriveAutomation
+from state_manager import StateManager
+from config import DRIVE_MAX_IN_FLIGHT
+
+
+SAMPLE_NAMES = [
+    "Semester_Transcript_2024.pdf",
+    "Docker_Kubernetes_Setup.md",
+    "Capstone_Project_Proposal.docx",
+    "API_Integration_Guide.pdf",
+    "Research_Methodology_Notes.txt"
+]
+
+
+def print_header(text):
+    """Print formatted header"""
+    print("\n" + "="*70)
+    print(f"  {text}")
+    print("="*70)
+
+
+def build_automation(file_count, latency, quota, state_dir):
+    """Create a fake drive of file_count files in root and an automation over it"""
+    service = FakeDriveService(latency=latency, quota_per_second=quota)
+    for i in range(file_count):
+        service.add_file(f"{i:05d}_{SAMPLE_NAMES[i % len(SAMPLE_NAMES)]}")
+
+    manager = GoogleDriveManager(service=service, state_manager=StateManager(state_dir))
+    manager.rate_limiter = TokenBucket(quota * 0.9, min(quota, 100)) if quota else None
+
+    automation = GoogleDriveAutomation(drive_manager=manager)
+    with contextlib.redirect_stdout(io.StringIO()):
+        automation.setup_folders()
+    return automation, service
+
+
+def run_benchmark(file_count=10000, latency_ms=20, quota=2000):
+    """
+    Time each Drive processing mode
+
+    Args:
+        file_count: Files in the fake drive root
+        latency_ms: Simulated round-trip latency per HTTP request
+        quota: Fake per-second request quota (0 = unlimited)
+
+    Returns:
+        Dict of mode -> files/sec
+    """
+    print_header("DRIVE PIPELINE BENCHMARK")
+    print(f"Files: {file_count}, latency: {latency_ms} ms, quota: {quota or 'unlimited'} requests/sec, "
+          f"in flight: {DRIVE_MAX_IN_FLIGHT}\n")
+
+    results = {}
+    for mode in ("batched", "pipeline"):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            automation, service = build_automation(file_count, latency_ms / 1000, quota, Path(temp_dir))
+            run_id, _ = automation.state_manager.start_run()
+            summary = automation.process_all_files(run_id, pipeline=(mode == "pipeline"))
+            automation.state_manager.close()
+
+        results[mode] = summary["files_per_second"]
+        print(f"{mode:<10} {summary['elapsed_seconds']:>8.2f}s  {summary['files_per_second']:>10,.0f} files/sec  "
+              f"moved {summary['successful_moves']}, errors {summary['errors']}, "
+              f"429s {service.calls['rate_limited']}")
+
+    print(f"\nPipeline vs batched speedup: {results['pipeline'] / results['batched']:.1f}x")
+    return results
+
+
+if __name__ == "__main__":
+    file_count = 10000
+    latency_ms = 20
+    quota = 2000
+
+    if len(sys.argv) > 1:
+        file_count = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        latency_ms = float(sys.argv[2])
+    if len(sys.argv) > 3:
+        quota = int(sys.argv[3])
+
+    run_benchmark(file_count, latency_ms, quota)
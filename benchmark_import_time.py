@@ -0,0 +1,120 @@
+"""
+Import Time Benchmark
+Measures the cold-start latency of desktop_automation.py
+
+Usage:
+    python benchmark_import_time.py [runs]
+
+Each measurement starts a fresh interpreter (so nothing is cached in
+sys.modules) and times it until the import finishes:
+  - interpreter: python -c pass (the floor every run pays)
+  - eager: desktop_automation plus every parser library, which is what each
+    start cost when file_parser imported them at module level
+  - lazy: desktop_automation alone; parser libraries load on first use
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+PARSER_MODULES = ("docx", "openpyxl", "pptx", "PyPDF2")
+
+SCENARIOS = {
+    "interpreter": "pass",
+    "eager": "import desktop_automation, file_parser; file_parser.preload_libraries()",
+    "lazy": "import desktop_automation",
+}
+
+# Printed by the child so the parent can check which libraries were loaded
+LOADED_PROBE = "import json, sys; print('LOADED', json.dumps([m for m in {modules!r} if m in sys.modules]))"
+
+
+def print_header(text):
+    """Print formatted header"""
+    print("\n" + "="*70)
+    print(f"  {text}")
+    print("="*70)
+
+
+def time_command(code):
+    """
+    Run code in a fresh interpreter from the repository folder
+
+    Returns:
+        (seconds, loaded parser modules)
+    """
+    probe = LOADED_PROBE.format(modules=PARSER_MODULES)
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", f"{code}\n{probe}"],
+        cwd=Path(__file__).resolve().parent,
+        capture_output=True,
+        text=True
+    )
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip())
+    loaded = []
+    for line in completed.stdout.splitlines():
+        if line.startswith("LOADED "):
+            loaded = json.loads(line[len("LOADED "):])
+    return elapsed, loaded
+
+
+def run_benchmark(runs=10):
+    """
+    Time cold starts for each scenario
+
+    Args:
+        runs: Fresh interpreters per scenario (the median is reported)
+
+    Returns:
+        {scenario: {"median_ms": float, "min_ms": float, "loaded": list}}
+    """
+    print_header("IMPORT TIME BENCHMARK (desktop_automation.py cold start)")
+    print(f"Python: {sys.executable}")
+    print(f"Runs per scenario: {runs}\n")
+
+    # One untimed start so the first scenario does not pay for cold disk caches
+    time_command("import desktop_automation")
+
+    results = {}
+    for name, code in SCENARIOS.items():
+        timings = []
+        loaded = []
+        for _ in range(runs):
+            elapsed, loaded = time_command(code)
+            timings.append(elapsed * 1000)
+        results[name] = {
+            "median_ms": statistics.median(timings),
+            "min_ms": min(timings),
+            "loaded": loaded
+        }
+
+    print(f"{'Scenario':<14} {'Median (ms)':>12} {'Min (ms)':>10}  Parser libraries loaded")
+    print("-"*75)
+    for name, result in results.items():
+        print(f"{name:<14} {result['median_ms']:>12.1f} {result['min_ms']:>10.1f}  "
+              f"{', '.join(result['loaded']) or '-'}")
+
+    floor = results["interpreter"]["median_ms"]
+    eager = results["eager"]["median_ms"] - floor
+    lazy = results["lazy"]["median_ms"] - floor
+    print(f"\nImport time above interpreter start: eager {eager:.1f} ms, lazy {lazy:.1f} ms")
+    if lazy > 0:
+        print(f"Speedup: {eager / lazy:.1f}x")
+
+    return results
+
+
+if __name__ == "__main__":
+    runs = 10
+
+    if len(sys.argv) > 1:
+        runs = int(sys.argv[1])
+
+    run_benchmark(runs)
@@ -0,0 +1,153 @@
+"""
+PDF Page Sampling Benchmark
+Compares full PDF extraction with page sampling for time and accuracy
+
+Usage:
+    python benchmark_pdf_sampling.py [folder] [long_pdf_pages]
+
+Every PDF in the folder (default: Desktop, as created by create_dataset.py)
+is classified twice: once reading every page and once with the sampling
+settings from config.py. The dataset PDFs are single pages, so each one is
+also expanded into a synthetic long PDF (default 200 pages) with its text
+spread through filler pages, which is where sampling pays off.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+import file_parser
+from classifier import score_text, build_classification
+
+
+FILLER_LINE = "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor."
+
+
+def print_header(text):
+    """Print formatted header"""
+    print("\n" + "="*70)
+    print(f"  {text}")
+    print("="*70)
+
+
+def build_long_pdf(source_pdf, target_pdf, page_count):
+    """
+    Write a long PDF that repeats the source PDF's text every 10 pages
+    with filler text on the other pages
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    source_text = file_parser.extract_text_from_pdf(source_pdf)
+    source_lines = [line for line in source_text.splitlines() if line.strip()]
+
+    c = canvas.Canvas(str(target_pdf), pagesize=letter)
+    for page in range(page_count):
+        lines = source_lines if page % 10 == 0 else [FILLER_LINE] * 40
+        y = 750
+        for line in lines:
+            c.drawString(50, y, line[:100])
+            y -= 16
+            if y < 50:
+                break
+        c.showPage()
+    c.save()
+
+
+def classify_pdf(pdf_path, strategy):
+    """Extract and classify a PDF with the given page strategy; return (category, seconds)"""
+    file_parser.PDF_PAGE_STRATEGY = strategy
+    start = time.perf_counter()
+    content = file_parser.extract_text_from_pdf(pdf_path)
+    filename_text = pdf_path.name.replace("_", " ").replace("-", " ")
+    scores, matched = score_text(filename_text, content)
+    elapsed = time.perf_counter() - start
+    return build_classification(pdf_path.name, scores, matched)["category"], elapsed
+
+
+def run_benchmark(folder, long_pdf_pages=200):
+    """
+    Benchmark full extraction against page sampling
+
+    Args:
+        folder: Folder containing PDFs
+        long_pdf_pages: Page count for synthetic long PDFs (0 = skip)
+
+    Returns:
+        {
+            "files": int,
+            "agreement": float (0-100),
+            "full_seconds": float,
+            "sample_seconds": float
+        }
+    """
+    folder = Path(folder)
+    pdfs = sorted(folder.glob("*.pdf"))
+    if not pdfs:
+        print(f"No PDF files found in {folder}")
+        return None
+
+    original_strategy = file_parser.PDF_PAGE_STRATEGY
+    work_dir = tempfile.TemporaryDirectory()
+
+    if long_pdf_pages:
+        long_pdfs = []
+        for pdf in pdfs:
+            target = Path(work_dir.name) / f"{pdf.stem}_Long.pdf"
+            try:
+                build_long_pdf(pdf, target, long_pdf_pages)
+                long_pdfs.append(target)
+            except ImportError:
+                print("[!] reportlab not installed - skipping synthetic long PDFs")
+                break
+        pdfs += long_pdfs
+
+    print_header("PDF PAGE SAMPLING BENCHMARK")
+    print(f"Folder: {folder}")
+    print(f"Sampling: first {file_parser.PDF_SAMPLE_FIRST_PAGES}, "
+          f"last {file_parser.PDF_SAMPLE_LAST_PAGES}, "
+          f"{file_parser.PDF_SAMPLE_SPACED_PAGES} evenly spaced\n")
+    print(f"{'File':<45} {'Full (s)':>9} {'Sample (s)':>11} {'Match':>6}")
+    print("-"*75)
+
+    totals = {"full": 0.0, "sample": 0.0}
+    matches = 0
+    try:
+        for pdf in pdfs:
+            full_category, full_time = classify_pdf(pdf, "full")
+            sample_category, sample_time = classify_pdf(pdf, "sample")
+            totals["full"] += full_time
+            totals["sample"] += sample_time
+            same = full_category == sample_category
+            matches += same
+            print(f"{pdf.name[:45]:<45} {full_time:>9.3f} {sample_time:>11.3f} {'yes' if same else 'NO':>6}")
+    finally:
+        file_parser.PDF_PAGE_STRATEGY = original_strategy
+        work_dir.cleanup()
+
+    agreement = matches / len(pdfs) * 100
+    speedup = totals["full"] / totals["sample"] if totals["sample"] else 0.0
+
+    print("-"*75)
+    print(f"{'Total':<45} {totals['full']:>9.3f} {totals['sample']:>11.3f}")
+    print(f"\nCategory agreement with full extraction: {agreement:.1f}%")
+    print(f"Speedup: {speedup:.1f}x")
+
+    return {
+        "files": len(pdfs),
+        "agreement": agreement,
+        "full_seconds": totals["full"],
+        "sample_seconds": totals["sample"]
+    }
+
+
+if __name__ == "__main__":
+    folder = Path.home() / "Desktop"
+    long_pdf_pages = 200
+
+    if len(sys.argv) > 1:
+        folder = Path(sys.argv[1])
+    if len(sys.argv) > 2:
+        long_pdf_pages = int(sys.argv[2])
+
+    run_benchmark(folder, long_pdf_pages)
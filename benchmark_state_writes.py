@@ -0,0 +1,137 @@
+"""
+State Write Benchmark
+Measures StateManager write throughput (rows/sec) for each write path
+
+Usage:
+    python benchmark_state_writes.py [rows]
+
+Compares, on a fresh database in a temp folder:
+  - per-row: a new connection and autocommit per row (the original StateManager)
+  - buffered: record_file_movement/record_run_detail with the write buffer
+  - bulk: record_file_movements/record_run_details with executemany
+"""
+
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from state_manager import StateManager
+
+
+# Original run_details insert, with the classification as a JSON blob
+LEGACY_RUN_DETAIL_SQL = '''
+    INSERT INTO run_details
+    (run_id, filename, classification_result, action_taken, action_status)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+
+def print_header(text):
+    """Print formatted header"""
+    print("\n" + "="*70)
+    print(f"  {text}")
+    print("="*70)
+
+
+def make_rows(run_id, count):
+    """Build (movement, detail) rows shaped like a real run"""
+    movements = []
+    details = []
+    for i in range(count):
+        filename = f"Document_{i:06d}.pdf"
+        classification = {
+            "filename": filename,
+            "category": "TECHNICAL_WORK",
+            "confidence_score": 0.8,
+            "keywords_matched": ["docker", "api"],
+            "reasoning": "Strong match on TECHNICAL_WORK with 2 keywords",
+            "all_scores": {"UNIVERSITY_DOCS": 1.0, "TECHNICAL_WORK": 8.0, "CAPSTONE_WORK": 0.0},
+            "status": "success"
+        }
+        fingerprint = (48 * 1024, 1_700_000_000_000_000_000 + i, f"{i:064x}")
+        movements.append((filename, "TECHNICAL_WORK", 0.8, f"/src/{filename}",
+                          f"/dst/Technical Work/{filename}", "success", fingerprint))
+        details.append((run_id, filename, classification, "Move to TECHNICAL_WORK", "success"))
+    return movements, details
+
+
+def write_per_row(db_path, movements, details):
+    """Original write path: connect, autocommit and close for every row"""
+    for movement, detail in zip(movements, details):
+        conn = sqlite3.connect(str(db_path), timeout=5.0)
+        conn.isolation_level = None
+        filename, category, confidence, source, destination, status, fingerprint = movement
+        conn.execute(StateManager.FILE_MOVEMENT_SQL, (filename, category, confidence, source,
+                                                      destination, status, datetime.now().isoformat(),
+                                                      *fingerprint))
+        conn.close()
+
+        conn = sqlite3.connect(str(db_path), timeout=5.0)
+        conn.isolation_level = None
+        run_id, filename, classification, action, status = detail
+        conn.execute(LEGACY_RUN_DETAIL_SQL,
+                     (run_id, filename, json.dumps(classification), action, status))
+        conn.close()
+
+
+def write_buffered(manager, movements, details):
+    """Single-row API with the write buffer"""
+    for movement, detail in zip(movements, details):
+        manager.record_file_movement(*movement)
+        manager.record_run_detail(*detail)
+    manager.flush()
+
+
+def write_bulk(manager, movements, details):
+    """Bulk API with executemany"""
+    manager.record_file_movements(movements)
+    manager.record_run_details(details)
+
+
+def run_benchmark(rows=2000):
+    """
+    Time each write path
+
+    Args:
+        rows: Files per run (each file writes 2 rows)
+
+    Returns:
+        Dict of write path -> rows/sec
+    """
+    print_header("STATE WRITE BENCHMARK")
+    print(f"Files per run: {rows} ({rows * 2} rows)\n")
+
+    results = {}
+    for name in ("per-row", "buffered", "bulk"):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = StateManager(temp_dir)
+            run_id, _ = manager.start_run()
+            movements, details = make_rows(run_id, rows)
+
+            start = time.perf_counter()
+            if name == "per-row":
+                manager.close()
+                write_per_row(Path(temp_dir) / "automation.db", movements, details)
+            elif name == "buffered":
+                write_buffered(manager, movements, details)
+            else:
+                write_bulk(manager, movements, details)
+            elapsed = time.perf_counter() - start
+            manager.close()
+
+            results[name] = rows * 2 / elapsed
+            print(f"{name:<10} {elapsed:>8.3f}s  {results[name]:>12,.0f} rows/sec")
+
+    print(f"\nBulk vs per-row speedup: {results['bulk'] / results['per-row']:.1f}x")
+    return results
+
+
+if __name__ == "__main__":
+    rows = 2000
+    if len(sys.argv) > 1:
+        rows = int(sys.argv[1])
+
+    run_benchmark(rows)
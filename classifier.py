@@ -3,9 +3,25 @@ Semantic Classifier Module
 Classifies documents based on keyword matching and semantic analysis
 """
 
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from config import CLASSIFICATION_KEYWORDS, FILENAME_WEIGHT, CONTENT_WEIGHT, SCORE_THRESHOLD
-from file_parser import extract_content
+from config import (
+    CLASSIFICATION_KEYWORDS, FILENAME_WEIGHT, CONTENT_WEIGHT, SCORE_THRESHOLD,
+    BATCH_MAX_WORKERS, BATCH_EXECUTOR, PROCESS_POOL_EXTENSIONS, STREAM_MAX_CHARS, STREAM_MAX_CHUNKS,
+    EARLY_EXIT_ENABLED, EARLY_EXIT_MAX_MATCH_DENSITY
+)
+from file_parser import extract_content, iter_content, text_length_bound
+from keyword_matcher import KeywordMatcher, get_matcher
+
+
+# Single matcher covering every category's keywords, compiled once at import
+CATEGORY_MATCHER = KeywordMatcher(
+    keyword
+    for category_info in CLASSIFICATION_KEYWORDS.values()
+    for keyword in category_info["keywords"]
+)
 
 
 def normalize_text(text):
@@ -18,68 +34,32 @@ def calculate_keyword_score(text, keywords):
     Calculate match score for a set of keywords in text
     Returns: number of matches
     """
-    matches = 0
-    text_lower = normalize_text(text)
-    
-    for keyword in keywords:
-        keyword_lower = keyword.lower()
-        # Count occurrences (case-insensitive)
-        matches += text_lower.count(keyword_lower)
+    keywords = tuple(keywords)
     
-    return matches
+    # Count occurrences (case-insensitive) in a single scan
+    return sum_keyword_counts(get_matcher(keywords).count(text), keywords)
 
 
-def classify_document(file_path):
+def sum_keyword_counts(counts, keywords):
     """
-    Classify a document into one of the predefined categories
+    Total per-keyword counts for a keyword list
+    Duplicate keywords in the list are counted once per entry
+    """
+    return sum(counts.get(normalize_text(keyword), 0) for keyword in keywords)
+
+
+def score_counts(filename_counts, content_counts, boundary_counts):
+    """
+    Turn per-keyword counts into category scores
     
     Args:
-        file_path: Path to the document file
+        filename_counts: Keyword counts for the filename text
+        content_counts: Keyword counts for the content
+        boundary_counts: Keyword counts across the "filename content" join
     
     Returns:
-        {
-            "filename": str,
-            "category": str,
-            "confidence_score": float (0-1),
-            "keywords_matched": list,
-            "reasoning": str,
-            "all_scores": dict,
-            "status": "success" or "error"
-        }
+        (scores, matched_keywords_per_category)
     """
-    
-    file_path = Path(file_path)
-    
-    if not file_path.exists():
-        return {
-            "filename": file_path.name,
-            "category": None,
-            "confidence_score": 0.0,
-            "keywords_matched": [],
-            "reasoning": f"File not found: {file_path}",
-            "all_scores": {},
-            "status": "error"
-        }
-    
-    # Extract filename and content
-    filename, content = extract_content(file_path)
-    
-    if filename is None:
-        return {
-            "filename": file_path.name,
-            "category": None,
-            "confidence_score": 0.0,
-            "keywords_matched": [],
-            "reasoning": "Could not extract content from file",
-            "all_scores": {},
-            "status": "error"
-        }
-    
-    # Prepare text for scoring
-    filename_text = filename.replace("_", " ").replace("-", " ")
-    full_text = f"{filename_text} {content}"
-    
-    # Calculate scores for each category
     scores = {}
     matched_keywords_per_category = {}
     
@@ -87,19 +67,57 @@ def classify_document(file_path):
         keywords = category_info["keywords"]
         
         # Score filename and content separately
-        filename_score = calculate_keyword_score(filename_text, keywords) * FILENAME_WEIGHT
-        content_score = calculate_keyword_score(content, keywords) * CONTENT_WEIGHT
-        
-        total_score = filename_score + content_score
-        scores[category] = total_score
+        filename_score = sum_keyword_counts(filename_counts, keywords) * FILENAME_WEIGHT
+        content_score = sum_keyword_counts(content_counts, keywords) * CONTENT_WEIGHT
+        scores[category] = filename_score + content_score
         
         # Track matched keywords
-        matched = []
-        for keyword in keywords:
-            if normalize_text(keyword) in normalize_text(full_text):
-                matched.append(keyword)
-        matched_keywords_per_category[category] = matched
+        matched_keywords_per_category[category] = [
+            keyword for keyword in keywords
+            if filename_counts.get(normalize_text(keyword))
+            or content_counts.get(normalize_text(keyword))
+            or boundary_counts.get(normalize_text(keyword))
+        ]
     
+    return scores, matched_keywords_per_category
+
+
+def count_boundary(filename_text, content_head):
+    """Count keywords spanning the join between filename and content"""
+    window = CATEGORY_MATCHER.max_length
+    return CATEGORY_MATCHER.count(f"{filename_text[-window:]} {content_head[:window]}")
+
+
+def score_text(filename_text, content):
+    """
+    Score filename and content against every category in one scan each
+    
+    Args:
+        filename_text: Filename with separators replaced by spaces
+        content: Extracted document text
+    
+    Returns:
+        (scores, matched_keywords_per_category)
+    """
+    return score_counts(
+        CATEGORY_MATCHER.count(filename_text),
+        CATEGORY_MATCHER.count(content),
+        count_boundary(filename_text, content)
+    )
+
+
+def build_classification(filename, scores, matched_keywords_per_category):
+    """
+    Pick the best category and build the classification result
+    
+    Args:
+        filename: Document filename
+        scores: Category -> score
+        matched_keywords_per_category: Category -> matched keywords
+    
+    Returns:
+        Classification result dict (see classify_document)
+    """
     # Find the category with the highest score
     best_category = max(scores, key=scores.get)
     best_score = scores[best_category]
@@ -133,20 +151,363 @@ def classify_document(file_path):
     }
 
 
-def batch_classify(file_paths):
+def error_result(filename, reasoning):
+    """Build a classification result for a file that could not be classified"""
+    return {
+        "filename": filename,
+        "category": None,
+        "confidence_score": 0.0,
+        "keywords_matched": [],
+        "reasoning": reasoning,
+        "all_scores": {},
+        "status": "error"
+    }
+
+
+def classify_document(file_path):
+    """
+    Classify a document into one of the predefined categories
+    
+    Args:
+        file_path: Path to the document file
+    
+    Returns:
+        {
+            "filename": str,
+            "category": str,
+            "confidence_score": float (0-1),
+            "keywords_matched": list,
+            "reasoning": str,
+            "all_scores": dict,
+            "status": "success" or "error"
+        }
+    """
+    
+    file_path = Path(file_path)
+    
+    if not file_path.exists():
+        return error_result(file_path.name, f"File not found: {file_path}")
+    
+    # Extract filename and content
+    filename, content = extract_content(file_path)
+    
+    if filename is None:
+        return error_result(file_path.name, "Could not extract content from file")
+    
+    return classify_content(filename, content)
+
+
+def classify_content(filename, content):
+    """
+    Classify a document from its already extracted text
+    
+    Args:
+        filename: Document filename
+        content: Extracted content text
+    
+    Returns:
+        Classification result, as from classify_document
+    """
+    # Prepare text for scoring
+    filename_text = filename.replace("_", " ").replace("-", " ")
+    
+    # Calculate scores for each category
+    scores, matched_keywords_per_category = score_text(filename_text, content)
+    
+    return build_classification(filename, scores, matched_keywords_per_category)
+
+
+def max_remaining_gain(remaining_chars):
+    """
+    Upper bound on the score each category can still gain
+    
+    Args:
+        remaining_chars: Upper bound on characters of content left to read
+    
+    Returns:
+        Category -> maximum additional score
+    """
+    gains = {}
+    for category, category_info in CLASSIFICATION_KEYWORDS.items():
+        keywords = category_info["keywords"]
+        if EARLY_EXIT_MAX_MATCH_DENSITY is None:
+            # Worst case: every keyword repeated back to back
+            matches = sum(remaining_chars // len(keyword) for keyword in keywords if keyword)
+        else:
+            matches = remaining_chars * EARLY_EXIT_MAX_MATCH_DENSITY
+        gains[category] = matches * CONTENT_WEIGHT
+    return gains
+
+
+def is_decided(scores, gains):
+    """
+    Check whether the remaining content can still change the outcome
+    
+    The outcome is decided when no other category can catch up with the
+    leader and the confidence cannot drop below SCORE_THRESHOLD, even if
+    every remaining match went to the other categories.
+    """
+    best_category = max(scores, key=scores.get)
+    best_score = scores[best_category]
+    
+    for category, score in scores.items():
+        if category != best_category and score + gains[category] >= best_score:
+            return False
+    
+    worst_total = sum(scores.values()) + sum(
+        gain for category, gain in gains.items() if category != best_category
+    )
+    return best_score / (worst_total + 1) >= SCORE_THRESHOLD
+
+
+def remaining_text_bound(text_bound, chars_read, max_chars):
+    """
+    Upper bound on the characters of content still unread
+    
+    Only guaranteed bounds are used (an estimate could end reading before
+    a later chunk changes the outcome): the file's text length bound from
+    text_length_bound() and the character budget. PDF and XLSX files have
+    neither unless max_chars is set, so they are read in full.
+    
+    Returns:
+        Character count, or None if no bound is known
+    """
+    bounds = []
+    if max_chars is not None:
+        bounds.append(max(max_chars - chars_read, 0))
+    if text_bound is not None:
+        bounds.append(max(text_bound - chars_read, 0))
+    return min(bounds) if bounds else None
+
+
+def classify_document_streaming(file_path, max_chars=None, max_chunks=None, early_exit=None):
+    """
+    Classify a document while streaming its content in chunks
+    
+    Text is scored as it is extracted and never held in memory as a whole,
+    so huge files classify in constant memory. The extraction cache is not
+    used in this mode.
+    
+    With early_exit, the filename is scored first and reading stops as soon
+    as the remaining content can no longer change the category or drop the
+    confidence below SCORE_THRESHOLD. Scores then cover only what was read.
+    
+    Args:
+        file_path: Path to the document file
+        max_chars: Stop reading after this many characters (default: config.STREAM_MAX_CHARS)
+        max_chunks: Stop after this many pages/paragraphs/rows/slides (default: config.STREAM_MAX_CHUNKS)
+        early_exit: Stop once the outcome is decided (default: config.EARLY_EXIT_ENABLED)
+    
+    Returns:
+        classify_document result plus:
+            "chars_read": int,
+            "chunks_read": int,
+            "budget_reached": bool,
+            "early_exit": bool,
+            "fraction_read": float or None (share of the file read, if known)
+    """
+    file_path = Path(file_path)
+    
+    if not file_path.exists():
+        return error_result(file_path.name, f"File not found: {file_path}")
+    
+    if max_chars is None:
+        max_chars = STREAM_MAX_CHARS
+    if max_chunks is None:
+        max_chunks = STREAM_MAX_CHUNKS
+    if early_exit is None:
+        early_exit = EARLY_EXIT_ENABLED
+    
+    filename = file_path.name
+    filename_text = filename.replace("_", " ").replace("-", " ")
+    file_size = file_path.stat().st_size
+    filename_counts = CATEGORY_MATCHER.count(filename_text)
+    
+    # Score content chunk by chunk, keeping only its head for the boundary check
+    content_stream = CATEGORY_MATCHER.stream()
+    content_head = ""
+    chunks_read = 0
+    progress = {}
+    text_bound = text_length_bound(file_path) if early_exit else None
+    exited_early = False
+    
+    chunks = iter_content(file_path, max_chars, max_chunks, progress)
+    while True:
+        if early_exit:
+            remaining = remaining_text_bound(text_bound, content_stream.chars_fed, max_chars)
+            # Nothing left to read is not an early exit
+            if remaining:
+                # Characters held back by the stream are still unscored
+                remaining += CATEGORY_MATCHER.max_length
+                scores, _ = score_counts(filename_counts, content_stream.counts, {})
+                if is_decided(scores, max_remaining_gain(remaining)):
+                    exited_early = True
+                    chunks.close()
+                    break
+        
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        if len(content_head) < CATEGORY_MATCHER.max_length:
+            content_head += chunk[:CATEGORY_MATCHER.max_length]
+        content_stream.feed(chunk)
+        chunks_read += 1
+    
+    scores, matched_keywords_per_category = score_counts(
+        filename_counts,
+        content_stream.finish(),
+        count_boundary(filename_text, content_head)
+    )
+    
+    chars_read = content_stream.chars_fed
+    budget_reached = (
+        (max_chars is not None and chars_read >= max_chars)
+        or (max_chunks is not None and chunks_read >= max_chunks)
+    )
+    
+    # Share of the file read, estimated from bytes (text) or chunks (others);
+    # pages left out by PDF sampling count as unread
+    skipped_chunks = progress.get("skipped_chunks", 0)
+    if not (exited_early or budget_reached or skipped_chunks):
+        fraction_read = 1.0
+    elif file_path.suffix.lower() in (".txt", ".md"):
+        fraction_read = min(chars_read / file_size, 1.0) if file_size else 1.0
+    elif progress.get("total_chunks"):
+        fraction_read = min(chunks_read / (progress["total_chunks"] + skipped_chunks), 1.0)
+    else:
+        fraction_read = None
+    
+    result = build_classification(filename, scores, matched_keywords_per_category)
+    result["chars_read"] = chars_read
+    result["chunks_read"] = chunks_read
+    result["budget_reached"] = budget_reached
+    result["early_exit"] = exited_early
+    result["fraction_read"] = fraction_read
+    return result
+
+
+def classify_safely(file_path):
+    """
+    Classify a document, turning any exception into an error result
+    so one bad file cannot abort a batch
+    """
+    try:
+        return classify_document(file_path)
+    except Exception as e:
+        return error_result(Path(file_path).name, f"Classification failed: {e}")
+
+
+def get_executor_kind(file_path, executor):
+    """
+    Pick the pool for a file
+    
+    Args:
+        file_path: Path to the document file
+        executor: "process", "thread" or "auto"
+    
+    Returns:
+        "process" or "thread"
+    """
+    if executor == "auto":
+        if Path(file_path).suffix.lower() in PROCESS_POOL_EXTENSIONS:
+            return "process"
+        return "thread"
+    if executor not in ("process", "thread"):
+        raise ValueError(f"Unknown executor mode: {executor}")
+    return executor
+
+
+def split_workers(kinds, max_workers):
+    """
+    Share the worker budget between the pools a batch needs
+    
+    Args:
+        kinds: Pool kind ("process" or "thread") of each file
+        max_workers: Total workers across all pools (at least 2)
+    
+    Returns:
+        {kind: workers}, sized by each kind's share of the files, with at
+        least one worker per kind and max_workers in total
+    """
+    counts = Counter(kinds)
+    if len(counts) == 1:
+        return {kind: max_workers for kind in counts}
+    process_workers = round(max_workers * counts["process"] / len(kinds))
+    process_workers = min(max(process_workers, 1), max_workers - 1)
+    return {"process": process_workers, "thread": max_workers - process_workers}
+
+
+def iter_classify(file_paths, max_workers=None, executor=None):
+    """
+    Classify multiple files, yielding results as they complete
+    
+    Args:
+        file_paths: Iterable of file paths
+        max_workers: Number of workers (default: config.BATCH_MAX_WORKERS,
+                     None there means one per CPU); with "auto" this total is
+                     shared between the process and thread pools
+        executor: "process", "thread" or "auto" (default: config.BATCH_EXECUTOR)
+    
+    Yields:
+        (index, result) tuples in completion order, where index is the
+        position of the file in file_paths
+    """
+    file_paths = list(file_paths)
+    if max_workers is None:
+        max_workers = BATCH_MAX_WORKERS or os.cpu_count() or 1
+    executor = executor or BATCH_EXECUTOR
+    
+    # Sequential path: no pool start-up cost
+    if max_workers <= 1 or len(file_paths) <= 1:
+        for index, file_path in enumerate(file_paths):
+            yield index, classify_safely(file_path)
+        return
+    
+    kinds = [get_executor_kind(file_path, executor) for file_path in file_paths]
+    workers = split_workers(kinds, max_workers)
+    pools = {}
+    futures = {}
+    # Process jobs go first so every worker is forked before a thread
+    # (which could be holding a lock) starts
+    order = sorted(range(len(file_paths)), key=lambda index: kinds[index] != "process")
+    try:
+        for index in order:
+            file_path, kind = file_paths[index], kinds[index]
+            if kind not in pools:
+                pool_class = ProcessPoolExecutor if kind == "process" else ThreadPoolExecutor
+                pools[kind] = pool_class(max_workers=workers[kind])
+            futures[pools[kind].submit(classify_safely, file_path)] = index
+        
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # Worker process died (e.g. crash inside a parser)
+                result = error_result(Path(file_paths[index]).name, f"Worker failed: {e}")
+            yield index, result
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def batch_classify(file_paths, max_workers=None, executor=None):
     """
     Classify multiple files
     
     Args:
         file_paths: List of file paths
+        max_workers: Number of workers (default: config.BATCH_MAX_WORKERS)
+        executor: "process", "thread" or "auto" (default: config.BATCH_EXECUTOR)
     
     Returns:
-        List of classification results
+        List of classification results, in the same order as file_paths
+        regardless of which worker finished first
     """
-    results = []
-    for file_path in file_paths:
-        result = classify_document(file_path)
-        results.append(result)
+    file_paths = list(file_paths)
+    results = [None] * len(file_paths)
+    for index, result in iter_classify(file_paths, max_workers, executor):
+        results[index] = result
     
     return results
 
@@ -55,7 +55,85 @@ SUPPORTED_EXTENSIONS = {
     ".txt": "text"
 }
 
+# Desktop move settings
+MOVE_FAST_PATH = True      # One no-replace rename per move (False = stat checks + shutil.move)
+
+# Desktop scan settings
+SCAN_RECURSIVE = False     # Descend into subfolders (category folders are never descended into)
+SCAN_MAX_DEPTH = None      # Subfolder levels when recursive (None = unlimited)
+SCAN_INCLUDE = []          # Glob patterns files must match, by name or relative path (empty = all)
+SCAN_EXCLUDE = []          # Glob patterns for files and folders to skip (e.g. "node_modules")
+SCAN_WORKERS = 8           # Threads listing directories in recursive scans (1 = single-threaded)
+
+# Batch classification settings
+BATCH_MAX_WORKERS = 1      # Worker count for batch_classify (1 = sequential, None = all CPUs; "auto" splits it across pools)
+BATCH_EXECUTOR = "auto"    # "process", "thread" or "auto" (processes for binary formats)
+PROCESS_POOL_EXTENSIONS = {".pdf", ".docx", ".xlsx", ".pptx"}  # CPU-bound parsers
+
+# Staged pipeline settings (scan -> extract -> classify -> move -> state writer)
+PIPELINE_ENABLED = False   # Run process_all_files as concurrent stages instead of file by file
+PIPELINE_QUEUE_SIZE = 64   # Items each queue between stages holds before the stage feeding it waits
+PIPELINE_EXTRACT_WORKERS = None  # Extractor threads (None = one per CPU); binary formats parse in
+                                 # a process pool of the same size (see BATCH_EXECUTOR)
+
+# XLSX extraction caps (None = no limit)
+XLSX_MAX_SHEETS = 20       # Sheets read per workbook
+XLSX_MAX_ROWS = 5000       # Rows read per sheet
+XLSX_MAX_CELLS = 100000    # Non-empty cells read per workbook
+
+# PDF page selection: "full" reads every page, "sample" reads a subset
+# (sampling can change the category of long PDFs; opt in after checking
+# benchmark_pdf_sampling.py on your documents)
+PDF_PAGE_STRATEGY = "full"
+PDF_SAMPLE_FIRST_PAGES = 5     # Leading pages (title, abstract, introduction)
+PDF_SAMPLE_LAST_PAGES = 1      # Trailing pages (conclusion, references)
+PDF_SAMPLE_SPACED_PAGES = 4    # Pages evenly spaced through the rest
+
+# Streaming classification budgets (None = read the whole file)
+STREAM_MAX_CHARS = None    # Characters of extracted text to score
+STREAM_MAX_CHUNKS = None   # Pages (PDF), paragraphs (DOCX), rows (XLSX) or slides (PPTX)
+
+# Early-exit classification (classify_document_streaming)
+EARLY_EXIT_ENABLED = False          # TXT, MD, DOCX and PPTX (PDF/XLSX only with STREAM_MAX_CHARS)
+EARLY_EXIT_MAX_MATCH_DENSITY = 0.05  # Max keyword hits per character assumed for unread text (the
+                                     # densest sample document has 0.048; None = strict worst case,
+                                     # every keyword back to back, which rarely exits before the end)
+
+# Extraction cache settings
+EXTRACTION_CACHE_ENABLED = True
+EXTRACTION_CACHE_PATH = None  # None = ~/.document_classifier/extraction_cache.db
+EXTRACTION_CACHE_MAX_BYTES = 256 * 1024 * 1024  # LRU eviction above this much text
+
+# Extraction service settings (python extraction_service.py start)
+EXTRACTION_SERVICE_ENABLED = False  # Extract through a running service with warm parsers (local when none answers)
+EXTRACTION_SERVICE_ADDRESS = None   # None = ~/.document_classifier/extractor.sock (a named pipe on Windows)
+EXTRACTION_SERVICE_WORKERS = None   # Warm worker processes (None = one per CPU)
+EXTRACTION_SERVICE_AUTOSTART = False  # Start the service in the background when none is running
+EXTRACTION_SERVICE_RETRY_SECONDS = 30  # Wait after a failed connection before trying the service again
+
+# Google Drive settings
+DRIVE_PAGE_SIZE = 1000     # files().list page size (the API maximum)
+DRIVE_LIST_FIELDS = "id, name, mimeType, parents, size"  # Per-file fields requested when listing
+DRIVE_PREFETCH_PAGES = True  # Fetch the next page while the current one is processed
+DRIVE_BATCH_SIZE = 100     # Requests per HTTP batch (the API maximum)
+DRIVE_MAX_RETRIES = 3      # Retries for rate-limit/server errors, per request or batch item
+DRIVE_RETRY_BASE_DELAY = 1.0  # Seconds before the first retry (doubles each retry)
+DRIVE_REQUESTS_PER_SECOND = 150  # Token-bucket rate, under the 12,000/minute per-user quota (None = off)
+DRIVE_RATE_BURST = 100     # Token-bucket capacity (one full batch)
+DRIVE_MAX_IN_FLIGHT = 4    # Concurrent batch requests in the pipelined Drive mode
+DRIVE_CONTENT_CLASSIFICATION = False  # Classify Drive files by content, not just filename
+DRIVE_CONTENT_MAX_BYTES = 2 * 1024 * 1024  # Per-file download budget for content classification
+DRIVE_INCREMENTAL_SYNC = False  # Process only Drive changes since the last run (Changes API)
+
 # Database settings
 DATABASE_PATH = None  # Will be set dynamically to Desktop/automation.db
+STATE_WRITE_BATCH_SIZE = 500  # Buffered state writes per transaction (also flushed at end_run)
+INCREMENTAL_RUNS = False  # Reuse stored classifications for files whose fingerprint is unchanged
+
+# Watch mode settings (desktop_automation.py --watch)
+WATCH_BACKEND = "auto"     # "inotify" (Linux), "poll", or "auto" (inotify when available)
+WATCH_POLL_INTERVAL = 0.25  # Seconds between checks of the directory and of files still being written
+WATCH_SETTLE_SECONDS = 0.5  # A file is processed once its size and mtime hold this long
+WATCH_RESCAN_INTERVAL = 60  # Seconds between full rescans even if nothing signalled a change
 
 print("[OK] Configuration loaded")
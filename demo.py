@@ -30,11 +30,14 @@ def demo_desktop_automation_cli():
     
     desktop_path = os.path.expanduser("~/Desktop")
     
-    # Clean up database
+    # Clean up database (and its WAL files)
     db_path = os.path.join(desktop_path, "automation.db")
     if os.path.exists(db_path):
         os.remove(db_path)
         print("✅ Cleaned old database")
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
     
     # Run automation
     cmd = [
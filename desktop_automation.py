@@ -7,7 +7,9 @@ import sys
 from pathlib import Path
 from datetime import datetime
 from orchestrator import FileOrchestrator
+from desktop_watcher import DesktopWatcher
 from state_manager import StateManager
+from file_parser import get_extraction_cache
 
 
 def print_header(text):
@@ -23,13 +25,15 @@ def print_section(text):
     print("-"*70)
 
 
-def run_automation(desktop_path=None, run_limit=5):
+def run_automation(desktop_path=None, run_limit=5, recursive=None, pipeline=None):
     """
     Run the automated file classification and movement
     
     Args:
         desktop_path: Path to Desktop (defaults to user Desktop)
         run_limit: Maximum number of runs to execute (for testing)
+        recursive: Also process files in subfolders (default: SCAN_RECURSIVE)
+        pipeline: Run the stages concurrently (default: PIPELINE_ENABLED)
     
     Returns:
         Overall summary of all runs
@@ -69,7 +73,7 @@ def run_automation(desktop_path=None, run_limit=5):
         
         # Process all files
         print("\n[*] Processing files...")
-        results = orchestrator.process_all_files(run_id)
+        results = orchestrator.process_all_files(run_id, recursive=recursive, pipeline=pipeline)
         
         # Update state manager
         state_manager.end_run(
@@ -87,6 +91,17 @@ def run_automation(desktop_path=None, run_limit=5):
         print(f"   Successfully moved: {results['successful_moves']}")
         print(f"   Already in place: {results['skipped_files']}")
         print(f"   Failed: {results['failed']}")
+        print(f"   Reused (unchanged): {results['reused']}")
+        print(f"   Re-evaluated: {results['reevaluated']}")
+        
+        # Per-stage throughput shows which stage limits a pipelined run
+        if "stages" in results:
+            print(f"\n⚙️  Pipeline stages:")
+            for stage, stage_stats in results["stages"].items():
+                print(f"   {stage:<9} {stage_stats['items']:>6} items  "
+                      f"{stage_stats['items_per_second']:>9.1f}/s per worker  "
+                      f"{stage_stats['utilization']:>4.0%} busy  "
+                      f"queue avg {stage_stats['avg_queue_depth']:.1f} max {stage_stats['max_queue_depth']}")
         
         # Print file details
         print(f"\n📄 File Details:")
@@ -120,6 +135,15 @@ def run_automation(desktop_path=None, run_limit=5):
     print(f"Total runs: {len(overall_results['runs'])}")
     print(f"Consistency across runs: {overall_results['consistency']:.1f}%")
     
+    # Extraction cache savings
+    cache = get_extraction_cache()
+    if cache is not None:
+        cache_stats = cache.get_stats()
+        overall_results["extraction_cache"] = cache_stats
+        print(f"Extraction cache: {cache_stats['hits'] + cache_stats['hash_hits']} hits, "
+              f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%} hit rate), "
+              f"{cache_stats.get('entries', 0)} entries")
+    
     # Analyze cross-run consistency
     print_section("Cross-Run Analysis")
     analyze_consistency(overall_results["runs"])
@@ -135,6 +159,44 @@ def run_automation(desktop_path=None, run_limit=5):
     return overall_results
 
 
+def run_watch(desktop_path=None, duration=None, backend=None):
+    """
+    Classify files continuously as they arrive, instead of batch runs
+    
+    Args:
+        desktop_path: Path to Desktop (defaults to user Desktop)
+        duration: Stop after this many seconds (None = until Ctrl+C)
+        backend: "inotify", "poll" or "auto" (default: WATCH_BACKEND)
+    
+    Returns:
+        Watch session summary from DesktopWatcher.run
+    """
+    if desktop_path is None:
+        desktop_path = Path.home() / "Desktop"
+    else:
+        desktop_path = Path(desktop_path)
+    
+    state_manager = StateManager(desktop_path)
+    orchestrator = FileOrchestrator(desktop_path, state_manager)
+    watcher = DesktopWatcher(desktop_path, orchestrator, backend)
+    
+    print_header("AUTOMATED DOCUMENT CLASSIFICATION - WATCH MODE")
+    print(f"Desktop Path: {desktop_path}")
+    print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("Watching for new and modified files (Ctrl+C to stop)\n")
+    
+    summary = watcher.run(duration)
+    
+    print_section("Watch Summary")
+    print(f"Backend: {summary['backend']}")
+    print(f"Files processed: {summary['total_files']}")
+    print(f"Successfully moved: {summary['successful_moves']}")
+    print(f"Already in place: {summary['skipped_files']}")
+    print(f"Failed: {summary['failed']}")
+    print(f"Latency: {summary['average_latency']:.2f}s average, {summary['max_latency']:.2f}s max")
+    return summary
+
+
 def compare_run_results(run1, run2):
     """
     Compare results from two runs to check consistency
@@ -187,18 +249,28 @@ if __name__ == "__main__":
     # Default: run on user's Desktop
     desktop_path = Path.home() / "Desktop"
     
+    # --watch, --recursive and --pipeline may appear anywhere on the command line
+    watch = "--watch" in sys.argv
+    recursive = True if "--recursive" in sys.argv else None
+    pipeline = True if "--pipeline" in sys.argv else None
+    args = [arg for arg in sys.argv[1:] if arg not in ("--watch", "--recursive", "--pipeline")]
+    
     # Allow command-line argument for custom path
-    if len(sys.argv) > 1:
-        desktop_path = Path(sys.argv[1])
+    if len(args) > 0:
+        desktop_path = Path(args[0])
     
     # Allow custom run count
     run_count = 5
-    if len(sys.argv) > 2:
-        run_count = int(sys.argv[2])
+    if len(args) > 1:
+        run_count = int(args[1])
+    
+    if watch:
+        run_watch(desktop_path)
+        sys.exit(0)
     
     # Run automation
     try:
-        results = run_automation(desktop_path, run_count)
+        results = run_automation(desktop_path, run_count, recursive, pipeline)
         print("\n" + "="*70)
         print("✅ AUTOMATION COMPLETED SUCCESSFULLY")
         print("="*70)
@@ -0,0 +1,357 @@
+"""
+Desktop Watcher Module
+Classifies files as they arrive on the Desktop instead of rescanning it on a schedule
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import stat
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from config import WATCH_BACKEND, WATCH_POLL_INTERVAL, WATCH_SETTLE_SECONDS, WATCH_RESCAN_INTERVAL
+from orchestrator import FileOrchestrator
+
+
+# inotify event flags (from <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF
+
+# struct inotify_event: wd, mask, cookie, len, then len bytes of name
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyBackend:
+    """Change notifications for one directory from Linux inotify (through libc)"""
+    
+    # Events wake the watcher, so it can sleep longer when nothing is pending
+    blocking = True
+    
+    def __init__(self, folder):
+        """
+        Start watching a directory
+        
+        Args:
+            folder: Directory to watch (not recursive)
+        
+        Raises:
+            OSError: inotify is not available
+        """
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(str(folder)), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {folder}")
+        self.closed = False
+    
+    def wait(self, timeout):
+        """
+        Wait up to timeout seconds for changes
+        
+        Returns:
+            (names, rescan): names of changed entries, and whether the
+            directory must be rescanned (events were lost)
+        """
+        names = set()
+        rescan = False
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return names, rescan
+        
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                
+                if mask & IN_Q_OVERFLOW:
+                    rescan = True
+                elif mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                    # The directory itself went away; the watch is gone
+                    self.closed = True
+                    rescan = True
+                elif name:
+                    names.add(os.fsdecode(name))
+        return names, rescan
+    
+    def close(self):
+        """Stop watching"""
+        os.close(self.fd)
+
+
+class PollBackend:
+    """Directory polling that skips the scan while the directory's mtime is unchanged"""
+    
+    blocking = False
+    closed = False
+    
+    def __init__(self, folder):
+        """
+        Initialize polling
+        
+        Args:
+            folder: Directory to poll
+        """
+        self.folder = Path(folder)
+        self.mtime_ns = None
+    
+    def wait(self, timeout):
+        """
+        Sleep, then check whether the directory changed
+        
+        Creating, deleting or renaming an entry updates the directory's
+        mtime; writes into an existing file do not, which is what the
+        periodic full rescan is for.
+        
+        Returns:
+            (names, rescan): always no names; rescan when the mtime changed
+        """
+        time.sleep(timeout)
+        try:
+            mtime_ns = os.stat(self.folder).st_mtime_ns
+        except OSError:
+            return set(), False
+        if mtime_ns == self.mtime_ns:
+            return set(), False
+        self.mtime_ns = mtime_ns
+        return set(), True
+    
+    def close(self):
+        """Nothing to release"""
+
+
+class DesktopWatcher:
+    """Feeds new and modified Desktop files to FileOrchestrator once their writes settle"""
+    
+    def __init__(self, desktop_path, orchestrator=None, backend=None, poll_interval=None,
+                 settle_seconds=None, rescan_interval=None):
+        """
+        Initialize watcher
+        
+        Args:
+            desktop_path: Directory to watch (files directly in it, like run_automation)
+            orchestrator: Optional FileOrchestrator (default: one for desktop_path)
+            backend: "inotify", "poll" or "auto" (default: WATCH_BACKEND)
+            poll_interval: Seconds between checks (default: WATCH_POLL_INTERVAL)
+            settle_seconds: Quiet time before a file counts as fully written
+                            (default: WATCH_SETTLE_SECONDS)
+            rescan_interval: Seconds between full rescans (default: WATCH_RESCAN_INTERVAL)
+        """
+        self.desktop_path = Path(desktop_path)
+        self.orchestrator = orchestrator or FileOrchestrator(self.desktop_path)
+        self.state_manager = self.orchestrator.state_manager
+        self.backend_name = backend or WATCH_BACKEND
+        self.poll_interval = poll_interval or WATCH_POLL_INTERVAL
+        self.settle_seconds = WATCH_SETTLE_SECONDS if settle_seconds is None else settle_seconds
+        self.rescan_interval = rescan_interval or WATCH_RESCAN_INTERVAL
+        self.backend = None
+        self.pending = {}  # name -> {"signature", "changed_at", "queued_at"}
+        self.seen = {}     # name -> (size, mtime_ns) when last processed
+        self._stop = threading.Event()
+    
+    def create_backend(self):
+        """Use inotify when asked for and available, otherwise poll"""
+        if self.backend_name in ("auto", "inotify") and sys.platform.startswith("linux"):
+            try:
+                return InotifyBackend(self.desktop_path)
+            except (OSError, AttributeError) as e:
+                print(f"[!] inotify unavailable ({e}); polling instead")
+        return PollBackend(self.desktop_path)
+    
+    def is_candidate(self, name):
+        """Check whether a Desktop entry name could be a file to classify"""
+        return not name.startswith(".") and not self.orchestrator.is_state_file(self.desktop_path / name)
+    
+    def queue(self, name):
+        """Start waiting for a file's writes to settle"""
+        if name not in self.pending and self.is_candidate(name):
+            now = time.monotonic()
+            self.pending[name] = {"signature": None, "changed_at": now, "queued_at": now}
+    
+    def scan(self):
+        """Queue every file that is new or changed since it was last processed"""
+        try:
+            with os.scandir(self.desktop_path) as entries:
+                for entry in entries:
+                    if not entry.is_file() or not self.is_candidate(entry.name):
+                        continue
+                    st = entry.stat()
+                    if self.seen.get(entry.name) != (st.st_size, st.st_mtime_ns):
+                        self.queue(entry.name)
+        except OSError as e:
+            print(f"Error scanning {self.desktop_path}: {e}")
+    
+    def settled_files(self):
+        """
+        Find pending files whose size and mtime have stopped changing
+        
+        A file is ready once its size and mtime match the previous check and
+        either it has been quiet for settle_seconds or its mtime is already
+        that old (files present before the watcher started).
+        
+        Returns:
+            Names of files ready to process
+        """
+        now = time.monotonic()
+        ready = []
+        for name, entry in list(self.pending.items()):
+            try:
+                st = os.stat(self.desktop_path / name)
+            except OSError:
+                del self.pending[name]  # Moved or deleted before it settled
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                del self.pending[name]
+                continue
+            
+            signature = (st.st_size, st.st_mtime_ns)
+            if signature != entry["signature"]:
+                entry["signature"] = signature
+                entry["changed_at"] = now
+                continue
+            if (now - entry["changed_at"] >= self.settle_seconds
+                    or time.time() - st.st_mtime >= self.settle_seconds):
+                ready.append(name)
+        return ready
+    
+    def process(self, names, run_id, stats):
+        """Classify and move settled files, recording them under the watch run"""
+        for name in names:
+            entry = self.pending.pop(name)
+            file_path = self.desktop_path / name
+            try:
+                result = self.orchestrator.process_file(file_path, run_id)
+            except Exception as e:
+                print(f"❌ {name}: {e}")
+                stats["failed"] += 1
+                continue
+            latency = time.monotonic() - entry["queued_at"]
+            
+            # Files that stay (e.g. unsupported) are only requeued if they change again
+            self.seen[name] = entry["signature"]
+            
+            stats["total_files"] += 1
+            stats["latencies"].append(latency)
+            if result["overall_status"] != "success":
+                stats["failed"] += 1
+                print(f"⚠️  {name}: {result.get('reason', 'failed')} ({latency:.2f}s)")
+            elif result["movement_status"] == "skipped":
+                stats["skipped_files"] += 1
+                print(f"⏭️  {name} → {result['category']} (already in place, {latency:.2f}s)")
+            else:
+                stats["successful_moves"] += 1
+                print(f"✅ {name} → {result['category']} ({latency:.2f}s)")
+        
+        if self.state_manager:
+            self.state_manager.flush()
+    
+    def stop(self):
+        """Ask a running watch loop to finish (safe from other threads)"""
+        self._stop.set()
+    
+    def run(self, duration=None, max_files=None):
+        """
+        Watch the Desktop until stopped
+        
+        Files already on the Desktop are processed first. The whole session
+        is recorded as one run in the state database.
+        
+        Args:
+            duration: Stop after this many seconds (None = until stop() or Ctrl+C)
+            max_files: Stop after processing this many files (None = no limit)
+        
+        Returns:
+            {
+                "total_files": int,
+                "successful_moves": int,
+                "skipped_files": int,
+                "failed": int,
+                "average_latency": float (seconds from detection to processed),
+                "max_latency": float,
+                "backend": str
+            }
+        """
+        self._stop.clear()
+        self.backend = self.create_backend()
+        stats = {
+            "total_files": 0,
+            "successful_moves": 0,
+            "skipped_files": 0,
+            "failed": 0,
+            "latencies": []
+        }
+        run_id = None
+        if self.state_manager:
+            run_id, _ = self.state_manager.start_run()
+        
+        start = time.monotonic()
+        last_rescan = start
+        self.scan()
+        try:
+            while not self._stop.is_set():
+                # Sleep long only when an event will wake us and nothing is settling
+                timeout = self.poll_interval
+                if self.backend.blocking and not self.pending:
+                    timeout = max(self.poll_interval, 1.0)
+                names, rescan = self.backend.wait(timeout)
+                for name in names:
+                    self.queue(name)
+                
+                now = time.monotonic()
+                if rescan or now - last_rescan >= self.rescan_interval:
+                    self.scan()
+                    last_rescan = now
+                
+                if self.backend.closed:
+                    print("[!] Watch on the Desktop was lost; polling instead")
+                    self.backend.close()
+                    self.backend = PollBackend(self.desktop_path)
+                
+                ready = self.settled_files()
+                if ready:
+                    self.process(ready, run_id, stats)
+                
+                if duration is not None and time.monotonic() - start >= duration:
+                    break
+                if max_files is not None and stats["total_files"] >= max_files:
+                    break
+        except KeyboardInterrupt:
+            print("\nStopping watch mode")
+        finally:
+            self.backend.close()
+            if run_id:
+                self.state_manager.end_run(
+                    run_id,
+                    stats["total_files"],
+                    stats["successful_moves"],
+                    stats["failed"],
+                    stats["skipped_files"],
+                    "Watch mode"
+                )
+        
+        latencies = stats.pop("latencies")
+        stats["average_latency"] = sum(latencies) / len(latencies) if latencies else 0.0
+        stats["max_latency"] = max(latencies, default=0.0)
+        stats["backend"] = "inotify" if isinstance(self.backend, InotifyBackend) else "poll"
+        return stats
@@ -0,0 +1,200 @@
+"""
+Extraction Cache Module
+Persists extracted document text so unchanged files are never re-parsed
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """Compute SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Size-bounded LRU cache of extracted text stored in SQLite"""
+
+    def __init__(self, cache_path, max_bytes):
+        """
+        Initialize extraction cache
+
+        Args:
+            cache_path: Path to the SQLite cache file
+            max_bytes: Maximum total size of cached text before LRU eviction
+        """
+        self.cache_path = Path(cache_path)
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "hash_hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+
+    def _connect(self):
+        """Get the connection for this process (workers open their own)"""
+        if self._conn is None or self._conn_pid != os.getpid():
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.cache_path), timeout=30.0, check_same_thread=False)
+            conn.isolation_level = None  # Autocommit mode
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS entries (
+                    content_hash TEXT NOT NULL,
+                    variant TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (content_hash, variant)
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS paths (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)')
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def _lookup(self, conn, content_hash, variant):
+        """Fetch cached text for a content hash and bump its LRU timestamp"""
+        row = conn.execute(
+            'SELECT content FROM entries WHERE content_hash = ? AND variant = ?',
+            (content_hash, variant)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            'UPDATE entries SET last_access = ? WHERE content_hash = ? AND variant = ?',
+            (time.time(), content_hash, variant)
+        )
+        return row[0]
+
+    def get_or_extract(self, file_path, extract, variant=""):
+        """
+        Return cached text for a file, extracting and storing it on a miss
+
+        Lookup first uses (path, size, mtime_ns); if that misses, the file is
+        hashed so renamed or moved copies of the same bytes still hit.
+
+        Args:
+            file_path: Path to the document
+            extract: Callable(file_path) -> text, used on a miss; it should
+                     raise when the file cannot be parsed, so the failure
+                     is not cached (the exception propagates)
+            variant: Extractor settings the text depends on
+
+        Returns:
+            Extracted text
+        """
+        file_path = Path(file_path)
+        try:
+            stat = file_path.stat()
+            path_key = str(file_path.resolve())
+
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    'SELECT content_hash FROM paths WHERE path = ? AND size = ? AND mtime_ns = ?',
+                    (path_key, stat.st_size, stat.st_mtime_ns)
+                ).fetchone()
+                if row:
+                    content = self._lookup(conn, row[0], variant)
+                    if content is not None:
+                        self.stats["hits"] += 1
+                        return content
+
+            # Hash outside the lock; it reads the whole file
+            content_hash = hash_file(file_path)
+
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    'INSERT OR REPLACE INTO paths (path, size, mtime_ns, content_hash) VALUES (?, ?, ?, ?)',
+                    (path_key, stat.st_size, stat.st_mtime_ns, content_hash)
+                )
+                content = self._lookup(conn, content_hash, variant)
+                if content is not None:
+                    self.stats["hash_hits"] += 1
+                    return content
+        except Exception as e:
+            print(f"Error reading extraction cache: {e}")
+            return extract(file_path)
+
+        self.stats["misses"] += 1
+        content = extract(file_path)
+        if content is not None:
+            self.store(content_hash, variant, content)
+        return content
+
+    def store(self, content_hash, variant, content):
+        """Store extracted text and evict least recently used entries"""
+        size_bytes = len(content.encode('utf-8'))
+        if size_bytes > self.max_bytes:
+            return
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    'INSERT OR REPLACE INTO entries (content_hash, variant, content, size_bytes, last_access) VALUES (?, ?, ?, ?, ?)',
+                    (content_hash, variant, content, size_bytes, time.time())
+                )
+                self._evict(conn)
+        except Exception as e:
+            print(f"Error writing extraction cache: {e}")
+
+    def _evict(self, conn):
+        """Delete least recently used entries until the cache fits max_bytes"""
+        total = conn.execute('SELECT COALESCE(SUM(size_bytes), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        victims = []
+        for content_hash, variant, size_bytes in conn.execute(
+                'SELECT content_hash, variant, size_bytes FROM entries ORDER BY last_access'):
+            if total <= self.max_bytes:
+                break
+            victims.append((content_hash, variant))
+            total -= size_bytes
+
+        conn.execute('BEGIN')
+        conn.executemany('DELETE FROM entries WHERE content_hash = ? AND variant = ?', victims)
+        conn.execute('DELETE FROM paths WHERE content_hash NOT IN (SELECT content_hash FROM entries)')
+        conn.execute('COMMIT')
+        self.stats["evictions"] += len(victims)
+
+    def get_stats(self):
+        """Get hit/miss counters plus current cache size"""
+        stats = dict(self.stats)
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    'SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM entries'
+                ).fetchone()
+            stats["entries"], stats["size_bytes"] = row
+        except Exception as e:
+            print(f"Error reading extraction cache stats: {e}")
+        lookups = stats["hits"] + stats["hash_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["hash_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """Remove all cached entries"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute('DELETE FROM entries')
+            conn.execute('DELETE FROM paths')
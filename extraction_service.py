@@ -0,0 +1,359 @@
+"""
+Extraction Service Module
+Long-lived extraction daemon that keeps the document parsers imported and warm,
+plus the client the CLI, GUI and Drive entry points use to reach it
+
+Usage:
+    python extraction_service.py start    # run the service (foreground)
+    python extraction_service.py status
+    python extraction_service.py stop
+"""
+
+import os
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.connection import Listener, Client
+from pathlib import Path
+from file_parser import ExtractionError
+from config import (
+    EXTRACTION_SERVICE_ADDRESS, EXTRACTION_SERVICE_WORKERS, EXTRACTION_SERVICE_AUTOSTART,
+    EXTRACTION_SERVICE_RETRY_SECONDS
+)
+
+
+SERVICE_DIR = Path.home() / ".document_classifier"
+
+
+def get_service_address():
+    """Address the service listens on: a unix socket, or a named pipe on Windows"""
+    if EXTRACTION_SERVICE_ADDRESS:
+        return EXTRACTION_SERVICE_ADDRESS
+    if os.name == "nt":
+        return r"\\.\pipe\document_classifier_extractor"
+    return str(SERVICE_DIR / "extractor.sock")
+
+
+def get_authkey(create=False):
+    """
+    Read the shared secret clients authenticate with
+    
+    Args:
+        create: Generate it (readable by this user only) if missing
+    
+    Returns:
+        Key bytes, or None if there is none yet
+    """
+    key_path = SERVICE_DIR / "extractor.key"
+    if not key_path.exists():
+        if not create:
+            return None
+        SERVICE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(secrets.token_hex(32))
+    return key_path.read_text().strip().encode()
+
+
+# Jobs run in the worker processes; file_parser is already imported there
+def extract_path_job(file_path):
+    """Extract text from a file with the local parsers (parse errors are sent back as errors)"""
+    import file_parser
+    return file_parser.extract_text(file_path, use_service=False, strict=True)
+
+
+def extract_stream_job(data, format_hint):
+    """Extract text from document bytes with the local parsers"""
+    import file_parser
+    return file_parser.extract_text_from_stream(data, format_hint)
+
+
+class ExtractionServer:
+    """Serves extraction jobs from a pool of warm worker processes"""
+    
+    def __init__(self, address=None, workers=None):
+        """
+        Initialize server
+        
+        Args:
+            address: Socket path or pipe name (default: get_service_address())
+            workers: Worker processes (default: EXTRACTION_SERVICE_WORKERS,
+                     None there means one per CPU)
+        """
+        self.address = address or get_service_address()
+        self.workers = workers or EXTRACTION_SERVICE_WORKERS or os.cpu_count() or 1
+        self.stats = {"jobs": 0, "errors": 0, "started": time.time()}
+        self._stats_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self.listener = None
+        self.pool = None
+    
+    def serve_forever(self):
+        """Import the parsers, start the workers and answer jobs until stopped"""
+        # Loading the parsers here means every worker forked below starts warm
+        import file_parser
+        file_parser.preload_libraries()
+        
+        if os.name != "nt" and os.path.exists(self.address):
+            if ping(self.address):
+                print(f"[!] Extraction service already running at {self.address}")
+                return
+            os.unlink(self.address)  # Left behind by a service that died
+        
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        # Start every worker now, before connection threads exist
+        for future in [self.pool.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+        
+        self.listener = Listener(self.address, authkey=get_authkey(create=True))
+        if os.name != "nt":
+            os.chmod(self.address, 0o600)
+        print(f"[OK] Extraction service listening at {self.address} ({self.workers} workers)")
+        
+        try:
+            while not self._stopping.is_set():
+                try:
+                    conn = self.listener.accept()
+                except Exception as e:
+                    if self._stopping.is_set():
+                        break
+                    print(f"Error accepting connection: {e}")
+                    continue
+                threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+        finally:
+            self.listener.close()
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            print("Extraction service stopped")
+    
+    def handle(self, conn):
+        """Answer one client's requests until it disconnects"""
+        try:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                conn.send(self.dispatch(request))
+                if request.get("op") == "stop":
+                    self.stop()
+                    return
+        finally:
+            conn.close()
+    
+    def dispatch(self, request):
+        """
+        Run one request
+        
+        Args:
+            request: {"op": "extract", "path": str}
+                     {"op": "extract_stream", "data": bytes, "format": str}
+                     {"op": "status"} or {"op": "stop"}
+        
+        Returns:
+            {"status": "ok", "result": ...} or {"status": "error", "message": str}
+        """
+        op = request.get("op")
+        try:
+            if op == "extract":
+                result = self.pool.submit(extract_path_job, request["path"]).result()
+            elif op == "extract_stream":
+                result = self.pool.submit(extract_stream_job, request["data"], request["format"]).result()
+            elif op == "status":
+                with self._stats_lock:
+                    result = {
+                        **self.stats,
+                        "pid": os.getpid(),
+                        "workers": self.workers,
+                        "uptime_seconds": time.time() - self.stats["started"]
+                    }
+                return {"status": "ok", "result": result}
+            elif op == "stop":
+                return {"status": "ok", "result": None}
+            else:
+                return {"status": "error", "message": f"Unknown request: {op}"}
+        except Exception as e:
+            with self._stats_lock:
+                self.stats["errors"] += 1
+            return {"status": "error", "message": str(e)}
+        
+        with self._stats_lock:
+            self.stats["jobs"] += 1
+        return {"status": "ok", "result": result}
+    
+    def stop(self):
+        """Stop accepting connections; serve_forever returns once the listener wakes"""
+        self._stopping.set()
+        try:
+            # Wake the blocking accept() with a throwaway connection
+            Client(self.address, authkey=get_authkey()).close()
+        except Exception:
+            pass
+
+
+class ExtractionClient:
+    """Connection to a running extraction service"""
+    
+    def __init__(self, address=None):
+        """
+        Connect to the service
+        
+        Raises:
+            OSError: no service is listening (or the key is missing)
+        """
+        authkey = get_authkey()
+        if authkey is None:
+            raise FileNotFoundError("Extraction service key not found")
+        self.conn = Client(address or get_service_address(), authkey=authkey)
+        self._lock = threading.Lock()
+    
+    def request(self, **request):
+        """Send a request and return its result, raising on a service-side error"""
+        with self._lock:
+            self.conn.send(request)
+            response = self.conn.recv()
+        if response["status"] != "ok":
+            raise RuntimeError(response["message"])
+        return response["result"]
+    
+    def close(self):
+        """Disconnect"""
+        self.conn.close()
+
+
+_client = None
+_client_pid = None
+_retry_at = 0.0  # time.monotonic() before which no new connection is tried
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Get this process's connection to the service
+    
+    After a failed connection the process extracts locally for
+    EXTRACTION_SERVICE_RETRY_SECONDS before trying again, so a service
+    started later (e.g. by EXTRACTION_SERVICE_AUTOSTART, which each failed
+    attempt triggers) is picked up by long-lived processes such as the GUI.
+    
+    Returns:
+        ExtractionClient, or None if no service is running
+    """
+    global _client, _client_pid
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            return _client
+        if time.monotonic() < _retry_at:
+            return None
+        try:
+            _client = ExtractionClient()
+            _client_pid = os.getpid()
+            return _client
+        except Exception:
+            back_off()
+            if EXTRACTION_SERVICE_AUTOSTART:
+                start_background()
+            return None
+
+
+def back_off():
+    """Skip the service until EXTRACTION_SERVICE_RETRY_SECONDS from now (call with _client_lock held)"""
+    global _retry_at
+    _retry_at = time.monotonic() + EXTRACTION_SERVICE_RETRY_SECONDS
+
+
+def request_extraction(**request):
+    """
+    Run a job on the service
+    
+    Returns:
+        The job's result, or None when the service is not available (the
+        caller then extracts locally)
+    
+    Raises:
+        ExtractionError: the service ran the job and it failed (final; the
+                         file is not parsed again locally)
+    """
+    global _client
+    client = get_client()
+    if client is None:
+        return None
+    try:
+        return client.request(**request)
+    except (EOFError, OSError) as e:
+        # The service went away; extract locally until the next retry
+        print(f"[!] Extraction service unavailable ({e}); extracting locally")
+        with _client_lock:
+            if _client is client:
+                _client = None
+                back_off()
+        return None
+    except RuntimeError as e:
+        # Parsing again here would fail the same way (or crash this process)
+        raise ExtractionError(str(e)) from e
+
+
+def extract_text_remote(file_path):
+    """Extract a file's text on the service (None if unavailable; ExtractionError if it fails)"""
+    return request_extraction(op="extract", path=str(Path(file_path).resolve()))
+
+
+def extract_stream_remote(data, format_hint):
+    """Extract text from document bytes on the service (None if unavailable; ExtractionError if it fails)"""
+    return request_extraction(op="extract_stream", data=bytes(data), format=format_hint)
+
+
+def ping(address=None):
+    """Check whether a service is answering"""
+    try:
+        client = ExtractionClient(address)
+        try:
+            client.request(op="status")
+            return True
+        finally:
+            client.close()
+    except Exception:
+        return False
+
+
+def start_background():
+    """Start the service as a detached background process"""
+    command = [sys.executable, str(Path(__file__).resolve()), "start"]
+    options = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    if os.name == "nt":
+        options["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        options["start_new_session"] = True
+    try:
+        subprocess.Popen(command, **options)
+    except Exception as e:
+        print(f"Error starting extraction service: {e}")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "start"
+    
+    if command == "start":
+        try:
+            ExtractionServer().serve_forever()
+        except KeyboardInterrupt:
+            pass
+    elif command in ("status", "stop"):
+        try:
+            client = ExtractionClient()
+            result = client.request(op=command)
+            client.close()
+        except Exception:
+            print("Extraction service is not running")
+            sys.exit(1)
+        if command == "status":
+            print(f"Extraction service pid {result['pid']}: {result['workers']} workers, "
+                  f"{result['jobs']} jobs, {result['errors']} errors, "
+                  f"up {result['uptime_seconds']:.0f}s")
+        else:
+            print("Extraction service stopping")
+    else:
+        print(__doc__)
+        sys.exit(1)
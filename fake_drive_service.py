@@ -0,0 +1,398 @@
+"""
+Fake Google Drive Service
+In-memory stand-in for the googleapiclient Drive v3 service, used to exercise
+GoogleDriveManager and GoogleDriveAutomation without credentials or network
+"""
+
+import re
+import threading
+import time
+from collections import Counter, deque
+
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+
+class FakeHttpError(Exception):
+    """Stands in for googleapiclient.errors.HttpError"""
+
+    def __init__(self, status, message):
+        super().__init__(f"<HttpError {status}: {message}>")
+        self.status_code = status
+
+
+class FakeRequest:
+    """A deferred call, executed like a googleapiclient HttpRequest"""
+
+    def __init__(self, service, method, handler, file_id=None):
+        self.service = service
+        self.method = method
+        self.handler = handler
+        self.file_id = file_id
+        self.headers = {}
+
+    def execute(self, **kwargs):
+        """Run the call, counting it and applying the simulated latency"""
+        if self.service.latency:
+            time.sleep(self.service.latency)
+        return self.run()
+
+    def run(self):
+        """Run the call without latency (batches pay it once for all items)"""
+        with self.service.lock:
+            self.service.calls[self.method] += 1
+            if self.service.over_quota():
+                self.service.calls['rate_limited'] += 1
+                raise FakeHttpError(429, "Rate limit exceeded")
+            if self.service.failures[self.file_id] > 0:
+                self.service.failures[self.file_id] -= 1
+                raise FakeHttpError(503, "Service unavailable (injected)")
+            return self.handler()
+
+
+class FakeBatch:
+    """A batch of requests sent in one round trip, like BatchHttpRequest"""
+
+    def __init__(self, service, callback=None):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        """Queue a request; the API rejects batches over its limit"""
+        if len(self.requests) >= self.service.max_batch_size:
+            raise ValueError(f"Batch exceeds the maximum of {self.service.max_batch_size} calls")
+        if request_id is None:
+            request_id = str(len(self.requests) + 1)
+        self.requests.append((request, callback or self.callback, request_id))
+
+    def execute(self):
+        """Send every queued request in one round trip and run the callbacks"""
+        with self.service.lock:
+            self.service.calls['batch'] += 1
+        if self.service.latency:
+            time.sleep(self.service.latency)
+        for request, callback, request_id in self.requests:
+            try:
+                response, exception = request.run(), None
+            except Exception as e:
+                response, exception = None, e
+            if callback:
+                callback(request_id, response, exception)
+
+
+class FakeFiles:
+    """The files() collection of the fake service"""
+
+    def __init__(self, service):
+        self.service = service
+
+    def list(self, q="", spaces='drive', fields=None, pageSize=100, pageToken=None, **kwargs):
+        """files().list with query filtering, paging and field masks"""
+        service = self.service
+
+        def handler():
+            # The page token is a cursor (last ID returned), so files moved
+            # away between pages do not shift later pages
+            matches = sorted(
+                (f for f in service.drive_files.values()
+                 if f['id'] > (pageToken or "") and service.matches_query(f, q)),
+                key=lambda f: f['id']
+            )
+            page = matches[:min(pageSize, service.max_page_size)]
+            response = {'files': [service.project(f, fields, nested='files') for f in page]}
+            if len(page) < len(matches):
+                response['nextPageToken'] = page[-1]['id']
+            return response
+
+        return FakeRequest(service, 'files.list', handler)
+
+    def get(self, fileId, fields=None, **kwargs):
+        """files().get with a field mask"""
+        service = self.service
+
+        def handler():
+            if fileId == 'root':
+                return {'id': 'root'}
+            return service.project(service.get_file(fileId), fields)
+
+        return FakeRequest(service, 'files.get', handler, fileId)
+
+    def get_media(self, fileId, **kwargs):
+        """files().get_media returning the file's bytes, honouring a Range header"""
+        service = self.service
+        request = FakeRequest(service, 'files.get_media', None, fileId)
+
+        def handler():
+            content = service.get_file(fileId).get('content', b"")
+            match = re.fullmatch(r"bytes=(\d+)-(\d*)", request.headers.get('Range', ""))
+            if match:
+                start, end = int(match.group(1)), match.group(2)
+                content = content[start:int(end) + 1 if end else None]
+            service.bytes_sent += len(content)
+            return content
+
+        request.handler = handler
+        return request
+
+    def export(self, fileId, mimeType, **kwargs):
+        """files().export of a Google-native document (stored content as text)"""
+        service = self.service
+
+        def handler():
+            file = service.get_file(fileId)
+            if not file['mimeType'].startswith('application/vnd.google-apps.'):
+                raise FakeHttpError(403, "Export only supports Docs Editors files")
+            content = file.get('content', b"")
+            service.bytes_sent += len(content)
+            return content
+
+        return FakeRequest(service, 'files.export', handler, fileId)
+
+    def create(self, body=None, fields=None, **kwargs):
+        """files().create for folders and empty files"""
+        service = self.service
+
+        def handler():
+            body_ = dict(body or {})
+            file = service.add_file(body_.pop('name'), body_.pop('mimeType', 'application/octet-stream'),
+                                    body_.pop('parents', ['root']))
+            return service.project(file, fields)
+
+        return FakeRequest(service, 'files.create', handler)
+
+    def update(self, fileId, addParents=None, removeParents=None, fields=None, body=None, **kwargs):
+        """files().update supporting addParents/removeParents"""
+        service = self.service
+
+        def handler():
+            file = service.get_file(fileId)
+            parents = [p for p in file['parents'] if p not in (removeParents or "").split(",")]
+            for parent in (addParents or "").split(","):
+                if parent and parent != 'root':
+                    service.get_file(parent)
+                if parent and parent not in parents:
+                    parents.append(parent)
+            file['parents'] = parents
+            file.update(body or {})
+            service.record_change(fileId)
+            return service.project(file, fields)
+
+        return FakeRequest(service, 'files.update', handler, fileId)
+
+
+class FakeChanges:
+    """The changes() collection of the fake service"""
+
+    def __init__(self, service):
+        self.service = service
+
+    def getStartPageToken(self, **kwargs):
+        """changes().getStartPageToken: a token for the current end of the change log"""
+        service = self.service
+
+        def handler():
+            return {'startPageToken': str(len(service.change_log))}
+
+        return FakeRequest(service, 'changes.getStartPageToken', handler)
+
+    def list(self, pageToken, fields=None, pageSize=100, includeRemoved=True, **kwargs):
+        """changes().list: one entry per changed file, with its current state"""
+        service = self.service
+
+        def handler():
+            if not str(pageToken).isdigit() or int(pageToken) > len(service.change_log):
+                raise FakeHttpError(400, f"Invalid pageToken: {pageToken}")
+            start = int(pageToken)
+            end = min(start + min(pageSize, service.max_page_size), len(service.change_log))
+
+            # A file changed several times within a page is reported once
+            file_ids = list(dict.fromkeys(reversed(service.change_log[start:end])))[::-1]
+            match = re.search(r"\bfile\((.*?)\)", fields or "")
+            file_fields = match.group(1) if match else None
+
+            changes = []
+            for file_id in file_ids:
+                file = service.drive_files.get(file_id)
+                if file is None and not includeRemoved:
+                    continue
+                change = {'fileId': file_id, 'removed': file is None}
+                if file is not None:
+                    change['file'] = service.project(file, file_fields)
+                changes.append(change)
+
+            response = {'changes': changes}
+            if end < len(service.change_log):
+                response['nextPageToken'] = str(end)
+            else:
+                response['newStartPageToken'] = str(end)
+            return response
+
+        return FakeRequest(service, 'changes.list', handler)
+
+
+class FakeDriveService:
+    """In-memory Drive v3 service with the subset of the API this project uses"""
+
+    def __init__(self, latency=0.0, max_page_size=1000, max_batch_size=100, quota_per_second=None):
+        """
+        Initialize fake service
+
+        Args:
+            latency: Seconds each round trip sleeps, to simulate network latency
+            max_page_size: Largest page files().list returns (API maximum: 1000)
+            max_batch_size: Most requests in one batch (API maximum: 100)
+            quota_per_second: Requests allowed in any one-second window; more
+                              fail with 429 (None = unlimited)
+        """
+        self.latency = latency
+        self.max_page_size = max_page_size
+        self.max_batch_size = max_batch_size
+        self.quota_per_second = quota_per_second
+        self._recent = deque()
+        self.drive_files = {}
+        self.change_log = []  # File IDs in the order they changed
+        self.calls = Counter()
+        self.failures = Counter()
+        self.bytes_sent = 0
+        self.lock = threading.RLock()
+        self._next_id = 0
+
+    def files(self):
+        """Mirror service.files()"""
+        return FakeFiles(self)
+
+    def changes(self):
+        """Mirror service.changes()"""
+        return FakeChanges(self)
+
+    def new_batch_http_request(self, callback=None):
+        """Mirror service.new_batch_http_request()"""
+        return FakeBatch(self, callback)
+
+    def over_quota(self):
+        """Record a request against the quota; True if it exceeds it (caller holds the lock)"""
+        if not self.quota_per_second:
+            return False
+        now = time.monotonic()
+        while self._recent and self._recent[0] <= now - 1.0:
+            self._recent.popleft()
+        if len(self._recent) >= self.quota_per_second:
+            return True
+        self._recent.append(now)
+        return False
+
+    def inject_failures(self, file_id, count=1):
+        """Make the next count requests for a file fail with a 503"""
+        with self.lock:
+            self.failures[file_id] += count
+
+    def add_file(self, name, mime_type='text/plain', parents=None, content=b""):
+        """
+        Add a file to the fake drive
+
+        Returns:
+            The stored file dict
+        """
+        with self.lock:
+            self._next_id += 1
+            file_id = f"file{self._next_id:07d}"
+            file = {
+                'id': file_id,
+                'name': name,
+                'mimeType': mime_type,
+                'parents': list(parents or ['root']),
+                'trashed': False,
+                'content': content
+            }
+            # Like the API, Google-native files and folders report no size
+            if not mime_type.startswith('application/vnd.google-apps.'):
+                file['size'] = str(len(content))
+            self.drive_files[file_id] = file
+            self.record_change(file_id)
+            return file
+
+    def add_folder(self, name, parent_id='root'):
+        """Add a folder and return its ID"""
+        return self.add_file(name, FOLDER_MIME_TYPE, [parent_id])['id']
+
+    def record_change(self, file_id):
+        """Append a change to the log the changes() feed reads (caller holds the lock)"""
+        self.change_log.append(file_id)
+
+    def get_file(self, file_id):
+        """Look up a file, raising like the API does for unknown IDs"""
+        if file_id not in self.drive_files:
+            raise FakeHttpError(404, f"File not found: {file_id}")
+        return self.drive_files[file_id]
+
+    def trash(self, file_id):
+        """Move a file or folder to the trash"""
+        with self.lock:
+            self.get_file(file_id)['trashed'] = True
+            self.record_change(file_id)
+
+    def delete(self, file_id):
+        """Delete a file or folder permanently"""
+        with self.lock:
+            if self.drive_files.pop(file_id, None) is not None:
+                self.record_change(file_id)
+
+    def is_trashed(self, file):
+        """A file is trashed if it, or any folder above it, is trashed"""
+        while file is not None:
+            if file['trashed']:
+                return True
+            parent_ids = [p for p in file['parents'] if p in self.drive_files]
+            file = self.drive_files[parent_ids[0]] if parent_ids else None
+        return False
+
+    def matches_query(self, file, query):
+        """Evaluate the 'and'-joined query terms used by GoogleDriveManager"""
+        for term in filter(None, (t.strip() for t in query.split(" and "))):
+            match = re.fullmatch(r"'(.+)' in parents", term)
+            if match:
+                if match.group(1) not in file['parents']:
+                    return False
+                continue
+            match = re.fullmatch(r"(\w+)\s*=\s*'?(.*?)'?", term)
+            if not match:
+                raise ValueError(f"Unsupported query term: {term}")
+            field, value = match.groups()
+            actual = self.is_trashed(file) if field == 'trashed' else file.get(field)
+            if isinstance(actual, bool):
+                actual = str(actual).lower()
+            if actual != value:
+                return False
+        return True
+
+    def project(self, file, fields, nested=None):
+        """Apply a field mask such as 'id, parents' or 'files(id, name)'"""
+        if not fields:
+            return {k: v for k, v in file.items() if k not in ('content', 'trashed')}
+        if nested:
+            match = re.search(rf"{nested}\((.*?)\)", fields)
+            if not match:
+                return {}
+            fields = match.group(1)
+        names = [name.strip() for name in fields.split(",")]
+        projected = {name: file[name] for name in names if name in file}
+        if 'trashed' in projected:
+            projected['trashed'] = self.is_trashed(file)
+        return projected
+
+
+if __name__ == "__main__":
+    # Demonstrate paginated listing against the fake service
+    from gdrive_manager import GoogleDriveManager
+
+    service = FakeDriveService(latency=0.01)
+    for i in range(2500):
+        service.add_file(f"Course_Notes_{i:04d}.txt")
+
+    manager = GoogleDriveManager(service=service)
+    start = time.perf_counter()
+    files = manager.list_files_in_folder(only_root=True)
+    elapsed = time.perf_counter() - start
+
+    print(f"Listed {len(files)} files in {service.calls['files.list']} pages ({elapsed:.3f}s)")
@@ -3,104 +3,672 @@ File Parser Module
 Extracts text content from various file formats
 """
 
+import importlib
+import io
+import mmap
 import os
-import sys
+import threading
+import zipfile
+from fnmatch import fnmatch
 from pathlib import Path
+from config import (
+    SUPPORTED_EXTENSIONS, EXTRACTION_CACHE_ENABLED, EXTRACTION_CACHE_PATH, EXTRACTION_CACHE_MAX_BYTES,
+    EXTRACTION_SERVICE_ENABLED,
+    XLSX_MAX_SHEETS, XLSX_MAX_ROWS, XLSX_MAX_CELLS, PDF_PAGE_STRATEGY,
+    PDF_SAMPLE_FIRST_PAGES, PDF_SAMPLE_LAST_PAGES, PDF_SAMPLE_SPACED_PAGES
+)
+from extraction_cache import ExtractionCache
 
-# Try to import required libraries
-try:
-    from docx import Document
-    from openpyxl import load_workbook
-    from pptx import Presentation
-    import PyPDF2
-except ImportError as e:
-    print(f"Error importing libraries: {e}")
-    print("Make sure to install: python-docx, openpyxl, python-pptx, PyPDF2")
-    sys.exit(1)
 
+# Parser library for each format in SUPPORTED_EXTENSIONS: (module, pip package).
+# Each one is imported the first time a file of its format is read, so runs
+# that only see text files (or only filenames) never load them.
+FORMAT_LIBRARIES = {
+    "pdf": ("PyPDF2", "PyPDF2"),
+    "docx": ("docx", "python-docx"),
+    "excel": ("openpyxl", "openpyxl"),
+    "pptx": ("pptx", "python-pptx"),
+}
 
-def extract_text_from_pdf(file_path):
+_libraries = {}
+_libraries_lock = threading.Lock()
+
+
+class ExtractionError(Exception):
+    """A file could not be read or parsed (raised by extractors in strict mode)"""
+
+
+# Block size for streaming plain-text files (small enough for early exit to stop mid-file)
+TEXT_CHUNK_SIZE = 64 * 1024
+
+# Zip parts the text of DOCX/PPTX files is extracted from
+OFFICE_TEXT_PARTS = {
+    ".docx": "word/document.xml",
+    ".pptx": "ppt/slides/slide*.xml",
+}
+
+# Formats by MIME type, for in-memory sources that have no filename
+MIME_EXTENSIONS = {
+    "application/pdf": ".pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": ".xlsx",
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation": ".pptx",
+    "text/markdown": ".md",
+    "text/x-markdown": ".md",
+    "text/plain": ".txt",
+    "text/csv": ".txt",
+}
+
+
+class BufferStream(io.RawIOBase):
+    """
+    Seekable read-only binary stream over a bytes-like object
+    (bytes, bytearray, memoryview or mmap) that never copies the whole buffer
+    """
+    
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def tell(self):
+        return self._position
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._position = offset
+        return offset
+    
+    def read(self, size=-1):
+        """Read up to size bytes (all remaining bytes if size is negative)"""
+        end = len(self._view)
+        if size is not None and size >= 0:
+            end = min(self._position + size, end)
+        data = self._view[self._position:end].tobytes() if end > self._position else b""
+        self._position = max(self._position, end)
+        return data
+    
+    def readall(self):
+        return self.read()
+    
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+    
+    def close(self):
+        """Release the buffer (an mmap cannot be closed while it is exported)"""
+        try:
+            self._view.release()
+        except BufferError:
+            pass
+        super().close()
+
+
+def load_library(file_format):
+    """
+    Import the parser library for a format on first use
+    
+    Args:
+        file_format: Format name from SUPPORTED_EXTENSIONS (e.g. "pdf")
+    
+    Returns:
+        The imported module
+    
+    Raises:
+        ImportError: the library is not installed (only files of this
+                     format fail; the others are still read)
+    """
+    library = _libraries.get(file_format)
+    if library is None:
+        module_name, package = FORMAT_LIBRARIES[file_format]
+        with _libraries_lock:
+            library = _libraries.get(file_format)
+            if library is None:
+                try:
+                    library = importlib.import_module(module_name)
+                except ImportError as e:
+                    raise ImportError(f"{e} (install it with: pip install {package})") from e
+                _libraries[file_format] = library
+    return library
+
+
+def preload_libraries():
+    """
+    Import every installed parser library now (e.g. before forking worker
+    processes, so each worker starts with them loaded)
+    
+    Returns:
+        Names of the formats whose library could not be imported
+    """
+    missing = []
+    for file_format in FORMAT_LIBRARIES:
+        try:
+            load_library(file_format)
+        except ImportError as e:
+            print(f"[!] {e}")
+            missing.append(file_format)
+    return missing
+
+
+def select_pdf_pages(page_count):
+    """
+    Choose which PDF pages to extract
+    
+    With PDF_PAGE_STRATEGY = "sample", reads the first PDF_SAMPLE_FIRST_PAGES
+    pages, the last PDF_SAMPLE_LAST_PAGES pages and PDF_SAMPLE_SPACED_PAGES
+    pages evenly spaced in between. Short documents are read in full.
+    
+    Args:
+        page_count: Number of pages in the PDF
+    
+    Returns:
+        Sorted list of page indexes
+    """
+    if PDF_PAGE_STRATEGY != "sample":
+        return list(range(page_count))
+    
+    first = min(PDF_SAMPLE_FIRST_PAGES, page_count)
+    last = min(PDF_SAMPLE_LAST_PAGES, page_count - first)
+    pages = set(range(first)) | set(range(page_count - last, page_count))
+    
+    # Evenly spaced pages from the middle section
+    middle_start, middle_end = first, page_count - last
+    middle_count = middle_end - middle_start
+    spaced = min(PDF_SAMPLE_SPACED_PAGES, middle_count)
+    for i in range(spaced):
+        pages.add(middle_start + (2 * i + 1) * middle_count // (2 * spaced))
+    
+    return sorted(pages)
+
+
+def iter_text_from_pdf(file_path, progress=None):
+    """Yield text from PDF files one page at a time (see select_pdf_pages)"""
+    if hasattr(file_path, "read"):
+        yield from iter_pdf_pages(file_path, progress)
+        return
+    with open(file_path, 'rb') as f:
+        yield from iter_pdf_pages(f, progress)
+
+
+def iter_pdf_pages(stream, progress=None):
+    """Yield text of the selected pages of an open binary PDF stream"""
+    pdf_reader = load_library("pdf").PdfReader(stream)
+    pages = select_pdf_pages(len(pdf_reader.pages))
+    if progress is not None:
+        progress["total_chunks"] = len(pages)
+        progress["skipped_chunks"] = len(pdf_reader.pages) - len(pages)
+    for index, page_index in enumerate(pages):
+        yield (" " if index else "") + pdf_reader.pages[page_index].extract_text()
+
+
+def iter_text_from_docx(file_path, progress=None):
+    """Yield text from DOCX files one paragraph at a time"""
+    doc = load_library("docx").Document(file_path)
+    if progress is not None:
+        progress["total_chunks"] = len(doc.paragraphs)
+    for index, paragraph in enumerate(doc.paragraphs):
+        yield (" " if index else "") + paragraph.text
+
+
+def iter_text_from_xlsx(file_path, progress=None):
+    """
+    Yield text from XLSX files one row at a time
+    
+    The workbook is opened read-only with cached values instead of formulas,
+    so rows are parsed lazily and never built into cell objects. Reading
+    stops at XLSX_MAX_SHEETS sheets, XLSX_MAX_ROWS rows per sheet and
+    XLSX_MAX_CELLS non-empty cells in total.
+    """
+    wb = load_library("excel").load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheetnames = wb.sheetnames[:XLSX_MAX_SHEETS] if XLSX_MAX_SHEETS else wb.sheetnames
+        if progress is not None:
+            # Upper bound: empty rows are skipped; max_row may be unknown in read-only mode
+            max_rows = [wb[sheet].max_row or 0 for sheet in sheetnames]
+            if XLSX_MAX_ROWS:
+                max_rows = [min(rows, XLSX_MAX_ROWS) for rows in max_rows]
+            if all(max_rows):
+                progress["total_chunks"] = sum(max_rows)
+        
+        first = True
+        cells_read = 0
+        for sheet in sheetnames:
+            ws = wb[sheet]
+            for row in ws.iter_rows(max_row=XLSX_MAX_ROWS, values_only=True):
+                cells = [str(cell) for cell in row if cell]
+                if XLSX_MAX_CELLS and cells_read + len(cells) > XLSX_MAX_CELLS:
+                    cells = cells[:XLSX_MAX_CELLS - cells_read]
+                if cells:
+                    yield ("" if first else " ") + " ".join(cells)
+                    first = False
+                    cells_read += len(cells)
+                if XLSX_MAX_CELLS and cells_read >= XLSX_MAX_CELLS:
+                    return
+    finally:
+        # Read-only workbooks keep the file open until closed
+        wb.close()
+
+
+def iter_text_from_pptx(file_path, progress=None):
+    """Yield text from PPTX files one slide at a time"""
+    prs = load_library("pptx").Presentation(file_path)
+    if progress is not None:
+        # Upper bound: slides without text are skipped
+        progress["total_chunks"] = len(prs.slides)
+    first = True
+    for slide in prs.slides:
+        texts = [shape.text for shape in slide.shapes if hasattr(shape, "text")]
+        if texts:
+            yield ("" if first else " ") + " ".join(texts)
+            first = False
+
+
+def iter_text_from_plain(file_path, progress=None):
+    """Yield text from Markdown/TXT files in fixed-size blocks"""
+    if hasattr(file_path, "read"):
+        # Binary stream; undecodable bytes (e.g. a cut-off last character) are dropped
+        f = io.TextIOWrapper(file_path, encoding='utf-8', errors='ignore')
+        try:
+            yield from iter(lambda: f.read(TEXT_CHUNK_SIZE), "")
+        finally:
+            f.detach()
+        return
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for block in iter(lambda: f.read(TEXT_CHUNK_SIZE), ""):
+            yield block
+
+
+def extraction_failed(kind, file_path, error, strict):
+    """
+    Report a file that could not be read or parsed
+    
+    Raises:
+        ExtractionError: in strict mode
+    
+    Returns:
+        "" (the error is printed)
+    """
+    message = f"Error reading {kind} {file_path}: {error}"
+    if strict:
+        raise ExtractionError(message) from error
+    print(message)
+    return ""
+
+
+def extract_text_from_pdf(file_path, strict=False):
     """Extract text from PDF files"""
     try:
-        text = []
-        with open(file_path, 'rb') as f:
-            pdf_reader = PyPDF2.PdfReader(f)
-            for page in pdf_reader.pages:
-                text.append(page.extract_text())
-        return " ".join(text)
+        return "".join(iter_text_from_pdf(file_path))
     except Exception as e:
-        print(f"Error reading PDF {file_path}: {e}")
-        return ""
+        return extraction_failed("PDF", file_path, e, strict)
 
 
-def extract_text_from_docx(file_path):
+def extract_text_from_docx(file_path, strict=False):
     """Extract text from DOCX files"""
     try:
-        doc = Document(file_path)
-        text = []
-        for paragraph in doc.paragraphs:
-            text.append(paragraph.text)
-        return " ".join(text)
+        return "".join(iter_text_from_docx(file_path))
     except Exception as e:
-        print(f"Error reading DOCX {file_path}: {e}")
-        return ""
+        return extraction_failed("DOCX", file_path, e, strict)
 
 
-def extract_text_from_xlsx(file_path):
+def extract_text_from_xlsx(file_path, strict=False):
     """Extract text from XLSX files"""
     try:
-        wb = load_workbook(file_path)
-        text = []
-        for sheet in wb.sheetnames:
-            ws = wb[sheet]
-            for row in ws.iter_rows(values_only=True):
-                for cell in row:
-                    if cell:
-                        text.append(str(cell))
-        return " ".join(text)
+        return "".join(iter_text_from_xlsx(file_path))
     except Exception as e:
-        print(f"Error reading XLSX {file_path}: {e}")
-        return ""
+        return extraction_failed("XLSX", file_path, e, strict)
 
 
-def extract_text_from_pptx(file_path):
+def extract_text_from_pptx(file_path, strict=False):
     """Extract text from PPTX files"""
     try:
-        prs = Presentation(file_path)
-        text = []
-        for slide in prs.slides:
-            for shape in slide.shapes:
-                if hasattr(shape, "text"):
-                    text.append(shape.text)
-        return " ".join(text)
+        return "".join(iter_text_from_pptx(file_path))
     except Exception as e:
-        print(f"Error reading PPTX {file_path}: {e}")
-        return ""
+        return extraction_failed("PPTX", file_path, e, strict)
 
 
-def extract_text_from_markdown(file_path):
+def extract_text_from_markdown(file_path, strict=False):
     """Extract text from Markdown files"""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             return f.read()
     except Exception as e:
-        print(f"Error reading Markdown {file_path}: {e}")
-        return ""
+        return extraction_failed("Markdown", file_path, e, strict)
 
 
-def extract_text_from_text(file_path):
+def extract_text_from_text(file_path, strict=False):
     """Extract text from TXT files"""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             return f.read()
     except Exception as e:
-        print(f"Error reading TXT {file_path}: {e}")
+        return extraction_failed("TXT", file_path, e, strict)
+
+
+# Whole-file extractors by format name, and by extension from SUPPORTED_EXTENSIONS
+FORMAT_EXTRACTORS = {
+    "pdf": extract_text_from_pdf,
+    "docx": extract_text_from_docx,
+    "excel": extract_text_from_xlsx,
+    "pptx": extract_text_from_pptx,
+    "markdown": extract_text_from_markdown,
+    "text": extract_text_from_text,
+}
+
+EXTRACTORS = {
+    extension: FORMAT_EXTRACTORS[file_format]
+    for extension, file_format in SUPPORTED_EXTENSIONS.items()
+}
+
+# Streaming extractors by format name, and by extension
+FORMAT_STREAM_EXTRACTORS = {
+    "pdf": iter_text_from_pdf,
+    "docx": iter_text_from_docx,
+    "excel": iter_text_from_xlsx,
+    "pptx": iter_text_from_pptx,
+    "markdown": iter_text_from_plain,
+    "text": iter_text_from_plain,
+}
+
+STREAM_EXTRACTORS = {
+    extension: FORMAT_STREAM_EXTRACTORS[file_format]
+    for extension, file_format in SUPPORTED_EXTENSIONS.items()
+}
+
+
+def text_length_bound(file_path):
+    """
+    Upper bound on the characters of text a file can yield
+    
+    UTF-8 text has no more characters than bytes. DOCX and PPTX text comes
+    from XML parts of the zip, where every character takes at least one
+    byte uncompressed. PDF (a font can map one code to several characters)
+    and XLSX (one shared string can fill any number of cells) have no such
+    bound.
+    
+    Args:
+        file_path: Path to the document
+    
+    Returns:
+        Character count, or None if no bound is known
+    """
+    file_path = Path(file_path)
+    extension = file_path.suffix.lower()
+    try:
+        if SUPPORTED_EXTENSIONS.get(extension) in ("markdown", "text"):
+            return file_path.stat().st_size
+        if extension in OFFICE_TEXT_PARTS:
+            with zipfile.ZipFile(file_path) as archive:
+                return sum(info.file_size for info in archive.infolist()
+                           if fnmatch(info.filename, OFFICE_TEXT_PARTS[extension]))
+    except (OSError, zipfile.BadZipFile):
+        pass
+    return None
+
+
+def iter_content(file_path, max_chars=None, max_chunks=None, progress=None):
+    """
+    Stream content from any supported file format in chunks
+    (pages for PDF, paragraphs for DOCX, rows for XLSX, slides for PPTX,
+    fixed-size blocks for text). Concatenating every chunk gives the same
+    text as extract_content.
+    
+    Args:
+        file_path: Path to the document
+        max_chars: Stop after this many characters of text (None = no limit)
+        max_chunks: Stop after this many chunks (None = no limit)
+        progress: Optional dict; "total_chunks" is set once the format
+                  knows (an upper bound on) how many chunks it has, and
+                  "skipped_chunks" when some are never read (sampled PDF pages)
+    
+    Yields:
+        Text chunks; stops early (without error) when a budget is reached
+    """
+    file_path = Path(file_path)
+    iter_text = STREAM_EXTRACTORS.get(file_path.suffix.lower())
+    if iter_text is None:
+        print(f"[!] Unsupported file format: {file_path.suffix.lower()}")
+        return
+    
+    yield from iter_budgeted(iter_text(file_path, progress), max_chars, max_chunks, file_path)
+
+
+def iter_budgeted(chunks, max_chars, max_chunks, source):
+    """Pass chunks through until a budget is reached; parse errors end the stream"""
+    chars_read = 0
+    try:
+        for index, chunk in enumerate(chunks):
+            if max_chunks is not None and index >= max_chunks:
+                return
+            if max_chars is not None and chars_read + len(chunk) >= max_chars:
+                yield chunk[:max_chars - chars_read]
+                return
+            chars_read += len(chunk)
+            yield chunk
+    except Exception as e:
+        print(f"Error streaming {source}: {e}")
+
+
+def resolve_format(format_hint):
+    """
+    Get the extension of a supported format from a hint
+    
+    Args:
+        format_hint: Extension (".pdf" or "pdf"), filename, or MIME type
+    
+    Returns:
+        Lowercase extension such as ".pdf", or None if unsupported
+    """
+    hint = str(format_hint).strip().lower()
+    mime_type = hint.split(";")[0].strip()
+    if mime_type in MIME_EXTENSIONS:
+        return MIME_EXTENSIONS[mime_type]
+    
+    if hint.startswith(".") and hint.count(".") == 1:
+        extension = hint
+    else:
+        extension = Path(hint).suffix or f".{hint}"
+    return extension if extension in STREAM_EXTRACTORS else None
+
+
+def open_stream(source):
+    """
+    Wrap an in-memory source as a seekable binary stream without copying it
+    
+    Args:
+        source: bytes, bytearray, memoryview, mmap or binary file-like object
+    
+    Returns:
+        (stream, owned); owned streams are closed by the caller
+    """
+    if hasattr(source, "read") and not isinstance(source, mmap.mmap):
+        return source, False
+    return BufferStream(source), True
+
+
+def iter_content_from_stream(source, format_hint, max_chars=None, max_chunks=None, progress=None):
+    """
+    Stream content from a document held in memory, like iter_content
+    
+    Args:
+        source: bytes, bytearray, memoryview, mmap or binary file-like
+                object (seekable for PDF and Office formats)
+        format_hint: Extension, filename or MIME type giving the format
+        max_chars: Stop after this many characters of text (None = no limit)
+        max_chunks: Stop after this many chunks (None = no limit)
+        progress: Optional dict; "total_chunks" is set as in iter_content
+    
+    Yields:
+        Text chunks; stops early (without error) when a budget is reached
+    """
+    extension = resolve_format(format_hint)
+    if extension is None:
+        print(f"[!] Unsupported file format: {format_hint}")
+        return
+    
+    stream, owned = open_stream(source)
+    try:
+        yield from iter_budgeted(STREAM_EXTRACTORS[extension](stream, progress),
+                                 max_chars, max_chunks, f"{extension} stream")
+    finally:
+        if owned:
+            stream.close()
+
+
+def extract_text_from_stream(source, format_hint):
+    """
+    Extract text from a document held in memory, without a temp file
+    
+    Args:
+        source: bytes, bytearray, memoryview, mmap or binary file-like
+                object (seekable for PDF and Office formats)
+        format_hint: Extension, filename or MIME type giving the format
+    
+    Returns:
+        Content text ("" if it cannot be parsed), or None if the format is unsupported
+    """
+    extension = resolve_format(format_hint)
+    if extension is None:
+        return None
+    
+    stream, owned = open_stream(source)
+    try:
+        return "".join(STREAM_EXTRACTORS[extension](stream))
+    except Exception as e:
+        print(f"Error reading {extension} from memory: {e}")
+        return ""
+    finally:
+        if owned:
+            stream.close()
+
+
+def extract_text_from_bytes(data, extension, use_service=True):
+    """
+    Extract text from document bytes (e.g. a Drive download)
+    
+    Args:
+        data: Document bytes
+        extension: File extension giving the format (e.g. ".docx")
+        use_service: Send the job to the extraction service when
+                     EXTRACTION_SERVICE_ENABLED and one is running
+    
+    Returns:
+        Content text ("" if it cannot be parsed), or None if the format is unsupported
+    """
+    if use_service and EXTRACTION_SERVICE_ENABLED and resolve_format(extension):
+        from extraction_service import extract_stream_remote
+        try:
+            content = extract_stream_remote(data, extension)
+        except ExtractionError as e:
+            print(e)
+            return ""
+        if content is not None:
+            return content
+    return extract_text_from_stream(data, extension)
+
+
+def extract_text_from_mapped_file(file_path):
+    """
+    Extract text from a local file through a read-only memory map
+    
+    The parsers read pages of the mapping straight from the OS page cache
+    instead of through buffered file reads.
+    
+    Args:
+        file_path: Path to the document
+    
+    Returns:
+        Content text ("" if it cannot be parsed), or None if the format is unsupported
+    """
+    file_path = Path(file_path)
+    if resolve_format(file_path.suffix) is None:
+        return None
+    try:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return extract_text_from_stream(b"", file_path.suffix)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return extract_text_from_stream(mapped, file_path.suffix)
+    except Exception as e:
+        print(f"Error mapping {file_path}: {e}")
         return ""
 
 
-def extract_content(file_path):
+_extraction_cache = None
+
+
+def get_extraction_cache():
+    """Get the shared extraction cache, or None if caching is disabled"""
+    global _extraction_cache
+    if not EXTRACTION_CACHE_ENABLED:
+        return None
+    if _extraction_cache is None:
+        cache_path = EXTRACTION_CACHE_PATH or (Path.home() / ".document_classifier" / "extraction_cache.db")
+        _extraction_cache = ExtractionCache(cache_path, EXTRACTION_CACHE_MAX_BYTES)
+    return _extraction_cache
+
+
+def get_extraction_variant():
+    """Describe extractor settings that change the extracted text (cache key)"""
+    pdf = PDF_PAGE_STRATEGY
+    if PDF_PAGE_STRATEGY == "sample":
+        pdf += f",{PDF_SAMPLE_FIRST_PAGES},{PDF_SAMPLE_LAST_PAGES},{PDF_SAMPLE_SPACED_PAGES}"
+    return f"xlsx={XLSX_MAX_SHEETS},{XLSX_MAX_ROWS},{XLSX_MAX_CELLS};pdf={pdf}"
+
+
+def extract_text(file_path, use_service=True, strict=False):
+    """
+    Extract text from a supported file by dispatching on its extension
+    
+    With EXTRACTION_SERVICE_ENABLED, the job goes to the running extraction
+    service (warm parsers); without one it is extracted here. A failure
+    reported by the service is final: the file is not parsed again here.
+    
+    Args:
+        file_path: Path to the document
+        use_service: Try the extraction service first
+        strict: Raise ExtractionError when the file cannot be parsed
+                instead of printing the error and returning ""
+    
+    Returns: content text, or None if the format is unsupported
+    """
+    extension = Path(file_path).suffix.lower()
+    
+    if use_service and EXTRACTION_SERVICE_ENABLED and extension in STREAM_EXTRACTORS:
+        from extraction_service import extract_text_remote
+        try:
+            content = extract_text_remote(file_path)
+        except ExtractionError as e:
+            if strict:
+                raise
+            print(e)
+            return ""
+        if content is not None:
+            return content
+    
+    extractor = EXTRACTORS.get(extension)
+    return extractor(file_path, strict) if extractor else None
+
+
+def extract_content(file_path, use_cache=True):
     """
     Main function to extract content from any supported file format
+    
+    Args:
+        file_path: Path to the document
+        use_cache: Reuse text from the extraction cache for unchanged files
+    
     Returns: (filename, content_text)
     """
     file_path = Path(file_path)
@@ -112,23 +680,22 @@ def extract_content(file_path):
     filename = file_path.name
     extension = file_path.suffix.lower()
     
-    # Extract content based on file type
-    if extension == ".pdf":
-        content = extract_text_from_pdf(file_path)
-    elif extension == ".docx":
-        content = extract_text_from_docx(file_path)
-    elif extension == ".xlsx":
-        content = extract_text_from_xlsx(file_path)
-    elif extension == ".pptx":
-        content = extract_text_from_pptx(file_path)
-    elif extension == ".md":
-        content = extract_text_from_markdown(file_path)
-    elif extension == ".txt":
-        content = extract_text_from_text(file_path)
-    else:
+    if extension not in SUPPORTED_EXTENSIONS:
         print(f"[!] Unsupported file format: {extension}")
         return filename, ""
     
+    cache = get_extraction_cache() if use_cache else None
+    if cache is not None:
+        # Strict, so a failed parse is not cached as empty text
+        try:
+            content = cache.get_or_extract(file_path, lambda path: extract_text(path, strict=True),
+                                           get_extraction_variant())
+        except ExtractionError as e:
+            print(e)
+            content = ""
+    else:
+        content = extract_text(file_path)
+    
     return filename, content
 
 
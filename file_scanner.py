@@ -0,0 +1,97 @@
+"""
+File Scanner Module
+Walks directory trees with os.scandir and streams the files it finds
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from fnmatch import fnmatch
+from pathlib import Path
+
+
+def matches_any(name, relative_path, patterns):
+    """Check a file or directory against glob patterns (by name or by path from the root)"""
+    return any(fnmatch(name, pattern) or fnmatch(relative_path, pattern) for pattern in patterns)
+
+
+def scan_directory(root, directory, depth, max_depth, include, exclude, skip_dir):
+    """
+    List one directory
+    
+    File types come from the cached DirEntry data (d_type on Linux, the
+    directory listing on Windows), so no entry is stat'ed here.
+    
+    Returns:
+        (files, subdirectories, depth); files are Paths, subdirectories are
+        path strings to scan at depth + 1
+    """
+    files = []
+    subdirectories = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                relative_path = os.path.relpath(entry.path, root).replace(os.sep, "/")
+                if exclude and matches_any(entry.name, relative_path, exclude):
+                    continue
+                
+                # Symlinked directories are not followed, so links cannot loop
+                if entry.is_dir(follow_symlinks=False):
+                    if (max_depth is None or depth < max_depth) and not (skip_dir and skip_dir(entry.path)):
+                        subdirectories.append(entry.path)
+                elif entry.is_file():
+                    if not include or matches_any(entry.name, relative_path, include):
+                        files.append(Path(entry.path))
+    except OSError as e:
+        print(f"Error scanning {directory}: {e}")
+    return files, subdirectories, depth
+
+
+def iter_files(root, max_depth=0, include=None, exclude=None, workers=1, skip_dir=None):
+    """
+    Yield files under a directory as each directory is scanned
+    
+    With more than one worker, subdirectories are listed concurrently on a
+    thread pool (listing is I/O-bound, which matters on network file
+    systems) while the caller processes the files already found. New
+    directories are only submitted as results are consumed, so the walk
+    never runs far ahead of the caller.
+    
+    Args:
+        root: Directory to scan
+        max_depth: Subdirectory levels to descend (0 = only root, None = unlimited)
+        include: Glob patterns a file must match, by name or path relative
+                 to root (None or empty = every file)
+        exclude: Glob patterns for files and directories to skip; excluded
+                 directories are not descended into
+        workers: Threads listing directories (1 = walk in the calling thread)
+        skip_dir: Optional callable(path) -> True for directories not to descend into
+    
+    Yields:
+        Path of each file (dot files and dot directories are skipped); order
+        is not defined
+    """
+    root = str(root)
+    
+    def scan(directory, depth):
+        return scan_directory(root, directory, depth, max_depth, include, exclude, skip_dir)
+    
+    if not workers or workers <= 1:
+        directories = [(root, 0)]
+        while directories:
+            files, subdirectories, depth = scan(*directories.pop())
+            directories.extend((subdirectory, depth + 1) for subdirectory in subdirectories)
+            yield from files
+        return
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {executor.submit(scan, root, 0)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirectories, depth = future.result()
+                # Submit before yielding so workers keep listing while the caller works
+                for subdirectory in subdirectories:
+                    pending.add(executor.submit(scan, subdirectory, depth + 1))
+                yield from files
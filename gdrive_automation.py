@@ -5,12 +5,22 @@ Main entry point for automating file classification in Google Drive
 
 import sys
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from gdrive_manager import GoogleDriveManager
-from classifier import classify_document
+from classifier import (
+    classify_document, score_text, build_classification, CATEGORY_MATCHER, sum_keyword_counts
+)
 import tempfile
 from state_manager import StateManager
+from file_parser import extract_text_from_bytes
+from config import (
+    DRIVE_BATCH_SIZE, DRIVE_MAX_IN_FLIGHT, DRIVE_CONTENT_CLASSIFICATION, DRIVE_CONTENT_MAX_BYTES,
+    DRIVE_INCREMENTAL_SYNC, SUPPORTED_EXTENSIONS, CLASSIFICATION_KEYWORDS
+)
 
 
 def print_header(text):
@@ -35,24 +45,35 @@ class GoogleDriveAutomation:
         "CAPSTONE_WORK": "Capstone Work"
     }
     
-    def __init__(self, credentials_file='credentials.json'):
+    def __init__(self, credentials_file='credentials.json', drive_manager=None, content_mode=None):
         """
         Initialize Google Drive Automation
         
         Args:
             credentials_file: Path to Google Drive credentials
+            drive_manager: Optional GoogleDriveManager (e.g. over a FakeDriveService)
+            content_mode: Classify by downloaded content as well as filename
+                          (default: DRIVE_CONTENT_CLASSIFICATION)
         """
-        self.drive_manager = GoogleDriveManager(credentials_file)
-        if not self.drive_manager.is_authenticated():
-            raise Exception("Failed to authenticate with Google Drive")
+        self.content_mode = DRIVE_CONTENT_CLASSIFICATION if content_mode is None else content_mode
         
         # Initialize state manager (using temp location for Drive testing)
         temp_dir = Path(tempfile.gettempdir()) / "gdrive_automation"
         temp_dir.mkdir(exist_ok=True)
         self.state_manager = StateManager(temp_dir)
         
+        # Folder IDs are cached in the state database across runs
+        self.drive_manager = drive_manager or GoogleDriveManager(credentials_file,
+                                                                 state_manager=self.state_manager)
+        if self.drive_manager.state_manager is None:
+            self.drive_manager.state_manager = self.state_manager
+        if not self.drive_manager.is_authenticated():
+            raise Exception("Failed to authenticate with Google Drive")
+        
         # Create folder IDs mapping
         self.folder_ids = {}
+        self.replaced_folders = {}  # Stale folder ID -> replacement
+        self._refresh_lock = threading.Lock()
     
     def setup_folders(self):
         """Create/get category folders in Drive"""
@@ -63,7 +84,72 @@ class GoogleDriveAutomation:
             self.folder_ids[category] = folder_id
             print(f"✅ {folder_name}: {folder_id}")
     
-    def classify_file_from_drive(self, file_id, file_name, mime_type):
+    def refresh_category_folder(self, folder_id):
+        """
+        Re-resolve a category folder after a failed move, in case its
+        cached ID was trashed or deleted
+        
+        Args:
+            folder_id: Cached folder ID the move targeted
+        
+        Returns:
+            Replacement folder ID, or None if the cached ID is still valid
+        """
+        # Serialized so concurrent batches do not each create a replacement
+        with self._refresh_lock:
+            if folder_id in self.replaced_folders:
+                return self.replaced_folders[folder_id]
+            
+            if self.drive_manager.validate_folder(folder_id):
+                return None
+            
+            for category, cached_id in self.folder_ids.items():
+                if cached_id == folder_id:
+                    new_folder_id = self.drive_manager.get_or_create_folder(self.CATEGORY_FOLDERS[category])
+                    self.folder_ids[category] = new_folder_id
+                    self.replaced_folders[folder_id] = new_folder_id
+                    print(f"⚠️  {self.CATEGORY_FOLDERS[category]} folder was stale; now {new_folder_id}")
+                    return new_folder_id
+            return None
+    
+    def fetch_file_content(self, file_id, file_name, mime_type, size=None):
+        """
+        Get a Drive file's text within DRIVE_CONTENT_MAX_BYTES, parsed in memory
+        
+        Text and Markdown files are downloaded only up to the budget (a
+        leading byte range), and Google-native files are exported as text.
+        PDF and Office files keep their index at the end of the file, so a
+        leading range cannot be parsed; they are downloaded whole when they
+        fit the budget and skipped otherwise.
+        
+        Args:
+            file_id: Google Drive file ID
+            file_name: File name
+            mime_type: MIME type
+            size: File size in bytes from the listing, if known
+        
+        Returns:
+            Content text, or None if no content could be fetched in budget
+        """
+        if mime_type in self.drive_manager.TEXT_EXPORT_TYPES:
+            data = self.drive_manager.export_file_text(file_id, mime_type, DRIVE_CONTENT_MAX_BYTES)
+            extension = ".txt"
+        else:
+            extension = Path(file_name).suffix.lower()
+            if extension not in SUPPORTED_EXTENSIONS:
+                return None
+            if extension in (".txt", ".md"):
+                data = self.drive_manager.download_file_content(file_id, DRIVE_CONTENT_MAX_BYTES)
+            elif size is not None and int(size) <= DRIVE_CONTENT_MAX_BYTES:
+                data = self.drive_manager.download_file_content(file_id)
+            else:
+                return None
+        
+        if data is None:
+            return None
+        return extract_text_from_bytes(data, extension)
+    
+    def classify_file_from_drive(self, file_id, file_name, mime_type, size=None):
         """
         Classify a file from Google Drive
         
@@ -71,31 +157,36 @@ class GoogleDriveAutomation:
             file_id: Google Drive file ID
             file_name: File name
             mime_type: MIME type
+            size: File size in bytes from the listing, if known
         
         Returns:
             Classification result
         """
+        # In content mode, score the downloaded text exactly as the desktop
+        # classifier does; fall back to the filename when there is no content
+        if self.content_mode:
+            content = self.fetch_file_content(file_id, file_name, mime_type, size)
+            if content is not None:
+                filename_text = file_name.replace("_", " ").replace("-", " ")
+                scores, matched_keywords_per_category = score_text(filename_text, content)
+                return {
+                    "file_id": file_id,
+                    **build_classification(file_name, scores, matched_keywords_per_category)
+                }
+        
         # For Drive files, we'll use filename-based classification
         # (full content extraction would require downloading all files)
         # This is still intelligent as it uses keyword matching
         
-        from file_parser import normalize_text
-        from config import CLASSIFICATION_KEYWORDS
-        
         filename_text = file_name.replace("_", " ").replace("-", " ")
         
+        # Count keyword matches in filename (one scan for all categories)
+        counts = CATEGORY_MATCHER.count(filename_text)
+        
         # Score against categories
         scores = {}
         for category, category_info in CLASSIFICATION_KEYWORDS.items():
-            keywords = category_info["keywords"]
-            
-            # Count keyword matches in filename
-            matches = 0
-            filename_lower = normalize_text(filename_text)
-            for keyword in keywords:
-                matches += filename_lower.count(keyword.lower())
-            
-            scores[category] = matches
+            scores[category] = sum_keyword_counts(counts, category_info["keywords"])
         
         # Find best category
         best_category = max(scores, key=scores.get)
@@ -110,7 +201,96 @@ class GoogleDriveAutomation:
             "status": "success"
         }
     
-    def process_file(self, file_id, file_name, mime_type, run_id=None):
+    def record_run_detail(self, run_id, file_name, classification, status, pending_writes=None):
+        """Record a run detail now, or collect it for a bulk write"""
+        if not run_id:
+            return
+        detail = (
+            run_id,
+            file_name,
+            classification,
+            f"Move to {classification['category']}",
+            status
+        )
+        if pending_writes is not None:
+            pending_writes.append(detail)
+        else:
+            self.state_manager.record_run_detail(*detail)
+    
+    def move_result(self, file_id, file_name, classification, success, run_id=None, pending_writes=None):
+        """Record a finished move and build its processing result"""
+        if success:
+            self.record_run_detail(run_id, file_name, classification, "success", pending_writes)
+            return {
+                "file_id": file_id,
+                "filename": file_name,
+                "category": classification["category"],
+                "confidence_score": classification["confidence_score"],
+                "status": "success",
+                "reason": f"Moved to {self.CATEGORY_FOLDERS[classification['category']]}"
+            }
+        else:
+            self.record_run_detail(run_id, file_name, classification, "error", pending_writes)
+            return {
+                "file_id": file_id,
+                "filename": file_name,
+                "category": classification["category"],
+                "status": "error",
+                "reason": "Failed to move file"
+            }
+    
+    def flush_moves(self, pending_moves, run_id=None, pending_writes=None):
+        """
+        Move queued files with batched requests and complete their results
+        
+        Args:
+            pending_moves: List of (result, classification, target_folder_id, parents)
+                           queued by process_file; emptied once moved
+            run_id: Optional run ID for tracking
+            pending_writes: Optional list collecting run details for a bulk write
+        """
+        if not pending_moves:
+            return
+        
+        outcomes = self.drive_manager.move_files(
+            [(result["file_id"], target_folder_id, parents)
+             for result, _, target_folder_id, parents in pending_moves]
+        )
+        
+        # A failed move may mean a cached category folder is gone; retry those
+        # moves once into the re-resolved folder (parents are re-read, since
+        # a move into a trashed folder does go through)
+        failed_targets = {target_folder_id for result, _, target_folder_id, _ in pending_moves
+                          if outcomes[result["file_id"]]["status"] != "success"}
+        replacements = {}
+        for target_folder_id in failed_targets:
+            new_folder_id = self.refresh_category_folder(target_folder_id)
+            if new_folder_id:
+                replacements[target_folder_id] = new_folder_id
+        if replacements:
+            outcomes.update(self.drive_manager.move_files(
+                [(result["file_id"], replacements[target_folder_id])
+                 for result, _, target_folder_id, _ in pending_moves
+                 if target_folder_id in replacements
+                 and outcomes[result["file_id"]]["status"] != "success"]
+            ))
+        
+        for result, classification, _, _ in pending_moves:
+            outcome = outcomes[result["file_id"]]
+            if outcome["status"] != "success":
+                print(outcome["message"])
+            result.update(self.move_result(
+                result["file_id"],
+                result["filename"],
+                classification,
+                outcome["status"] == "success",
+                run_id,
+                pending_writes
+            ))
+        pending_moves.clear()
+    
+    def process_file(self, file_id, file_name, mime_type, run_id=None, pending_writes=None,
+                     pending_moves=None, parents=None, size=None):
         """
         Process a single file: classify and move
         
@@ -119,6 +299,13 @@ class GoogleDriveAutomation:
             file_name: File name
             mime_type: MIME type
             run_id: Optional run ID for tracking
+            pending_writes: Optional list collecting run details for a bulk write
+            pending_moves: Optional list queueing the move for flush_moves
+                           instead of moving now (the result stays "pending"
+                           until then)
+            parents: Current parent folder IDs from the listing; when given,
+                     the location check and the move make no extra API calls
+            size: File size in bytes from the listing (content mode budget)
         
         Returns:
             Processing result
@@ -133,7 +320,7 @@ class GoogleDriveAutomation:
             }
         
         # Classify the file
-        classification = self.classify_file_from_drive(file_id, file_name, mime_type)
+        classification = self.classify_file_from_drive(file_id, file_name, mime_type, size)
         
         # Get target folder
         target_folder_id = self.folder_ids.get(classification["category"])
@@ -147,15 +334,12 @@ class GoogleDriveAutomation:
             }
         
         # Check if already in target folder (idempotency)
-        if self.drive_manager.is_file_in_folder(file_id, target_folder_id):
-            if run_id:
-                self.state_manager.record_run_detail(
-                    run_id,
-                    file_name,
-                    classification,
-                    f"Move to {classification['category']}",
-                    "skipped"
-                )
+        if parents is not None:
+            in_target = target_folder_id in parents
+        else:
+            in_target = self.drive_manager.is_file_in_folder(file_id, target_folder_id)
+        if in_target:
+            self.record_run_detail(run_id, file_name, classification, "skipped", pending_writes)
             return {
                 "file_id": file_id,
                 "filename": file_name,
@@ -164,76 +348,186 @@ class GoogleDriveAutomation:
                 "reason": "Already in target folder"
             }
         
-        # Move the file
-        success = self.drive_manager.move_file(file_id, target_folder_id)
-        
-        if success:
-            if run_id:
-                self.state_manager.record_run_detail(
-                    run_id,
-                    file_name,
-                    classification,
-                    f"Move to {classification['category']}",
-                    "success"
-                )
-            return {
-                "file_id": file_id,
-                "filename": file_name,
-                "category": classification["category"],
-                "confidence_score": classification["confidence_score"],
-                "status": "success",
-                "reason": f"Moved to {self.CATEGORY_FOLDERS[classification['category']]}"
-            }
-        else:
-            if run_id:
-                self.state_manager.record_run_detail(
-                    run_id,
-                    file_name,
-                    classification,
-                    f"Move to {classification['category']}",
-                    "error"
-                )
-            return {
+        # Queue the move for a batched request
+        if pending_moves is not None:
+            result = {
                 "file_id": file_id,
                 "filename": file_name,
                 "category": classification["category"],
-                "status": "error",
-                "reason": "Failed to move file"
+                "status": "pending",
+                "reason": "Move queued"
             }
+            pending_moves.append((result, classification, target_folder_id, parents))
+            return result
+        
+        # Move the file
+        success = self.drive_manager.move_file(file_id, target_folder_id, parents)
+        if not success:
+            # Retry once if the cached category folder turned out to be stale
+            new_folder_id = self.refresh_category_folder(target_folder_id)
+            if new_folder_id:
+                success = self.drive_manager.move_file(file_id, new_folder_id)
+        return self.move_result(file_id, file_name, classification, success, run_id, pending_writes)
+    
+    def submit_moves(self, executor, in_flight, pending_moves, run_id=None, pending_writes=None):
+        """
+        Hand queued moves to a pipeline worker, blocking while max_in_flight
+        batches are already running
+        
+        Returns:
+            Future of the flush_moves call
+        """
+        in_flight.acquire()
+        future = executor.submit(self.flush_moves, list(pending_moves), run_id, pending_writes)
+        future.add_done_callback(lambda _: in_flight.release())
+        pending_moves.clear()
+        return future
+    
+    def changed_root_files(self, changes):
+        """
+        Files in Drive root that a list of changes added or modified
+        
+        Files the automation moved into category folders, trashed files and
+        removed files show up in the changes feed too; they are dropped.
+        
+        Args:
+            changes: Changes from GoogleDriveManager.list_changes
+        
+        Returns:
+            List of file dicts, one per file, in the order they last changed
+        """
+        root_ids = {'root', self.drive_manager.get_root_folder_id()}
+        
+        # A file can appear once per page; its last entry is its current state
+        latest = {}
+        for change in changes:
+            latest.pop(change['fileId'], None)
+            latest[change['fileId']] = change
+        
+        return [
+            change['file'] for change in latest.values()
+            if not change.get('removed') and 'file' in change
+            and not change['file'].get('trashed', False)
+            and root_ids.intersection(change['file'].get('parents', []))
+        ]
+    
+    def get_sync_files(self, incremental):
+        """
+        Choose the files a run processes
+        
+        Incremental runs read the Changes API from the page token saved by
+        the last run. The first run, or a run whose token was rejected,
+        takes a fresh token and then lists the whole root.
+        
+        Args:
+            incremental: Use the Changes API when a page token is saved
+        
+        Returns:
+            (files, new_page_token, sync_mode, change_count); new_page_token
+            is None when the run should not save one
+        """
+        if not incremental:
+            return self.drive_manager.iter_files_in_folder(only_root=True), None, "full", 0
+        
+        page_token = self.state_manager.get_drive_page_token()
+        if page_token:
+            changes, new_page_token = self.drive_manager.list_changes(page_token)
+            if changes is not None and new_page_token:
+                return self.changed_root_files(changes), new_page_token, "incremental", len(changes)
+            print("⚠️  Saved Drive page token was rejected; running a full sync")
+        
+        # The token is taken before listing, so changes made while the
+        # listing runs are picked up by the next run
+        new_page_token = self.drive_manager.get_start_page_token()
+        return self.drive_manager.iter_files_in_folder(only_root=True), new_page_token, "full", 0
     
-    def process_all_files(self, run_id=None):
+    def process_all_files(self, run_id=None, batch_moves=True, pipeline=False, max_in_flight=None,
+                          incremental=None):
         """
-        Process all files in Drive root
+        Process all files in Drive root, or only those changed since the
+        last run in incremental mode
         
         Args:
             run_id: Optional run ID for tracking
+            batch_moves: Move files in batched requests of DRIVE_BATCH_SIZE
+                         instead of one request at a time
+            pipeline: Send move batches from worker threads while listing and
+                      classification continue (implies batch_moves)
+            max_in_flight: Concurrent move batches in pipeline mode
+                           (default: DRIVE_MAX_IN_FLIGHT)
+            incremental: Process only files added or modified since the last
+                         run's saved page token (default: DRIVE_INCREMENTAL_SYNC)
         
         Returns:
             Processing results summary
         """
-        # List all files in root
-        files = self.drive_manager.list_files_in_folder(only_root=True)
+        start_time = time.perf_counter()
+        batch_moves = batch_moves or pipeline
+        if incremental is None:
+            incremental = DRIVE_INCREMENTAL_SYNC
+        
+        # API calls are counted per run
+        self.drive_manager.reset_api_calls()
+        
+        # Move batches run on workers; the semaphore bounds how many are in flight
+        executor = None
+        if pipeline:
+            max_in_flight = max_in_flight or DRIVE_MAX_IN_FLIGHT
+            executor = ThreadPoolExecutor(max_workers=max_in_flight)
+            in_flight = threading.BoundedSemaphore(max_in_flight)
+        futures = []
         
-        # Filter out folders and system files
-        files = [f for f in files if not f['name'].startswith('.')]
+        # Files in root arrive page by page (the next page is fetched while
+        # the current one is processed), or come from the changes feed
+        files, new_page_token, sync_mode, change_count = self.get_sync_files(incremental)
+        
+        # Filter out system files
+        files = (f for f in files if not f['name'].startswith('.'))
         
         results = []
         stats = {
-            "total_files": len(files),
+            "total_files": 0,
             "successful_moves": 0,
             "skipped_files": 0,
             "errors": 0
         }
         
+        # Run details for the whole run are written in bulk at the end
+        pending_writes = []
+        pending_moves = [] if batch_moves else None
+        
         for file in files:
             result = self.process_file(
                 file['id'],
                 file['name'],
                 file['mimeType'],
-                run_id
+                run_id,
+                pending_writes,
+                pending_moves,
+                file.get('parents'),
+                file.get('size')
             )
             results.append(result)
             
+            if batch_moves and len(pending_moves) >= DRIVE_BATCH_SIZE:
+                if executor:
+                    futures.append(self.submit_moves(executor, in_flight, pending_moves,
+                                                     run_id, pending_writes))
+                else:
+                    self.flush_moves(pending_moves, run_id, pending_writes)
+        
+        if executor:
+            if pending_moves:
+                futures.append(self.submit_moves(executor, in_flight, pending_moves,
+                                                 run_id, pending_writes))
+            for future in futures:
+                future.result()
+            executor.shutdown()
+        elif batch_moves:
+            self.flush_moves(pending_moves, run_id, pending_writes)
+        
+        for result in results:
+            stats["total_files"] += 1
             if result["status"] == "success":
                 stats["successful_moves"] += 1
             elif result["status"] == "skipped":
@@ -241,19 +535,37 @@ class GoogleDriveAutomation:
             elif result["status"] == "error":
                 stats["errors"] += 1
         
+        self.state_manager.record_run_details(pending_writes)
+        
+        # The token only advances after a clean run, so files that failed
+        # are seen again by the next run
+        if new_page_token and stats["errors"] == 0:
+            self.state_manager.save_drive_page_token(new_page_token)
+        
+        stats["sync_mode"] = sync_mode
+        stats["changes"] = change_count
+        stats["api_calls"] = self.drive_manager.reset_api_calls()
+        stats["elapsed_seconds"] = time.perf_counter() - start_time
+        stats["files_per_second"] = (stats["total_files"] / stats["elapsed_seconds"]
+                                     if stats["elapsed_seconds"] else 0.0)
+        
         return {
             **stats,
             "results": results
         }
 
 
-def run_gdrive_automation(credentials_file='credentials.json', run_limit=5):
+def run_gdrive_automation(credentials_file='credentials.json', run_limit=5, pipeline=False,
+                          incremental=None):
     """
     Run Google Drive automation multiple times
     
     Args:
         credentials_file: Path to Google Drive credentials
         run_limit: Number of runs to execute
+        pipeline: Use the concurrent pipelined mode
+        incremental: Process only changes since the last run
+                     (default: DRIVE_INCREMENTAL_SYNC)
     
     Returns:
         Overall results
@@ -303,7 +615,7 @@ def run_gdrive_automation(credentials_file='credentials.json', run_limit=5):
         
         # Process all files
         print("\n📂 Processing files in Google Drive...")
-        results = automation.process_all_files(run_id)
+        results = automation.process_all_files(run_id, pipeline=pipeline, incremental=incremental)
         
         # Update state manager
         automation.state_manager.end_run(
@@ -317,10 +629,20 @@ def run_gdrive_automation(credentials_file='credentials.json', run_limit=5):
         
         # Print results
         print(f"\n✅ Processing complete:")
+        if results["sync_mode"] == "incremental":
+            print(f"   Sync: incremental ({results['changes']} changes since last run)")
+        else:
+            print(f"   Sync: full listing")
         print(f"   Total files in Drive: {results['total_files']}")
         print(f"   Successfully moved: {results['successful_moves']}")
         print(f"   Already in place: {results['skipped_files']}")
         print(f"   Errors: {results['errors']}")
+        api_calls = results["api_calls"]
+        breakdown = ", ".join(f"{method}: {count}" for method, count in sorted(api_calls.items())
+                              if method != "total")
+        print(f"   API calls: {api_calls['total']} ({breakdown})")
+        print(f"   Throughput: {results['files_per_second']:.1f} files/sec "
+              f"({results['elapsed_seconds']:.2f}s)")
         
         # Print file details
         print(f"\n📄 File Details:")
@@ -382,13 +704,18 @@ if __name__ == "__main__":
     credentials_file = 'credentials.json'
     run_count = 5
     
-    if len(sys.argv) > 1:
-        credentials_file = sys.argv[1]
-    if len(sys.argv) > 2:
-        run_count = int(sys.argv[2])
+    # --pipeline and --incremental may appear anywhere on the command line
+    pipeline = "--pipeline" in sys.argv
+    incremental = True if "--incremental" in sys.argv else None
+    args = [arg for arg in sys.argv[1:] if arg not in ("--pipeline", "--incremental")]
+    
+    if len(args) > 0:
+        credentials_file = args[0]
+    if len(args) > 1:
+        run_count = int(args[1])
     
     try:
-        results = run_gdrive_automation(credentials_file, run_count)
+        results = run_gdrive_automation(credentials_file, run_count, pipeline, incremental)
         if results:
             print("\n" + "="*70)
             print("✅ GOOGLE DRIVE AUTOMATION COMPLETED")
@@ -5,14 +5,96 @@ Handles authentication, file listing, classification, and movement in Google Dri
 
 import os
 import pickle
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from google.api_python_client import discovery
+from googleapiclient import discovery
 from classifier import classify_document
+from config import (
+    DRIVE_PAGE_SIZE, DRIVE_LIST_FIELDS, DRIVE_PREFETCH_PAGES,
+    DRIVE_BATCH_SIZE, DRIVE_MAX_RETRIES, DRIVE_RETRY_BASE_DELAY,
+    DRIVE_REQUESTS_PER_SECOND, DRIVE_RATE_BURST
+)
 import tempfile
-import io
+import json
+
+
+# Rate-limit (429) and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# A 403 is only retried for these reasons; others (permissions, scopes) are permanent
+RETRYABLE_403_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+def get_http_status(error):
+    """Get the HTTP status code of a Drive API error, or None"""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'resp', None), 'status', None)
+    return int(status) if status is not None else None
+
+
+def get_error_reasons(error):
+    """Get the reasons (e.g. "userRateLimitExceeded") listed in a Drive API error"""
+    details = getattr(error, 'error_details', None)
+    if not isinstance(details, list):
+        try:
+            content = getattr(error, 'content', b'') or b''
+            if isinstance(content, bytes):
+                content = content.decode('utf-8', errors='replace')
+            details = json.loads(content).get('error', {}).get('errors', [])
+        except (ValueError, AttributeError):
+            details = []
+    return {detail.get('reason') for detail in details if isinstance(detail, dict)}
+
+
+def is_retryable(error):
+    """Check if a failed request is worth retrying (rate limits, server and connection errors)"""
+    status = get_http_status(error)
+    if status is None:
+        return isinstance(error, OSError)
+    if status == 403:
+        return bool(get_error_reasons(error) & RETRYABLE_403_REASONS)
+    return status in RETRYABLE_STATUSES
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting requests per second"""
+    
+    def __init__(self, rate, capacity):
+        """
+        Initialize token bucket
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Most tokens that can accumulate (the burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens=1):
+        """
+        Take tokens, sleeping until the bucket can cover them
+        
+        Tokens are reserved immediately (the balance may go negative), so
+        concurrent callers queue up behind each other rather than racing.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
 
 
 class GoogleDriveManager:
@@ -21,18 +103,95 @@ class GoogleDriveManager:
     # If modifying these scopes, delete the file token.pickle
     SCOPES = ['https://www.googleapis.com/auth/drive']
     
-    def __init__(self, credentials_file='credentials.json', token_file='token.pickle'):
+    # Text formats Google-native files are exported as for content classification
+    TEXT_EXPORT_TYPES = {
+        'application/vnd.google-apps.document': 'text/plain',
+        'application/vnd.google-apps.presentation': 'text/plain',
+        'application/vnd.google-apps.spreadsheet': 'text/csv'
+    }
+    
+    def __init__(self, credentials_file='credentials.json', token_file='token.pickle', service=None,
+                 state_manager=None):
         """
         Initialize Google Drive Manager
         
         Args:
             credentials_file: Path to credentials.json from Google Cloud Console
             token_file: Path to save/load OAuth token
+            service: Optional ready-made Drive service (e.g. FakeDriveService);
+                     skips authentication when given
+            state_manager: Optional StateManager persisting folder IDs across runs
         """
         self.credentials_file = credentials_file
         self.token_file = token_file
-        self.service = None
-        self.authenticate()
+        self.credentials = None
+        self._service = service
+        self._local = threading.local()
+        self.state_manager = state_manager
+        self._folder_ids = None  # (parent_id, name) -> folder_id, loaded on first use
+        self._folder_lock = threading.RLock()  # Guards _folder_ids across move threads
+        self._root_id = None
+        self.api_calls = Counter()
+        self._calls_lock = threading.Lock()
+        self.rate_limiter = None
+        if DRIVE_REQUESTS_PER_SECOND:
+            self.rate_limiter = TokenBucket(DRIVE_REQUESTS_PER_SECOND, DRIVE_RATE_BURST)
+        if service is None:
+            self.authenticate()
+    
+    @property
+    def service(self):
+        """Drive service for the calling thread (each thread builds its own)"""
+        if self.credentials is None:
+            return self._service
+        if getattr(self._local, "service", None) is None:
+            self._local.service = self.build_service()
+        return self._local.service
+    
+    def track_call(self, method, count=1):
+        """
+        Count Drive API calls by method (batch round trips count as "batch")
+        and wait for rate-limit tokens for them
+        """
+        with self._calls_lock:
+            self.api_calls[method] += count
+        if self.rate_limiter and method != "batch":
+            self.rate_limiter.acquire(count)
+    
+    def execute(self, request, method):
+        """
+        Execute one API request, retrying rate-limit and server errors
+        with exponential backoff
+        
+        Args:
+            request: Request object from the Drive service
+            method: API method name the call is counted under
+        
+        Returns:
+            The API response
+        """
+        for attempt in range(DRIVE_MAX_RETRIES + 1):
+            self.track_call(method)
+            try:
+                return request.execute()
+            except Exception as e:
+                if attempt == DRIVE_MAX_RETRIES or not is_retryable(e):
+                    raise
+                time.sleep(DRIVE_RETRY_BASE_DELAY * 2 ** attempt)
+    
+    def reset_api_calls(self):
+        """
+        Return the API call counts so far and start counting from zero
+        
+        Returns:
+            Dict of method -> calls, plus "total" (API calls, excluding batch
+            round trips)
+        """
+        with self._calls_lock:
+            calls = dict(self.api_calls)
+            self.api_calls.clear()
+        calls["total"] = sum(count for method, count in calls.items() if method != "batch")
+        return calls
     
     def authenticate(self):
         """Authenticate with Google Drive API"""
@@ -61,13 +220,25 @@ class GoogleDriveManager:
             with open(self.token_file, 'wb') as token:
                 pickle.dump(creds, token)
         
-        self.service = discovery.build('drive', 'v3', credentials=creds)
+        self.credentials = creds
         print("✅ Google Drive authenticated successfully")
         return True
     
+    def build_service(self):
+        """
+        Build a Drive service object
+        
+        googleapiclient services share one HTTP connection that is not
+        thread-safe, so background threads use a service of their own.
+        An injected service (no credentials) is returned as is.
+        """
+        if self.credentials is None:
+            return self._service
+        return discovery.build('drive', 'v3', credentials=self.credentials, cache_discovery=False)
+    
     def is_authenticated(self):
         """Check if authenticated with Google Drive"""
-        return self.service is not None
+        return self._service is not None or self.credentials is not None
     
     def find_folder_by_name(self, folder_name, parent_id='root'):
         """
@@ -85,12 +256,12 @@ class GoogleDriveManager:
             if parent_id != 'root':
                 query += f" and '{parent_id}' in parents"
             
-            results = self.service.files().list(
+            results = self.execute(self.service.files().list(
                 q=query,
                 spaces='drive',
                 fields='files(id, name)',
                 pageSize=10
-            ).execute()
+            ), "files.list")
             
             files = results.get('files', [])
             return files[0]['id'] if files else None
@@ -117,10 +288,10 @@ class GoogleDriveManager:
             if parent_id != 'root':
                 file_metadata['parents'] = [parent_id]
             
-            folder = self.service.files().create(
+            folder = self.execute(self.service.files().create(
                 body=file_metadata,
                 fields='id'
-            ).execute()
+            ), "files.create")
             
             print(f"✅ Created folder: {folder_name}")
             return folder['id']
@@ -128,10 +299,21 @@ class GoogleDriveManager:
             print(f"Error creating folder: {e}")
             return None
     
+    def get_folder_cache(self):
+        """Get the folder-ID cache, loading it from the state database on first use"""
+        with self._folder_lock:
+            if self._folder_ids is None:
+                self._folder_ids = self.state_manager.get_drive_folders() if self.state_manager else {}
+            return self._folder_ids
+    
     def get_or_create_folder(self, folder_name, parent_id='root'):
         """
         Get folder ID, create if doesn't exist
         
+        Cached IDs are returned without any API call; a miss is looked up
+        (or created) in Drive and cached. The lookup holds the folder lock,
+        so two threads missing the same folder cannot both create it.
+        
         Args:
             folder_name: Name of folder
             parent_id: Parent folder ID
@@ -139,10 +321,83 @@ class GoogleDriveManager:
         Returns:
             Folder ID
         """
-        folder_id = self.find_folder_by_name(folder_name, parent_id)
-        if not folder_id:
-            folder_id = self.create_folder(folder_name, parent_id)
-        return folder_id
+        with self._folder_lock:
+            cache = self.get_folder_cache()
+            folder_id = cache.get((parent_id, folder_name))
+            if folder_id:
+                return folder_id
+            
+            folder_id = self.find_folder_by_name(folder_name, parent_id)
+            if not folder_id:
+                folder_id = self.create_folder(folder_name, parent_id)
+            
+            if folder_id:
+                cache[(parent_id, folder_name)] = folder_id
+                if self.state_manager:
+                    self.state_manager.save_drive_folder(parent_id, folder_name, folder_id)
+            return folder_id
+    
+    def resolve_folder_path(self, folder_path, parent_id='root'):
+        """
+        Get the ID of a nested folder such as "Archive/2024/Reports",
+        creating missing segments
+        
+        Args:
+            folder_path: "/"-separated folder names
+            parent_id: Folder the path starts from
+        
+        Returns:
+            Folder ID or None
+        """
+        for folder_name in filter(None, folder_path.split("/")):
+            parent_id = self.get_or_create_folder(folder_name, parent_id)
+            if not parent_id:
+                return None
+        return parent_id
+    
+    def invalidate_folder(self, folder_id):
+        """Drop a folder, and every cached folder inside it, from the folder-ID cache"""
+        with self._folder_lock:
+            cache = self.get_folder_cache()
+            stale = {folder_id}
+            while True:
+                inside = {cached_id for (parent_id, _), cached_id in cache.items()
+                          if parent_id in stale and cached_id not in stale}
+                if not inside:
+                    break
+                stale |= inside
+            
+            for key in [key for key, cached_id in cache.items() if cached_id in stale]:
+                del cache[key]
+            if self.state_manager:
+                self.state_manager.delete_drive_folders(stale)
+    
+    def validate_folder(self, folder_id):
+        """
+        Check that a cached folder still exists and is not trashed,
+        invalidating it in the cache if it is gone
+        
+        Args:
+            folder_id: Google Drive folder ID
+        
+        Returns:
+            True if the folder is usable
+        """
+        try:
+            folder = self.execute(self.service.files().get(
+                fileId=folder_id,
+                fields='id, trashed'
+            ), "files.get")
+            valid = not folder.get('trashed', False)
+        except Exception as e:
+            if get_http_status(e) != 404:
+                print(f"Error validating folder: {e}")
+                return True  # Unknown; keep the cached ID
+            valid = False
+        
+        if not valid:
+            self.invalidate_folder(folder_id)
+        return valid
     
     def list_files_in_folder(self, folder_id='root', only_root=True):
         """
@@ -153,47 +408,214 @@ class GoogleDriveManager:
             only_root: Only files directly in this folder (not subfolders)
         
         Returns:
-            List of files with id, name, mimeType
+            List of files with id, name, mimeType, parents (every page)
         """
-        try:
-            query = "trashed=false"
-            if folder_id != 'root':
-                query += f" and '{folder_id}' in parents"
-            elif only_root:
-                # Only files in root, not in any folder
-                query += " and 'root' in parents"
+        return list(self.iter_files_in_folder(folder_id, only_root))
+    
+    def iter_files_in_folder(self, folder_id='root', only_root=True, fields=None,
+                             page_size=None, prefetch=None):
+        """
+        Yield files in a folder as listing pages arrive
+        
+        Follows nextPageToken through every page. With prefetch, the next page
+        is requested in a background thread while the caller processes the
+        current one.
+        
+        Args:
+            folder_id: Folder ID (default: root)
+            only_root: Only files directly in this folder (not subfolders)
+            fields: Per-file fields to request (default: DRIVE_LIST_FIELDS)
+            page_size: Files per page (default: DRIVE_PAGE_SIZE)
+            prefetch: Fetch pages ahead (default: DRIVE_PREFETCH_PAGES)
+        
+        Yields:
+            File dicts with the requested fields
+        """
+        query = "trashed=false"
+        if folder_id != 'root':
+            query += f" and '{folder_id}' in parents"
+        elif only_root:
+            # Only files in root, not in any folder
+            query += " and 'root' in parents"
+        
+        fields = f"nextPageToken, files({fields or DRIVE_LIST_FIELDS})"
+        page_size = page_size or DRIVE_PAGE_SIZE
+        if prefetch is None:
+            prefetch = DRIVE_PREFETCH_PAGES
+        
+        if not prefetch:
+            for page in self.iter_list_pages(self.service, query, fields, page_size):
+                yield from page
+            return
+        
+        # A single background thread fetches pages in order, one page ahead
+        pages = self.iter_list_pages(self.build_service(), query, fields, page_size)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(next, pages, None)
+            while True:
+                page = future.result()
+                if page is None:
+                    break
+                future = executor.submit(next, pages, None)
+                yield from page
+    
+    def iter_list_pages(self, service, query, fields, page_size):
+        """
+        Yield each page of a files().list query
+        
+        Args:
+            service: Drive service to issue the requests on
+            query: Drive search query
+            fields: Field mask including nextPageToken
+            page_size: Files per page
+        
+        Yields:
+            List of file dicts per page
+        """
+        page_token = None
+        while True:
+            try:
+                response = self.execute(service.files().list(
+                    q=query,
+                    spaces='drive',
+                    fields=fields,
+                    pageSize=page_size,
+                    pageToken=page_token
+                ), "files.list")
+            except Exception as e:
+                print(f"Error listing files: {e}")
+                return
             
-            results = self.service.files().list(
-                q=query,
-                spaces='drive',
-                fields='files(id, name, mimeType, parents)',
-                pageSize=100
-            ).execute()
+            yield response.get('files', [])
             
-            return results.get('files', [])
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return
+    
+    def get_root_folder_id(self):
+        """
+        Get the real ID of My Drive's root folder
+        
+        The Changes API reports parents by ID, not by the 'root' alias.
+        
+        Returns:
+            Root folder ID (looked up once per manager)
+        """
+        if self._root_id is None:
+            try:
+                self._root_id = self.execute(self.service.files().get(
+                    fileId='root',
+                    fields='id'
+                ), "files.get")['id']
+            except Exception as e:
+                print(f"Error getting root folder: {e}")
+                return 'root'
+        return self._root_id
+    
+    def get_start_page_token(self):
+        """
+        Get a Changes API page token for the current state of the Drive
+        
+        Returns:
+            Page token, or None on error
+        """
+        try:
+            response = self.execute(self.service.changes().getStartPageToken(),
+                                    "changes.getStartPageToken")
+            return response.get('startPageToken')
         except Exception as e:
-            print(f"Error listing files: {e}")
-            return []
+            print(f"Error getting start page token: {e}")
+            return None
     
-    def download_file_content(self, file_id):
+    def list_changes(self, page_token, fields=None, page_size=None):
+        """
+        List every change since a page token, following nextPageToken
+        
+        Args:
+            page_token: Token saved from a previous sync
+            fields: Per-file fields to request (default: DRIVE_LIST_FIELDS)
+            page_size: Changes per page (default: DRIVE_PAGE_SIZE)
+        
+        Returns:
+            (changes, new_start_page_token); each change has fileId, removed
+            and file (the file's current state, including trashed). Returns
+            (None, None) on error, e.g. an expired token, so the caller can
+            fall back to a full listing.
+        """
+        fields = (f"nextPageToken, newStartPageToken, "
+                  f"changes(fileId, removed, file({fields or DRIVE_LIST_FIELDS}, trashed))")
+        page_size = page_size or DRIVE_PAGE_SIZE
+        changes = []
+        
+        while True:
+            try:
+                response = self.execute(self.service.changes().list(
+                    pageToken=page_token,
+                    spaces='drive',
+                    fields=fields,
+                    pageSize=page_size,
+                    includeRemoved=True,
+                    restrictToMyDrive=True
+                ), "changes.list")
+            except Exception as e:
+                print(f"Error listing changes: {e}")
+                return None, None
+            
+            changes.extend(response.get('changes', []))
+            
+            # The last page carries newStartPageToken instead of nextPageToken
+            if 'newStartPageToken' in response:
+                return changes, response['newStartPageToken']
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return changes, None
+    
+    def download_file_content(self, file_id, max_bytes=None):
         """
         Download file content as bytes
         
         Args:
             file_id: Google Drive file ID
+            max_bytes: Only download this many leading bytes (HTTP Range
+                       request); None downloads the whole file
         
         Returns:
             File content as bytes or None
         """
         try:
             request = self.service.files().get_media(fileId=file_id)
-            file_content = io.BytesIO()
-            downloader = request.execute()
-            return downloader
+            if max_bytes:
+                request.headers['Range'] = f"bytes=0-{max_bytes - 1}"
+            return self.execute(request, "files.get_media")
         except Exception as e:
             print(f"Error downloading file: {e}")
             return None
     
+    def export_file_text(self, file_id, mime_type, max_bytes=None):
+        """
+        Export a Google Docs/Sheets/Slides file as plain text (CSV for sheets)
+        
+        Args:
+            file_id: Google Drive file ID
+            mime_type: The file's Google-native MIME type
+            max_bytes: Keep only this many leading bytes (exports cannot be ranged)
+        
+        Returns:
+            Exported bytes, or None if the type cannot be exported as text
+        """
+        export_type = self.TEXT_EXPORT_TYPES.get(mime_type)
+        if not export_type:
+            return None
+        try:
+            content = self.execute(
+                self.service.files().export(fileId=file_id, mimeType=export_type),
+                "files.export"
+            )
+            return content[:max_bytes] if max_bytes else content
+        except Exception as e:
+            print(f"Error exporting file: {e}")
+            return None
+    
     def get_file_metadata(self, file_id):
         """
         Get file metadata
@@ -205,48 +627,170 @@ class GoogleDriveManager:
             File metadata dict
         """
         try:
-            file = self.service.files().get(
+            file = self.execute(self.service.files().get(
                 fileId=file_id,
                 fields='id, name, mimeType, parents'
-            ).execute()
+            ), "files.get")
             return file
         except Exception as e:
             print(f"Error getting file metadata: {e}")
             return None
     
-    def move_file(self, file_id, new_parent_id):
+    def move_file(self, file_id, new_parent_id, previous_parents=None):
         """
         Move file to a different folder
         
         Args:
             file_id: Google Drive file ID
             new_parent_id: New parent folder ID
+            previous_parents: Current parent IDs, if already known (e.g. from
+                              the listing); fetched when None
         
         Returns:
             Success status
         """
         try:
             # Get current parents
-            file = self.service.files().get(
-                fileId=file_id,
-                fields='parents'
-            ).execute()
+            if previous_parents is None:
+                file = self.execute(self.service.files().get(
+                    fileId=file_id,
+                    fields='parents'
+                ), "files.get")
+                previous_parents = file.get('parents', [])
             
-            previous_parents = ",".join(file.get('parents', []))
+            previous_parents = ",".join(previous_parents)
             
             # Move file
-            self.service.files().update(
+            file = self.execute(self.service.files().update(
                 fileId=file_id,
                 addParents=new_parent_id,
                 removeParents=previous_parents,
-                fields='id, parents'
-            ).execute()
+                fields='id, parents, trashed'
+            ), "files.update")
             
+            # Moving into a trashed folder succeeds but trashes the file
+            if file.get('trashed'):
+                print(f"Error moving file: target folder {new_parent_id} is trashed")
+                return False
             return True
         except Exception as e:
             print(f"Error moving file: {e}")
             return False
     
+    def move_files(self, moves, batch_size=None, max_retries=None):
+        """
+        Move many files using batched HTTP requests
+        
+        Up to batch_size updates share one HTTP round trip. Items that fail
+        inside a batch are retried, alone, with exponential backoff.
+        
+        Args:
+            moves: Iterable of (file_id, new_parent_id) or
+                   (file_id, new_parent_id, previous_parents) tuples; parents
+                   missing from a tuple are fetched in batches first
+            batch_size: Requests per batch (default: DRIVE_BATCH_SIZE)
+            max_retries: Retries for failed items (default: DRIVE_MAX_RETRIES)
+        
+        Returns:
+            Dict of file_id -> {"status": "success" | "error", "message": str}
+        """
+        batch_size = batch_size or DRIVE_BATCH_SIZE
+        if max_retries is None:
+            max_retries = DRIVE_MAX_RETRIES
+        
+        moves = [tuple(move) + (None,) * (3 - len(move)) for move in moves]
+        results = {}
+        
+        # Look up current parents for moves that did not supply them
+        known_parents = {}
+        missing = {
+            file_id: lambda file_id=file_id: self.service.files().get(fileId=file_id, fields='parents')
+            for file_id, _, parents in moves if parents is None
+        }
+        for file_id, (response, error) in self.execute_batched(
+                missing, batch_size, max_retries, "files.get").items():
+            if error:
+                results[file_id] = {"status": "error", "message": f"Error getting parents: {error}"}
+            else:
+                known_parents[file_id] = response.get('parents', [])
+        
+        requests = {}
+        for file_id, new_parent_id, parents in moves:
+            if file_id in results:
+                continue
+            if parents is None:
+                parents = known_parents[file_id]
+            requests[file_id] = (
+                lambda file_id=file_id, new_parent_id=new_parent_id, parents=parents:
+                self.service.files().update(
+                    fileId=file_id,
+                    addParents=new_parent_id,
+                    removeParents=",".join(parents),
+                    fields='id, parents, trashed'
+                )
+            )
+        
+        for file_id, (response, error) in self.execute_batched(
+                requests, batch_size, max_retries, "files.update").items():
+            if error:
+                results[file_id] = {"status": "error", "message": f"Error moving file: {error}"}
+            elif response.get('trashed'):
+                # Moving into a trashed folder succeeds but trashes the file
+                results[file_id] = {"status": "error", "message": "Error moving file: target folder is trashed"}
+            else:
+                results[file_id] = {"status": "success", "message": "Moved"}
+        
+        return results
+    
+    def execute_batched(self, requests, batch_size, max_retries, method):
+        """
+        Execute requests in HTTP batches, retrying only the items that
+        failed with a retryable error
+        
+        Args:
+            requests: Dict of key -> callable building a fresh request
+                      (a request object cannot be added to two batches)
+            batch_size: Requests per batch
+            max_retries: Rounds of retries for failed requests
+            method: API method name the requests are counted under
+        
+        Returns:
+            Dict of key -> (response, error); error is None on success
+        """
+        outcomes = {}
+        pending = list(requests)
+        
+        for attempt in range(max_retries + 1):
+            if attempt:
+                time.sleep(DRIVE_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            
+            for start in range(0, len(pending), batch_size):
+                keys = pending[start:start + batch_size]
+                
+                def callback(request_id, response, exception):
+                    outcomes[request_id] = (response, exception)
+                
+                for key in keys:
+                    outcomes.pop(key, None)
+                try:
+                    batch = self.service.new_batch_http_request(callback=callback)
+                    for key in keys:
+                        batch.add(requests[key](), request_id=key)
+                    self.track_call("batch")
+                    self.track_call(method, len(keys))
+                    batch.execute()
+                except Exception as e:
+                    # The whole batch failed (e.g. connection error)
+                    for key in keys:
+                        outcomes.setdefault(key, (None, e))
+            
+            pending = [key for key in pending
+                       if outcomes[key][1] is not None and is_retryable(outcomes[key][1])]
+            if not pending:
+                break
+        
+        return outcomes
+    
     def is_file_in_folder(self, file_id, folder_id):
         """
         Check if file is in a specific folder
@@ -259,10 +803,10 @@ class GoogleDriveManager:
             True if file is in folder
         """
         try:
-            file = self.service.files().get(
+            file = self.execute(self.service.files().get(
                 fileId=file_id,
                 fields='parents'
-            ).execute()
+            ), "files.get")
             
             parents = file.get('parents', [])
             return folder_id in parents
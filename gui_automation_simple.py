@@ -265,6 +265,7 @@ class SimplifiedGUI:
                 stats = self.orchestrator.process_all_files(run_id)
                 
                 # Get processed files from database for detailed display
+                self.state_manager.flush()
                 conn = sqlite3.connect(str(Path(self.desktop_path) / "automation.db"))
                 cursor = conn.cursor()
                 try:
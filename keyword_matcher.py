@@ -0,0 +1,171 @@
+"""
+Keyword Matcher Module
+Counts occurrences of many keywords in a single pass over the text
+"""
+
+import re
+from functools import lru_cache
+
+
+class KeywordMatcher:
+    """Multi-keyword matcher compiled once from a list of keywords"""
+
+    def __init__(self, keywords):
+        """
+        Build the matcher
+
+        Args:
+            keywords: Iterable of keywords (matched case-insensitively)
+        """
+        # Longest keywords first so prefix lists are ordered consistently
+        self.keywords = sorted({keyword.lower() for keyword in keywords if keyword},
+                               key=lambda keyword: (-len(keyword), keyword))
+        self.max_length = max((len(keyword) for keyword in self.keywords), default=0)
+
+        # Every keyword that starts where a longer one starts is a prefix of it,
+        # so a hit on the longest keyword also covers its prefixes
+        self.prefixes = {
+            keyword: [other for other in self.keywords if keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+
+        # Zero-width lookahead so every start position is reported, even when
+        # keywords overlap (e.g. "course" inside "courses"); the group holds
+        # the longest keyword starting there
+        if self.keywords:
+            self.pattern = re.compile(f"(?=({_trie_pattern(self.keywords)}))")
+        else:
+            self.pattern = None
+
+    def count(self, text):
+        """
+        Count every keyword in one scan of the text
+
+        Counts follow str.count semantics: occurrences of the same keyword
+        never overlap, while different keywords may share characters.
+
+        Args:
+            text: Text to scan (lowercased internally)
+
+        Returns:
+            Dict mapping lowercased keyword -> number of occurrences
+        """
+        stream = self.stream()
+        stream.feed(text)
+        return stream.finish()
+
+    def stream(self):
+        """Start an incremental count over text that arrives in chunks"""
+        return KeywordStream(self)
+
+
+class KeywordStream:
+    """Incremental keyword counter fed one chunk at a time"""
+
+    def __init__(self, matcher):
+        """
+        Initialize stream
+
+        Args:
+            matcher: KeywordMatcher providing the compiled pattern
+        """
+        self.matcher = matcher
+        self.counts = dict.fromkeys(matcher.keywords, 0)
+        self.chars_fed = 0
+        self._next_start = dict.fromkeys(matcher.keywords, 0)
+        self._pending = ""  # Tail not yet scanned, kept for matches spanning chunks
+        self._offset = 0    # Stream position of _pending[0]
+
+    def feed(self, chunk):
+        """
+        Count keywords in the next chunk of text
+
+        Only the last max_length - 1 characters are held back, so memory
+        stays constant however long the stream is.
+        """
+        if not chunk:
+            return
+        self.chars_fed += len(chunk)
+        buffer = self._pending + chunk.lower()
+
+        # Positions closer than max_length to the end may still grow into a
+        # longer keyword once the next chunk arrives
+        limit = len(buffer) - self.matcher.max_length + 1
+        if limit <= 0:
+            self._pending = buffer
+            return
+
+        self._scan(buffer, limit)
+        self._pending = buffer[limit:]
+        self._offset += limit
+
+    def finish(self):
+        """
+        Count whatever is still held back
+
+        Returns:
+            Dict mapping lowercased keyword -> number of occurrences
+        """
+        self._scan(self._pending, len(self._pending))
+        self._offset += len(self._pending)
+        self._pending = ""
+        return self.counts
+
+    def _scan(self, buffer, limit):
+        """Count keyword occurrences starting before limit in buffer"""
+        if not buffer or self.matcher.pattern is None:
+            return
+
+        counts = self.counts
+        next_start = self._next_start
+        prefixes = self.matcher.prefixes
+
+        for match in self.matcher.pattern.finditer(buffer):
+            position = match.start()
+            if position >= limit:
+                break
+            position += self._offset
+            for keyword in prefixes[match.group(1)]:
+                if position >= next_start[keyword]:
+                    counts[keyword] += 1
+                    next_start[keyword] = position + len(keyword)
+
+
+def _trie_pattern(keywords):
+    """
+    Build a regex alternation shaped like a prefix trie
+
+    Branching one character at a time keeps the regex engine from retrying
+    every keyword at every position, and greedy optional suffixes make the
+    match the longest keyword at that position.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+@lru_cache(maxsize=32)
+def get_matcher(keywords):
+    """
+    Get a cached matcher for a tuple of keywords
+
+    Args:
+        keywords: Tuple of keywords
+
+    Returns:
+        KeywordMatcher instance
+    """
+    return KeywordMatcher(keywords)
@@ -3,12 +3,114 @@ File Orchestrator Module
 Handles file movements with safety checks and state management
 """
 
+import ctypes
+import ctypes.util
+import errno
+import os
 import shutil
 from pathlib import Path
 from classifier import classify_document
+from config import (
+    CLASSIFICATION_KEYWORDS, INCREMENTAL_RUNS, PIPELINE_ENABLED, MOVE_FAST_PATH,
+    SCAN_RECURSIVE, SCAN_MAX_DEPTH, SCAN_INCLUDE, SCAN_EXCLUDE, SCAN_WORKERS,
+    STATE_WRITE_BATCH_SIZE
+)
+from extraction_cache import hash_file
+from file_scanner import iter_files
+from pipeline import FilePipeline
 from state_manager import StateManager
 
 
+# Atomic no-replace rename from libc: renameat2 (Linux) or renamex_np (macOS)
+AT_FDCWD = -100
+RENAME_NOREPLACE = 1  # renameat2 flag
+RENAME_EXCL = 0x4     # renamex_np flag
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True) if os.name != "nt" else None
+except OSError:
+    _libc = None
+_renameat2 = getattr(_libc, "renameat2", None)
+_renamex_np = getattr(_libc, "renamex_np", None)
+
+
+def rename_no_replace(source, destination):
+    """
+    Rename a file, failing instead of replacing an existing destination
+    
+    Uses one atomic syscall where the platform has one (Windows os.rename
+    never replaces); otherwise a hard link plus unlink, which also fails
+    atomically if the destination exists.
+    
+    Raises:
+        FileExistsError: destination already exists
+        FileNotFoundError: source (or the destination folder) does not exist
+        OSError: errno EXDEV when source and destination are on different file systems
+    """
+    if os.name == "nt":
+        os.rename(source, destination)
+        return
+    
+    source_bytes, destination_bytes = os.fsencode(source), os.fsencode(destination)
+    if _renameat2 is not None:
+        result = _renameat2(AT_FDCWD, source_bytes, AT_FDCWD, destination_bytes, RENAME_NOREPLACE)
+    elif _renamex_np is not None:
+        result = _renamex_np(source_bytes, destination_bytes, RENAME_EXCL)
+    else:
+        result = None
+    if result == 0:
+        return
+    if result is not None:
+        error = ctypes.get_errno()
+        # The kernel or file system lacks the flag; use the fallback below
+        if error not in (errno.ENOSYS, errno.EINVAL, errno.ENOTSUP):
+            raise OSError(error, os.strerror(error), str(source), None, str(destination))
+    
+    try:
+        os.link(source, destination)
+    except OSError as e:
+        if e.errno not in (errno.EPERM, errno.ENOTSUP, errno.EMLINK):
+            raise
+        # No hard links on this file system: check, then rename (not atomic)
+        if os.path.lexists(destination):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), str(destination))
+        os.rename(source, destination)
+        return
+    os.unlink(source)
+
+
+def move_across_devices(source, destination):
+    """
+    Copy a file to another file system and remove the original, never
+    replacing an existing destination
+    """
+    with open(source, 'rb') as src, open(destination, 'xb') as dst:
+        try:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        except BaseException:
+            dst.close()
+            os.unlink(destination)
+            raise
+    shutil.copystat(source, destination)
+    os.unlink(source)
+
+
+def move_no_replace(source, destination):
+    """
+    Move a file without replacing an existing destination: a rename, or a
+    copy when source and destination are on different file systems
+    
+    Raises:
+        FileExistsError: destination already exists
+        FileNotFoundError: source (or the destination folder) does not exist
+    """
+    try:
+        rename_no_replace(source, destination)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        move_across_devices(source, destination)
+
+
 class FileOrchestrator:
     """Orchestrates file movements with safety and state tracking"""
     
@@ -22,6 +124,7 @@ class FileOrchestrator:
         """
         self.desktop_path = Path(desktop_path)
         self.state_manager = state_manager or StateManager(desktop_path)
+        self.ready_folders = set()  # Target folders known to exist this run
     
     def get_target_folder(self, category):
         """
@@ -53,12 +156,65 @@ class FileOrchestrator:
             return True
         return False
     
+    def prepare_target_folders(self):
+        """Create every category folder once at the start of a run"""
+        self.ready_folders = set()
+        for category in CLASSIFICATION_KEYWORDS:
+            target_folder = self.get_target_folder(category)
+            if target_folder:
+                self.ensure_folder_exists(target_folder)
+                self.ready_folders.add(target_folder)
+    
     def is_file_in_target(self, file_path, target_folder):
         """Check if file is already in its target folder"""
         file_path = Path(file_path)
         target_folder = Path(target_folder)
         return file_path.parent == target_folder
     
+    def is_state_file(self, file_path):
+        """Check if a file is the state database or one of its WAL/journal files"""
+        if not self.state_manager:
+            return False
+        db_name = self.state_manager.db_path.name
+        return Path(file_path).name in (db_name, f"{db_name}-wal", f"{db_name}-shm", f"{db_name}-journal")
+    
+    def find_reusable_classification(self, file_path, fingerprints):
+        """
+        Look up the stored classification of an unchanged file
+        
+        Fingerprints are stored by the path the file was classified at. A
+        file is unchanged when its size and mtime_ns match the stored
+        fingerprint; if only the mtime differs, the content hash decides.
+        
+        Args:
+            file_path: Path to file
+            fingerprints: Dict from StateManager.get_fingerprints()
+        
+        Returns:
+            (classification or None, fingerprint) where fingerprint is the
+            file's current (file_size, mtime_ns, content_hash) and the
+            classification is the stored one, status and scores included
+        """
+        file_path = Path(file_path)
+        stat = file_path.stat()
+        previous = fingerprints.get(str(file_path.absolute()))
+        reusable = (previous is not None
+                    and self.get_target_folder(previous["classification"].get("category")) is not None)
+        
+        if (reusable and previous["file_size"] == stat.st_size
+                and previous["mtime_ns"] == stat.st_mtime_ns and previous["content_hash"]):
+            content_hash = previous["content_hash"]
+        else:
+            content_hash = hash_file(file_path)
+            reusable = (reusable and previous["file_size"] == stat.st_size
+                        and previous["content_hash"] == content_hash)
+        
+        fingerprint = (stat.st_size, stat.st_mtime_ns, content_hash)
+        if not reusable:
+            return None, fingerprint
+        
+        return dict(previous["classification"]), fingerprint
+    
     def move_file(self, file_path, target_folder):
         """
         Safely move a file to target folder
@@ -78,6 +234,9 @@ class FileOrchestrator:
         file_path = Path(file_path)
         target_folder = Path(target_folder)
         
+        if MOVE_FAST_PATH:
+            return self.rename_file(file_path, target_folder)
+        
         # Check if file exists
         if not file_path.exists():
             return {
@@ -126,13 +285,82 @@ class FileOrchestrator:
                 "message": f"Error moving file: {str(e)}"
             }
     
-    def process_file(self, file_path, run_id=None):
+    def rename_file(self, file_path, target_folder):
+        """
+        Move a file with a single no-replace rename (the MOVE_FAST_PATH of move_file)
+        
+        The rename's own errors replace the stat checks: EEXIST means a file
+        of that name is already in the target, ENOENT that the file is gone
+        (or the folder was removed mid-run, in which case it is re-created
+        and the rename retried). Only a cross-device error falls back to a copy.
+        
+        Returns:
+            Result dict, as from move_file
+        """
+        target_file = target_folder / file_path.name
+        
+        # Check if file is already in target folder (idempotency; no syscall)
+        if self.is_file_in_target(file_path, target_folder):
+            return {
+                "status": "skipped",
+                "source": str(file_path),
+                "destination": str(target_folder),
+                "message": f"File already in target folder: {target_folder.name}"
+            }
+        
+        if target_folder not in self.ready_folders:
+            self.ensure_folder_exists(target_folder)
+            self.ready_folders.add(target_folder)
+        
+        try:
+            try:
+                move_no_replace(file_path, target_file)
+            except FileNotFoundError:
+                if not os.path.lexists(file_path):
+                    raise
+                self.ensure_folder_exists(target_folder)
+                move_no_replace(file_path, target_file)
+        except FileExistsError:
+            return {
+                "status": "error",
+                "source": str(file_path),
+                "destination": str(target_file),
+                "message": f"File already exists in target: {target_file.name}"
+            }
+        except FileNotFoundError:
+            return {
+                "status": "error",
+                "source": str(file_path),
+                "destination": str(target_folder),
+                "message": f"File not found: {file_path.name}"
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "source": str(file_path),
+                "destination": str(target_file),
+                "message": f"Error moving file: {str(e)}"
+            }
+        
+        return {
+            "status": "success",
+            "source": str(file_path),
+            "destination": str(target_file),
+            "message": f"Successfully moved to {target_folder.name}"
+        }
+    
+    def process_file(self, file_path, run_id=None, pending_writes=None, fingerprints=None):
         """
         Process a single file: classify and move
         
         Args:
             file_path: Path to file to process
             run_id: Optional run ID for tracking
+            pending_writes: Optional {"movements": [], "details": [], "fingerprints": []} to collect
+                            state rows for a later bulk write instead of writing now
+            fingerprints: Optional dict from StateManager.get_fingerprints();
+                          when given, unchanged files skip extraction and
+                          classification and the file's fingerprint is stored
         
         Returns:
             {
@@ -141,13 +369,61 @@ class FileOrchestrator:
                 "classification_status": str,
                 "movement_status": str,
                 "movement_result": dict,
-                "overall_status": str
+                "overall_status": str,
+                "reused": bool
             }
         """
         file_path = Path(file_path)
         
+        # Reuse the stored classification if the file is unchanged
+        classification, fingerprint = self.find_stored_classification(file_path, fingerprints)
+        reused = classification is not None
+        
         # Classify the file
-        classification = classify_document(file_path)
+        if classification is None:
+            classification = classify_document(file_path)
+        
+        return self.apply_classification(file_path, classification, fingerprint, reused,
+                                         run_id, pending_writes)
+    
+    def find_stored_classification(self, file_path, fingerprints):
+        """
+        Fingerprint a file and look up its stored classification, if incremental
+        
+        Args:
+            file_path: Path to file
+            fingerprints: Dict from StateManager.get_fingerprints(), or None
+                          when not running incrementally
+        
+        Returns:
+            (classification or None, fingerprint or None)
+        """
+        if fingerprints is None:
+            return None, None
+        try:
+            return self.find_reusable_classification(file_path, fingerprints)
+        except Exception as e:
+            print(f"Error fingerprinting {file_path.name}: {e}")
+            return None, None
+    
+    def apply_classification(self, file_path, classification, fingerprint=None, reused=False,
+                             run_id=None, pending_writes=None):
+        """
+        Move a classified file and record it: the second half of process_file
+        
+        Args:
+            file_path: Path to file
+            classification: Classification result for the file
+            fingerprint: Optional (file_size, mtime_ns, content_hash) to store
+            reused: Whether the classification was reused from the state database
+            run_id: Optional run ID for tracking
+            pending_writes: Optional {"movements": [], "details": [], "fingerprints": []}
+                            collecting state rows instead of writing now
+        
+        Returns:
+            Processing result, as from process_file
+        """
+        file_path = Path(file_path)
         
         # If classification failed, return error
         if classification["status"] == "error":
@@ -158,7 +434,8 @@ class FileOrchestrator:
                 "movement_status": "skipped",
                 "movement_result": None,
                 "overall_status": "error",
-                "reason": classification["reasoning"]
+                "reason": classification["reasoning"],
+                "reused": False
             }
         
         # Get target folder
@@ -171,7 +448,8 @@ class FileOrchestrator:
                 "movement_status": "error",
                 "movement_result": None,
                 "overall_status": "error",
-                "reason": "Invalid category"
+                "reason": "Invalid category",
+                "reused": reused
             }
         
         # Move the file
@@ -179,24 +457,41 @@ class FileOrchestrator:
         
         # Record in state manager if available
         if self.state_manager and movement_result["status"] in ["success", "skipped"]:
-            self.state_manager.record_file_movement(
+            movement = (
                 classification["filename"],
                 classification["category"],
                 classification["confidence_score"],
                 file_path,
                 movement_result["destination"],
-                movement_result["status"]
+                movement_result["status"],
+                fingerprint,
+                classification
             )
+            if pending_writes is not None:
+                pending_writes["movements"].append(movement)
+            else:
+                self.state_manager.record_file_movement(*movement)
+        elif self.state_manager and fingerprint:
+            # The file stays where it is; keep its classification for the next incremental run
+            stored = (file_path, fingerprint, classification)
+            if pending_writes is not None:
+                pending_writes["fingerprints"].append(stored)
+            else:
+                self.state_manager.record_fingerprint(*stored)
         
         # Record run detail if run_id provided
         if run_id and self.state_manager:
-            self.state_manager.record_run_detail(
+            detail = (
                 run_id,
                 classification["filename"],
                 classification,
                 f"Move to {classification['category']}",
                 movement_result["status"]
             )
+            if pending_writes is not None:
+                pending_writes["details"].append(detail)
+            else:
+                self.state_manager.record_run_detail(*detail)
         
         # Determine overall status
         overall_status = "success" if movement_result["status"] in ["success", "skipped"] else "error"
@@ -208,15 +503,72 @@ class FileOrchestrator:
             "classification_status": classification["status"],
             "movement_status": movement_result["status"],
             "movement_result": movement_result,
-            "overall_status": overall_status
+            "overall_status": overall_status,
+            "reused": reused
         }
     
-    def process_all_files(self, run_id=None):
+    def iter_desktop_files(self, recursive=None, max_depth=None, include=None, exclude=None):
+        """
+        Yield the files to classify as the Desktop is scanned
+        
+        Category folders are never descended into: files there are already
+        filed. Defaults come from the SCAN_* settings in config.
+        
+        Args:
+            recursive: Descend into subfolders
+            max_depth: Subfolder levels when recursive (None = unlimited)
+            include: Glob patterns files must match
+            exclude: Glob patterns for files and folders to skip
+        
+        Yields:
+            File paths
+        """
+        if recursive is None:
+            recursive = SCAN_RECURSIVE
+        if recursive:
+            max_depth = SCAN_MAX_DEPTH if max_depth is None else max_depth
+        else:
+            max_depth = 0
+        
+        category_folders = {str(self.get_target_folder(category)) for category in CLASSIFICATION_KEYWORDS}
+        files = iter_files(
+            self.desktop_path,
+            max_depth,
+            SCAN_INCLUDE if include is None else include,
+            SCAN_EXCLUDE if exclude is None else exclude,
+            SCAN_WORKERS if recursive else 1,
+            skip_dir=lambda path: path in category_folders
+        )
+        return (f for f in files if not self.is_state_file(f))
+    
+    def write_state(self, pending_writes):
+        """Write collected state rows in bulk and empty the collection"""
+        if self.state_manager:
+            self.state_manager.record_file_movements(pending_writes["movements"])
+            self.state_manager.record_run_details(pending_writes["details"])
+            self.state_manager.record_fingerprints(pending_writes["fingerprints"])
+        for rows in pending_writes.values():
+            rows.clear()
+    
+    def process_all_files(self, run_id=None, incremental=None, recursive=None, max_depth=None,
+                          include=None, exclude=None, pipeline=None):
         """
         Process all unprocessed files on Desktop
         
+        Files are classified as the scan finds them, so a large tree is
+        never listed in full before work starts.
+        
         Args:
             run_id: Optional run ID for tracking
+            incremental: Reuse stored classifications for unchanged files
+                         (default: INCREMENTAL_RUNS from config)
+            recursive: Also process files in subfolders (default: SCAN_RECURSIVE)
+            max_depth: Subfolder levels when recursive (default: SCAN_MAX_DEPTH)
+            include: Glob patterns files must match (default: SCAN_INCLUDE)
+            exclude: Glob patterns for files and folders to skip (default: SCAN_EXCLUDE)
+            pipeline: Run scan, extraction, classification, moves and state
+                      writes as concurrent stages (default: PIPELINE_ENABLED);
+                      results then arrive in completion order
         
         Returns:
             {
@@ -225,25 +577,55 @@ class FileOrchestrator:
                 "successful_moves": int,
                 "skipped_files": int,
                 "failed": int,
-                "results": list
+                "reused": int,
+                "reevaluated": int,
+                "results": list,
+                "stages": dict (pipeline mode only: per-stage stats from FilePipeline)
             }
         """
-        # Find all files on Desktop (not in folders)
-        files = [f for f in self.desktop_path.iterdir() 
-                if f.is_file() and not f.name.startswith(".")]
+        if incremental is None:
+            incremental = INCREMENTAL_RUNS
+        if pipeline is None:
+            pipeline = PIPELINE_ENABLED
+        self.prepare_target_folders()
+        # Files stream in from the scan (top level only unless recursive)
+        files = self.iter_desktop_files(recursive, max_depth, include, exclude)
         
-        results = []
         stats = {
-            "total_files": len(files),
+            "total_files": 0,
             "processed": 0,
             "successful_moves": 0,
             "skipped_files": 0,
-            "failed": 0
+            "failed": 0,
+            "reused": 0,
+            "reevaluated": 0
         }
         
-        for file_path in files:
-            result = self.process_file(file_path, run_id)
-            results.append(result)
+        # Stored fingerprints are loaded once per run
+        fingerprints = None
+        if incremental and self.state_manager:
+            fingerprints = self.state_manager.get_fingerprints()
+        
+        # Pipeline mode writes state from its own writer thread as it goes;
+        # otherwise state rows are written in bulk every STATE_WRITE_BATCH_SIZE
+        # files, so an interrupted run keeps the records of the files it moved
+        stages = None
+        if pipeline:
+            results, stages = FilePipeline(self).run(files, run_id, fingerprints)
+        else:
+            results = []
+            pending_writes = {"movements": [], "details": [], "fingerprints": []}
+            try:
+                for file_path in files:
+                    results.append(self.process_file(file_path, run_id, pending_writes, fingerprints))
+                    if sum(len(rows) for rows in pending_writes.values()) >= STATE_WRITE_BATCH_SIZE:
+                        self.write_state(pending_writes)
+            finally:
+                self.write_state(pending_writes)
+        
+        for result in results:
+            stats["total_files"] += 1
+            stats["reused" if result["reused"] else "reevaluated"] += 1
             
             if result["overall_status"] == "success":
                 stats["processed"] += 1
@@ -254,10 +636,13 @@ class FileOrchestrator:
             else:
                 stats["failed"] += 1
         
-        return {
+        result = {
             **stats,
             "results": results
         }
+        if stages is not None:
+            result["stages"] = stages
+        return result
 
 
 if __name__ == "__main__":
@@ -0,0 +1,293 @@
+"""
+File Pipeline Module
+Runs scanning, extraction, classification, moves and state writes as
+concurrent stages connected by bounded queues
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from classifier import classify_content, error_result, get_executor_kind
+from config import (
+    PIPELINE_QUEUE_SIZE, PIPELINE_EXTRACT_WORKERS, BATCH_EXECUTOR, STATE_WRITE_BATCH_SIZE
+)
+from file_parser import extract_content
+
+
+# Marks the end of a stage's input
+DONE = object()
+
+
+class StageStats:
+    """Throughput and input-queue depth counters for one pipeline stage"""
+    
+    def __init__(self, workers=1):
+        """
+        Initialize counters
+        
+        Args:
+            workers: Threads running the stage
+        """
+        self.workers = workers
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.depth_samples = 0
+        self.depth_total = 0
+        self.max_queue_depth = 0
+        self._lock = threading.Lock()
+    
+    def record(self, seconds, queue_depth=None):
+        """Count one item that took seconds of work, sampling the input queue depth"""
+        with self._lock:
+            self.items += 1
+            self.busy_seconds += seconds
+            if queue_depth is not None:
+                self.depth_samples += 1
+                self.depth_total += queue_depth
+                self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+    
+    def summary(self, elapsed):
+        """
+        Summarize the stage over a run
+        
+        Args:
+            elapsed: Wall-clock seconds of the run
+        
+        Returns:
+            {
+                "items": int,
+                "busy_seconds": float,
+                "items_per_second": float (per second of work, one worker),
+                "utilization": float (0-1, busy time over the workers' wall time),
+                "avg_queue_depth": float,
+                "max_queue_depth": int
+            }
+        """
+        return {
+            "items": self.items,
+            "busy_seconds": self.busy_seconds,
+            "items_per_second": self.items / self.busy_seconds if self.busy_seconds else 0.0,
+            "utilization": self.busy_seconds / (elapsed * self.workers) if elapsed else 0.0,
+            "avg_queue_depth": self.depth_total / self.depth_samples if self.depth_samples else 0.0,
+            "max_queue_depth": self.max_queue_depth
+        }
+
+
+class FilePipeline:
+    """
+    Staged file processing for FileOrchestrator
+    
+    scan -> extract (N threads) -> classify -> move -> write (single thread)
+    
+    Each queue holds at most queue_size items, so a slow stage makes the
+    stages before it wait instead of buffering the whole tree. Disk reads
+    and hashing (extractor threads), parsing (process pool), scoring,
+    renames and SQLite writes all overlap.
+    """
+    
+    STAGES = ("scan", "extract", "classify", "move", "write")
+    
+    def __init__(self, orchestrator, extract_workers=None, queue_size=None, executor=None):
+        """
+        Initialize pipeline
+        
+        Args:
+            orchestrator: FileOrchestrator whose moves and state rows are used
+            extract_workers: Extractor threads (default: PIPELINE_EXTRACT_WORKERS,
+                             None there means one per CPU)
+            queue_size: Capacity of each queue (default: PIPELINE_QUEUE_SIZE)
+            executor: Where binary formats are parsed: "process", "thread"
+                      or "auto" (default: BATCH_EXECUTOR)
+        """
+        self.orchestrator = orchestrator
+        self.extract_workers = extract_workers or PIPELINE_EXTRACT_WORKERS or os.cpu_count() or 1
+        self.queue_size = queue_size or PIPELINE_QUEUE_SIZE
+        self.executor = executor or BATCH_EXECUTOR
+        self.process_pool = None
+    
+    def run(self, files, run_id=None, fingerprints=None):
+        """
+        Process files through the stages
+        
+        Args:
+            files: Iterable of file paths (consumed by the scan stage as it
+                   goes, so a streaming scan is never listed in full)
+            run_id: Optional run ID for tracking
+            fingerprints: Optional dict from StateManager.get_fingerprints()
+                          (incremental mode)
+        
+        Returns:
+            (results, stage_stats); results are process_file results in
+            completion order, stage_stats maps stage name -> StageStats.summary
+        """
+        queues = {stage: queue.Queue(maxsize=self.queue_size) for stage in self.STAGES[1:]}
+        stats = {stage: StageStats(self.extract_workers if stage == "extract" else 1)
+                 for stage in self.STAGES}
+        results = []
+        
+        if self.executor != "thread":
+            self.process_pool = ProcessPoolExecutor(max_workers=self.extract_workers)
+            # Start the workers now, before the stage threads exist (forking
+            # a process that is running threads can deadlock the child)
+            self.process_pool.submit(os.getpid).result()
+        
+        threads = [threading.Thread(target=self.scan_stage, args=(files, queues, stats))]
+        threads += [threading.Thread(target=self.extract_stage, args=(queues, stats, fingerprints))
+                    for _ in range(self.extract_workers)]
+        threads += [
+            threading.Thread(target=self.classify_stage, args=(queues, stats)),
+            threading.Thread(target=self.move_stage, args=(queues, stats, run_id, results)),
+            threading.Thread(target=self.write_stage, args=(queues, stats))
+        ]
+        
+        start = time.perf_counter()
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            if self.process_pool:
+                self.process_pool.shutdown(wait=True, cancel_futures=True)
+                self.process_pool = None
+        elapsed = time.perf_counter() - start
+        
+        return results, {stage: stats[stage].summary(elapsed) for stage in self.STAGES}
+    
+    def scan_stage(self, files, queues, stats):
+        """Feed discovered files to the extractors"""
+        try:
+            files = iter(files)
+            while True:
+                started = time.perf_counter()
+                try:
+                    file_path = next(files)
+                except StopIteration:
+                    break
+                stats["scan"].record(time.perf_counter() - started)
+                queues["extract"].put(Path(file_path))
+        except Exception as e:
+            print(f"Error scanning files: {e}")
+        finally:
+            for _ in range(self.extract_workers):
+                queues["extract"].put(DONE)
+    
+    def extract_stage(self, queues, stats, fingerprints):
+        """Fingerprint files and extract their text (binary formats in the process pool)"""
+        while True:
+            file_path = queues["extract"].get()
+            if file_path is DONE:
+                queues["classify"].put(DONE)
+                return
+            started = time.perf_counter()
+            depth = queues["extract"].qsize()
+            item = {"file_path": file_path, "content": None}
+            try:
+                item["classification"], item["fingerprint"] = \
+                    self.orchestrator.find_stored_classification(file_path, fingerprints)
+                item["reused"] = item["classification"] is not None
+                if not item["reused"]:
+                    if not file_path.exists():
+                        item["classification"] = error_result(file_path.name, f"File not found: {file_path}")
+                    else:
+                        item["filename"], item["content"] = self.extract(file_path)
+                        if item["filename"] is None:
+                            item["classification"] = error_result(
+                                file_path.name, "Could not extract content from file")
+            except Exception as e:
+                item["classification"] = error_result(file_path.name, f"Classification failed: {e}")
+                item.setdefault("fingerprint", None)
+                item.setdefault("reused", False)
+            stats["extract"].record(time.perf_counter() - started, depth)
+            queues["classify"].put(item)
+    
+    def extract(self, file_path):
+        """Extract (filename, content), in the process pool for CPU-bound formats"""
+        if self.process_pool and get_executor_kind(file_path, self.executor) == "process":
+            return self.process_pool.submit(extract_content, file_path).result()
+        return extract_content(file_path)
+    
+    def classify_stage(self, queues, stats):
+        """Score extracted text; ends once every extractor has finished"""
+        remaining = self.extract_workers
+        while remaining:
+            item = queues["classify"].get()
+            if item is DONE:
+                remaining -= 1
+                continue
+            started = time.perf_counter()
+            depth = queues["classify"].qsize()
+            if item["classification"] is None:
+                try:
+                    item["classification"] = classify_content(item["filename"], item["content"])
+                except Exception as e:
+                    item["classification"] = error_result(item["file_path"].name,
+                                                          f"Classification failed: {e}")
+            item["content"] = None  # Text is not needed past this stage
+            stats["classify"].record(time.perf_counter() - started, depth)
+            queues["move"].put(item)
+        queues["move"].put(DONE)
+    
+    def move_stage(self, queues, stats, run_id, results):
+        """Move classified files, handing their state rows to the writer"""
+        while True:
+            item = queues["move"].get()
+            if item is DONE:
+                queues["write"].put(DONE)
+                return
+            started = time.perf_counter()
+            depth = queues["move"].qsize()
+            pending_writes = {"movements": [], "details": [], "fingerprints": []}
+            try:
+                result = self.orchestrator.apply_classification(
+                    item["file_path"], item["classification"], item["fingerprint"],
+                    item["reused"], run_id, pending_writes
+                )
+            except Exception as e:
+                result = {
+                    "filename": item["file_path"].name,
+                    "category": item["classification"].get("category"),
+                    "classification_status": item["classification"]["status"],
+                    "movement_status": "error",
+                    "movement_result": None,
+                    "overall_status": "error",
+                    "reason": f"Move failed: {e}",
+                    "reused": item["reused"]
+                }
+            results.append(result)
+            stats["move"].record(time.perf_counter() - started, depth)
+            if any(pending_writes.values()):
+                queues["write"].put(pending_writes)
+    
+    def write_stage(self, queues, stats):
+        """The only thread writing state: rows are written in batched transactions"""
+        state_manager = self.orchestrator.state_manager
+        done = False
+        while not done:
+            batch = [queues["write"].get()]
+            depth = queues["write"].qsize()
+            # Take whatever else is already waiting, up to one write batch
+            while len(batch) < STATE_WRITE_BATCH_SIZE:
+                try:
+                    batch.append(queues["write"].get_nowait())
+                except queue.Empty:
+                    break
+            if DONE in batch:
+                done = True
+                batch = [rows for rows in batch if rows is not DONE]
+            if not batch or not state_manager:
+                continue
+            
+            started = time.perf_counter()
+            state_manager.record_file_movements(
+                [movement for rows in batch for movement in rows["movements"]])
+            state_manager.record_run_details(
+                [detail for rows in batch for detail in rows["details"]])
+            state_manager.record_fingerprints(
+                [stored for rows in batch for stored in rows["fingerprints"]])
+            elapsed = time.perf_counter() - started
+            for _ in batch:
+                stats["write"].record(elapsed / len(batch), depth)
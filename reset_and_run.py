@@ -22,11 +22,13 @@ for folder in folders:
                 shutil.move(str(file), str(dest))
                 print(f"↩️  Moved: {file.name}")
 
-# Remove database
+# Remove database (and its WAL files)
 db_path = DESKTOP_PATH / "automation.db"
 if db_path.exists():
     db_path.unlink()
     print("🗑️  Removed old database\n")
+for suffix in ("-wal", "-shm"):
+    Path(f"{db_path}{suffix}").unlink(missing_ok=True)
 
 # Show files on Desktop
 print("=" * 70)
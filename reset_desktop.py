@@ -47,11 +47,13 @@ for old_name in ["UNIVERSITY_DOCS", "TECHNICAL_WORK", "CAPSTONE_WORK"]:
         except:
             pass
 
-# Step 4: Remove database
+# Step 4: Remove database (and its WAL files)
 db_path = DESKTOP_PATH / "automation.db"
 if db_path.exists():
     db_path.unlink()
     print("🗑️  Removed old database")
+for suffix in ("-wal", "-shm"):
+    Path(f"{db_path}{suffix}").unlink(missing_ok=True)
 
 print("\n" + "=" * 70)
 print("✅ DESKTOP RESET COMPLETE!")
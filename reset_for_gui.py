@@ -13,11 +13,13 @@ DESKTOP_PATH = Path.home() / "Desktop"
 
 print("[*] Complete Reset Starting...\n")
 
-# Step 1: Remove old database
+# Step 1: Remove old database (and its WAL files)
 db_path = DESKTOP_PATH / "automation.db"
 if db_path.exists():
     db_path.unlink()
     print("[OK] Old database removed")
+for suffix in ("-wal", "-shm"):
+    Path(f"{db_path}{suffix}").unlink(missing_ok=True)
 
 # Step 2: Move all files from folders back to root
 folders = ["University Docs", "Technical Work", "Capstone Work"]
@@ -12,11 +12,13 @@ import time
 # Ensure we have clean state
 DESKTOP_PATH = Path.home() / "Desktop"
 
-# Remove old database
+# Remove old database (and its WAL files)
 db_path = DESKTOP_PATH / "automation.db"
 if db_path.exists():
     db_path.unlink()
     print("✅ Cleaned old database")
+for suffix in ("-wal", "-shm"):
+    Path(f"{db_path}{suffix}").unlink(missing_ok=True)
 
 print("\n" + "=" * 70)
 print("🚀 MAIN OPERATION: Classify & Move 10 Files into Folders")
@@ -3,15 +3,52 @@ State Manager Module
 Manages database for tracking file processing across multiple runs
 """
 
+import atexit
 import sqlite3
 import json
+import threading
+from itertools import groupby
 from pathlib import Path
 from datetime import datetime
+from config import STATE_WRITE_BATCH_SIZE
 
 
 class StateManager:
     """Manages state of processed files in SQLite database"""
     
+    FILE_MOVEMENT_SQL = '''
+        INSERT OR REPLACE INTO processed_files 
+        (filename, category, confidence_score, file_path, destination_path, status, moved_timestamp,
+         file_size, mtime_ns, content_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    RUN_DETAIL_SQL = '''
+        INSERT INTO run_details 
+        (run_id, filename, category, confidence_score, classification_status,
+         keywords_matched, reasoning, extra, action_taken, action_status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    FINGERPRINT_SQL = '''
+        INSERT OR REPLACE INTO file_fingerprints
+        (file_path, file_size, mtime_ns, content_hash, classification, updated_timestamp)
+        VALUES (?, ?, ?, ?, ?, ?)
+    '''
+    
+    RUN_DETAIL_SCORE_SQL = '''
+        INSERT OR REPLACE INTO run_detail_scores (detail_id, category, score)
+        VALUES (?, ?, ?)
+    '''
+    
+    # Classification keys stored in typed columns; anything else goes to "extra"
+    CLASSIFICATION_COLUMNS = (
+        "filename", "category", "confidence_score", "status",
+        "keywords_matched", "reasoning", "all_scores"
+    )
+    
+    SCHEMA_VERSION = 6
+    
     def __init__(self, desktop_path):
         """
         Initialize state manager
@@ -21,13 +58,181 @@ class StateManager:
         """
         self.desktop_path = Path(desktop_path)
         self.db_path = self.desktop_path / "automation.db"
+        self.write_batch_size = STATE_WRITE_BATCH_SIZE
+        self._conn = None
+        self._lock = threading.RLock()
+        self._pending = []  # Buffered (writer, row) writes
+        self._requeued = 0  # Writes kept from a flush the database could not take
         self.init_database()
+        atexit.register(self.close)
+    
+    def connect(self):
+        """Get the long-lived database connection, opening it on first use"""
+        if self._conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0, check_same_thread=False)
+            conn.isolation_level = None  # Autocommit mode; batches use explicit transactions
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent; fsync at checkpoints
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-8000")  # ~8 MB page cache
+            self._conn = conn
+        return self._conn
+    
+    def buffer_write(self, writer, row):
+        """Queue a row for writer, flushing once write_batch_size new writes are pending"""
+        with self._lock:
+            self._pending.append((writer, row))
+            if len(self._pending) >= self._requeued + self.write_batch_size:
+                self.flush()
+    
+    def flush(self):
+        """Write all buffered records in a single transaction (see write_pending)"""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            self._requeued = 0
+            self.write_pending(pending)
+    
+    def write_transaction(self, conn, writes):
+        """Write (writer, row) pairs in one transaction, rolling back on error"""
+        try:
+            conn.execute("BEGIN")
+            # Consecutive rows for the same writer are written together
+            for writer, group in groupby(writes, key=lambda write: write[0]):
+                writer(conn, [row for _, row in group])
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+    
+    def write_pending(self, writes):
+        """
+        Write (writer, row) pairs in one transaction
+        
+        If a row makes the transaction fail (e.g. a constraint), the rows are
+        written one at a time so only the failing rows are dropped and
+        reported. If the database cannot take writes (locked, I/O error),
+        the rows are queued again for the next flush.
+        
+        Must be called with the lock held.
+        
+        Returns:
+            Number of rows written
+        """
+        conn = self.connect()
+        try:
+            self.write_transaction(conn, writes)
+            return len(writes)
+        except sqlite3.OperationalError as e:
+            self.requeue(writes, e)
+            return 0
+        except Exception as e:
+            print(f"Error writing {len(writes)} state rows ({e}); retrying one at a time")
+        
+        written = 0
+        for index, write in enumerate(writes):
+            try:
+                self.write_transaction(conn, [write])
+                written += 1
+            except sqlite3.OperationalError as e:
+                self.requeue(writes[index:], e)
+                break
+            except Exception as e:
+                print(f"Dropped state row {self.describe_write(write)}: {e}")
+        return written
+    
+    def requeue(self, writes, error):
+        """Put writes back at the front of the buffer for the next flush"""
+        self._pending = list(writes) + self._pending
+        self._requeued = len(self._pending)
+        print(f"Error writing state ({error}); keeping {len(writes)} rows for the next flush")
+    
+    def describe_write(self, write):
+        """Name a buffered write in error messages"""
+        writer, row = write
+        filename = row[1] if writer == self.insert_run_details else row[0]
+        return f"{writer.__name__}({filename!r})"
+    
+    def write_many(self, writer, rows):
+        """
+        Write many rows with writer inside one transaction (see write_pending)
+        
+        Returns:
+            Number of rows written
+        """
+        rows = list(rows)
+        with self._lock:
+            # Keep buffered single-row writes ahead of the bulk rows
+            self.flush()
+            return self.write_pending([(writer, row) for row in rows])
+    
+    def insert_file_movements(self, conn, rows):
+        """Insert processed_files rows"""
+        conn.executemany(self.FILE_MOVEMENT_SQL, rows)
+    
+    def insert_fingerprints(self, conn, rows):
+        """Insert file_fingerprints rows"""
+        conn.executemany(self.FINGERPRINT_SQL, rows)
+    
+    def insert_run_details(self, conn, rows):
+        """
+        Insert run_details rows with scores in the run_detail_scores table
+        
+        Args:
+            conn: Connection inside an open transaction
+            rows: (run_id, filename, classification_result, action_taken, action_status) tuples
+        """
+        cursor = conn.cursor()
+        scores = []
+        for run_id, filename, classification, action_taken, action_status in rows:
+            columns, all_scores = self.split_classification(classification)
+            cursor.execute(self.RUN_DETAIL_SQL, (run_id, filename, *columns, action_taken, action_status))
+            detail_id = cursor.lastrowid
+            scores.extend((detail_id, category, score) for category, score in all_scores.items())
+        cursor.executemany(self.RUN_DETAIL_SCORE_SQL, scores)
+    
+    def split_classification(self, classification):
+        """
+        Split a classification dict into typed column values
+        
+        Returns:
+            ((category, confidence_score, classification_status, keywords_matched,
+              reasoning, extra), all_scores)
+        """
+        if not isinstance(classification, dict):
+            extra = json.dumps(classification) if classification is not None else None
+            return (None, None, None, None, None, extra), {}
+        
+        keywords = classification.get("keywords_matched")
+        extra = {k: v for k, v in classification.items() if k not in self.CLASSIFICATION_COLUMNS}
+        columns = (
+            classification.get("category"),
+            classification.get("confidence_score"),
+            classification.get("status"),
+            json.dumps(keywords) if keywords is not None else None,
+            classification.get("reasoning"),
+            json.dumps(extra) if extra else None
+        )
+        return columns, classification.get("all_scores") or {}
+    
+    def close(self):
+        """Flush pending writes and close the connection"""
+        with self._lock:
+            if self._conn is None:
+                return
+            self.flush()
+            if self._pending:
+                print(f"Error: {len(self._pending)} state rows could not be written")
+                self._pending = []
+            self._conn.close()
+            self._conn = None
     
     def init_database(self):
         """Initialize SQLite database with required tables"""
         try:
-            conn = sqlite3.connect(str(self.db_path), timeout=5.0, check_same_thread=False)
-            conn.isolation_level = None  # Autocommit mode
+            conn = self.connect()
             cursor = conn.cursor()
             
             # Create files table
@@ -73,22 +278,150 @@ class StateManager:
                 )
             ''')
             
+            self.migrate(conn)
+            
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
             tables = cursor.fetchall()
-            conn.close()
             
             print(f"[OK] Database initialized - {len(tables)} tables ready")
         except Exception as e:
             print(f"Error initializing database: {e}")
     
+    def migrate(self, conn):
+        """Upgrade an existing database to SCHEMA_VERSION (tracked in PRAGMA user_version)"""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= self.SCHEMA_VERSION:
+            return
+        
+        conn.execute("BEGIN")
+        try:
+            if version < 2:
+                self.migrate_to_v2(conn)
+            if version < 3:
+                self.migrate_to_v3(conn)
+            if version < 4:
+                self.migrate_to_v4(conn)
+            if version < 5:
+                self.migrate_to_v5(conn)
+            if version < 6:
+                self.migrate_to_v6(conn)
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def migrate_to_v2(self, conn):
+        """
+        Schema v2: indexes for per-run and per-file queries, and typed
+        classification columns plus a scores table instead of a JSON blob
+        """
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(run_details)")}
+        for column, column_type in (
+            ("category", "TEXT"),
+            ("confidence_score", "REAL"),
+            ("classification_status", "TEXT"),
+            ("keywords_matched", "TEXT"),
+            ("reasoning", "TEXT"),
+            ("extra", "TEXT"),
+        ):
+            if column not in existing:
+                conn.execute(f"ALTER TABLE run_details ADD COLUMN {column} {column_type}")
+        
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS run_detail_scores (
+                detail_id INTEGER NOT NULL,
+                category TEXT NOT NULL,
+                score REAL NOT NULL,
+                PRIMARY KEY(detail_id, category),
+                FOREIGN KEY(detail_id) REFERENCES run_details(id)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_run_details_run_id ON run_details(run_id)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_run_details_filename ON run_details(filename)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_runs_run_number ON runs(run_number)')
+        
+        # Move existing JSON blobs into the typed columns
+        legacy_rows = conn.execute(
+            'SELECT id, classification_result FROM run_details WHERE classification_result IS NOT NULL'
+        ).fetchall()
+        scores = []
+        for detail_id, blob in legacy_rows:
+            try:
+                classification = json.loads(blob)
+            except ValueError:
+                continue  # Leave unreadable blobs in place
+            columns, all_scores = self.split_classification(classification)
+            conn.execute('''
+                UPDATE run_details
+                SET category = ?, confidence_score = ?, classification_status = ?,
+                    keywords_matched = ?, reasoning = ?, extra = ?, classification_result = NULL
+                WHERE id = ?
+            ''', (*columns, detail_id))
+            scores.extend((detail_id, category, score) for category, score in all_scores.items())
+        conn.executemany(self.RUN_DETAIL_SCORE_SQL, scores)
+        if legacy_rows:
+            print(f"[OK] Migrated {len(legacy_rows)} run details to schema v2")
+    
+    def migrate_to_v3(self, conn):
+        """Schema v3: file fingerprints (size, mtime_ns, content hash) for incremental runs"""
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(processed_files)")}
+        for column, column_type in (
+            ("file_size", "INTEGER"),
+            ("mtime_ns", "INTEGER"),
+            ("content_hash", "TEXT"),
+        ):
+            if column not in existing:
+                conn.execute(f"ALTER TABLE processed_files ADD COLUMN {column} {column_type}")
+    
+    def migrate_to_v4(self, conn):
+        """Schema v4: cache of Google Drive folder IDs by (parent_id, name)"""
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS drive_folders (
+                parent_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                folder_id TEXT NOT NULL,
+                updated_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY(parent_id, name)
+            ) WITHOUT ROWID
+        ''')
+    
+    def migrate_to_v5(self, conn):
+        """Schema v5: Google Drive Changes API page tokens for incremental sync"""
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS drive_sync (
+                sync_key TEXT PRIMARY KEY,
+                page_token TEXT NOT NULL,
+                updated_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            ) WITHOUT ROWID
+        ''')
+    
+    def migrate_to_v6(self, conn):
+        """
+        Schema v6: fingerprints with the full classification, keyed by file
+        path so same-named files in different folders are told apart
+        
+        The v3 columns in processed_files had no status or scores, so
+        fingerprints start empty and are written again on the next run.
+        """
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS file_fingerprints (
+                file_path TEXT PRIMARY KEY,
+                file_size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                classification TEXT NOT NULL,
+                updated_timestamp TIMESTAMP
+            ) WITHOUT ROWID
+        ''')
+    
     def get_run_number(self):
         """Get the next run number"""
         try:
-            conn = sqlite3.connect(str(self.db_path), timeout=5.0)
-            cursor = conn.cursor()
-            cursor.execute('SELECT MAX(run_number) FROM runs')
-            result = cursor.fetchone()[0]
-            conn.close()
+            with self._lock:
+                cursor = self.connect().cursor()
+                cursor.execute('SELECT MAX(run_number) FROM runs')
+                result = cursor.fetchone()[0]
             return (result or 0) + 1
         except Exception as e:
             print(f"Error getting run number: {e}")
@@ -97,119 +430,372 @@ class StateManager:
     def start_run(self):
         """Start a new run and return run_id"""
         try:
-            run_number = self.get_run_number()
-            conn = sqlite3.connect(str(self.db_path), timeout=5.0)
-            conn.isolation_level = None
-            cursor = conn.cursor()
-            cursor.execute(
-                'INSERT INTO runs (run_number) VALUES (?)',
-                (run_number,)
-            )
-            run_id = cursor.lastrowid
-            conn.close()
+            with self._lock:
+                run_number = self.get_run_number()
+                cursor = self.connect().cursor()
+                cursor.execute(
+                    'INSERT INTO runs (run_number) VALUES (?)',
+                    (run_number,)
+                )
+                run_id = cursor.lastrowid
             return run_id, run_number
         except Exception as e:
             print(f"Error starting run: {e}")
             return None, None
     
     def end_run(self, run_id, total_files, successful_moves, failed_moves, skipped_files, notes=""):
-        """Complete a run with summary statistics"""
+        """Complete a run with summary statistics, flushing buffered writes"""
         try:
-            conn = sqlite3.connect(str(self.db_path), timeout=5.0)
-            conn.isolation_level = None
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE runs 
-                SET total_files = ?, successful_moves = ?, failed_moves = ?, skipped_files = ?, notes = ?
-                WHERE id = ?
-            ''', (total_files, successful_moves, failed_moves, skipped_files, notes, run_id))
-            conn.close()
+            with self._lock:
+                self.flush()
+                cursor = self.connect().cursor()
+                cursor.execute('''
+                    UPDATE runs 
+                    SET total_files = ?, successful_moves = ?, failed_moves = ?, skipped_files = ?, notes = ?
+                    WHERE id = ?
+                ''', (total_files, successful_moves, failed_moves, skipped_files, notes, run_id))
         except Exception as e:
             print(f"Error ending run: {e}")
     
     def is_file_processed(self, filename):
         """Check if a file has already been processed"""
         try:
-            conn = sqlite3.connect(str(self.db_path), timeout=5.0)
-            cursor = conn.cursor()
-            cursor.execute('SELECT id FROM processed_files WHERE filename = ?', (filename,))
-            result = cursor.fetchone()
-            conn.close()
+            with self._lock:
+                self.flush()
+                cursor = self.connect().cursor()
+                cursor.execute('SELECT id FROM processed_files WHERE filename = ?', (filename,))
+                result = cursor.fetchone()
             return result is not None
         except Exception as e:
             print(f"Error checking file processed: {e}")
             return False
     
     def record_file_movement(self, filename, category, confidence_score, 
-                            source_path, destination_path, status="moved"):
-        """Record a file movement in the database"""
+                            source_path, destination_path, status="moved", fingerprint=None,
+                            classification=None):
+        """
+        Record a file movement in the database (buffered until flush)
+        
+        fingerprint is an optional (file_size, mtime_ns, content_hash) tuple
+        used by incremental runs to recognise unchanged files; with the
+        classification it is also stored under source_path for reuse.
+        """
         try:
-            conn = sqlite3.connect(str(self.db_path), timeout=5.0)
-            conn.isolation_level = None
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO processed_files 
-                (filename, category, confidence_score, file_path, destination_path, status, moved_timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (filename, category, confidence_score, str(source_path), 
-                  str(destination_path), status, datetime.now().isoformat()))
-            conn.close()
+            timestamp = datetime.now().isoformat()
+            self.buffer_write(self.insert_file_movements, (
+                filename, category, confidence_score, str(source_path),
+                str(destination_path), status, timestamp,
+                *(fingerprint or (None, None, None))
+            ))
+            if fingerprint and classification:
+                self.buffer_write(self.insert_fingerprints,
+                                  self.fingerprint_row(source_path, fingerprint, classification, timestamp))
         except Exception as e:
             print(f"Error recording file movement: {e}")
     
+    def record_fingerprint(self, source_path, fingerprint, classification):
+        """
+        Store a file's fingerprint and classification without a movement
+        (buffered until flush), e.g. when the move failed and the file stays put
+        """
+        try:
+            self.buffer_write(self.insert_fingerprints, self.fingerprint_row(
+                source_path, fingerprint, classification, datetime.now().isoformat()))
+        except Exception as e:
+            print(f"Error recording fingerprint: {e}")
+    
+    def fingerprint_row(self, source_path, fingerprint, classification, timestamp):
+        """Build a file_fingerprints row (the path is made absolute, as in get_fingerprints)"""
+        file_size, mtime_ns, content_hash = fingerprint
+        return (str(Path(source_path).absolute()), file_size, mtime_ns, content_hash,
+                json.dumps(classification), timestamp)
+    
     def record_run_detail(self, run_id, filename, classification_result, action_taken, action_status):
-        """Record details of an action taken during a run"""
+        """Record details of an action taken during a run (buffered until flush)"""
         try:
-            conn = sqlite3.connect(str(self.db_path), timeout=5.0)
-            conn.isolation_level = None
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO run_details 
-                (run_id, filename, classification_result, action_taken, action_status)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (run_id, filename, json.dumps(classification_result), action_taken, action_status))
-            conn.close()
+            self.buffer_write(self.insert_run_details, (
+                run_id, filename, classification_result, action_taken, action_status
+            ))
         except Exception as e:
             print(f"Error recording run detail: {e}")
     
+    def record_file_movements(self, movements):
+        """
+        Record many file movements in one transaction
+        
+        Args:
+            movements: Iterable of (filename, category, confidence_score,
+                       source_path, destination_path, status[, fingerprint
+                       [, classification]]) tuples
+        
+        Returns:
+            Number of movement rows written
+        """
+        timestamp = datetime.now().isoformat()
+        try:
+            rows = []
+            fingerprint_rows = []
+            for filename, category, confidence_score, source_path, destination_path, status, *extra in movements:
+                fingerprint = extra[0] if extra else None
+                classification = extra[1] if len(extra) > 1 else None
+                rows.append((filename, category, confidence_score, str(source_path),
+                             str(destination_path), status, timestamp,
+                             *(fingerprint or (None, None, None))))
+                if fingerprint and classification:
+                    fingerprint_rows.append(
+                        self.fingerprint_row(source_path, fingerprint, classification, timestamp))
+            written = self.write_many(self.insert_file_movements, rows)
+            if fingerprint_rows:
+                self.write_many(self.insert_fingerprints, fingerprint_rows)
+            return written
+        except Exception as e:
+            print(f"Error recording file movements: {e}")
+            return 0
+    
+    def record_fingerprints(self, fingerprints):
+        """
+        Store many fingerprints in one transaction
+        
+        Args:
+            fingerprints: Iterable of (source_path, fingerprint, classification) tuples
+        
+        Returns:
+            Number of rows written
+        """
+        timestamp = datetime.now().isoformat()
+        try:
+            return self.write_many(self.insert_fingerprints, [
+                self.fingerprint_row(source_path, fingerprint, classification, timestamp)
+                for source_path, fingerprint, classification in fingerprints
+            ])
+        except Exception as e:
+            print(f"Error recording fingerprints: {e}")
+            return 0
+    
+    def record_run_details(self, details):
+        """
+        Record many run details in one transaction
+        
+        Args:
+            details: Iterable of (run_id, filename, classification_result,
+                     action_taken, action_status) tuples
+        
+        Returns:
+            Number of rows written
+        """
+        try:
+            return self.write_many(self.insert_run_details, details)
+        except Exception as e:
+            print(f"Error recording run details: {e}")
+            return 0
+    
+    def get_fingerprints(self):
+        """
+        Get stored fingerprints and classifications of processed files
+        
+        Returns:
+            Dict of absolute source path -> {"file_size", "mtime_ns",
+            "content_hash", "classification"}; classification is the full
+            result the file was moved with (status, scores, keywords)
+        """
+        with self._lock:
+            self.flush()
+            rows = self.connect().execute('''
+                SELECT file_path, file_size, mtime_ns, content_hash, classification
+                FROM file_fingerprints
+            ''').fetchall()
+        fingerprints = {}
+        for file_path, file_size, mtime_ns, content_hash, classification in rows:
+            try:
+                classification = json.loads(classification)
+            except ValueError:
+                continue
+            fingerprints[file_path] = {
+                "file_size": file_size,
+                "mtime_ns": mtime_ns,
+                "content_hash": content_hash,
+                "classification": classification
+            }
+        return fingerprints
+    
+    def get_drive_folders(self):
+        """
+        Get cached Google Drive folder IDs
+        
+        Returns:
+            Dict of (parent_id, name) -> folder_id
+        """
+        try:
+            with self._lock:
+                rows = self.connect().execute(
+                    'SELECT parent_id, name, folder_id FROM drive_folders'
+                ).fetchall()
+            return {(parent_id, name): folder_id for parent_id, name, folder_id in rows}
+        except Exception as e:
+            print(f"Error reading drive folders: {e}")
+            return {}
+    
+    def save_drive_folder(self, parent_id, name, folder_id):
+        """Cache the ID of the Drive folder called name under parent_id"""
+        try:
+            with self._lock:
+                self.connect().execute('''
+                    INSERT OR REPLACE INTO drive_folders (parent_id, name, folder_id)
+                    VALUES (?, ?, ?)
+                ''', (parent_id, name, folder_id))
+        except Exception as e:
+            print(f"Error saving drive folder: {e}")
+    
+    def delete_drive_folders(self, folder_ids):
+        """Drop cached Drive folders by ID, along with any cached folders inside them"""
+        folder_ids = list(folder_ids)
+        try:
+            with self._lock:
+                conn = self.connect()
+                conn.execute('BEGIN')
+                conn.executemany('DELETE FROM drive_folders WHERE folder_id = ?',
+                                 ((folder_id,) for folder_id in folder_ids))
+                conn.executemany('DELETE FROM drive_folders WHERE parent_id = ?',
+                                 ((folder_id,) for folder_id in folder_ids))
+                conn.execute('COMMIT')
+        except Exception as e:
+            print(f"Error deleting drive folders: {e}")
+    
+    def get_drive_page_token(self, sync_key='root'):
+        """
+        Get the saved Drive Changes API page token
+        
+        Args:
+            sync_key: What the token tracks (one token per synced location)
+        
+        Returns:
+            Page token, or None if no sync has completed yet
+        """
+        try:
+            with self._lock:
+                row = self.connect().execute(
+                    'SELECT page_token FROM drive_sync WHERE sync_key = ?', (sync_key,)
+                ).fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            print(f"Error reading drive page token: {e}")
+            return None
+    
+    def save_drive_page_token(self, page_token, sync_key='root'):
+        """Save the Drive Changes API page token the next sync starts from"""
+        try:
+            with self._lock:
+                self.connect().execute('''
+                    INSERT OR REPLACE INTO drive_sync (sync_key, page_token, updated_timestamp)
+                    VALUES (?, ?, CURRENT_TIMESTAMP)
+                ''', (sync_key, page_token))
+        except Exception as e:
+            print(f"Error saving drive page token: {e}")
+    
     def get_all_processed_files(self):
         """Get all processed files from database"""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM processed_files')
-        results = cursor.fetchall()
-        conn.close()
-        return results
+        with self._lock:
+            self.flush()
+            cursor = self.connect().cursor()
+            cursor.execute('SELECT * FROM processed_files')
+            return cursor.fetchall()
     
     def get_run_summary(self, run_number):
         """Get summary for a specific run"""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM runs WHERE run_number = ?', (run_number,))
-        result = cursor.fetchone()
-        conn.close()
-        return result
+        with self._lock:
+            cursor = self.connect().cursor()
+            cursor.execute('SELECT * FROM runs WHERE run_number = ?', (run_number,))
+            return cursor.fetchone()
     
     def get_all_runs_summary(self):
         """Get summary for all runs"""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM runs ORDER BY run_number')
-        results = cursor.fetchall()
-        conn.close()
-        return results
+        with self._lock:
+            cursor = self.connect().cursor()
+            cursor.execute('SELECT * FROM runs ORDER BY run_number')
+            return cursor.fetchall()
+    
+    def get_run_details(self, run_id):
+        """Get every action recorded for a run (uses the run_id index)"""
+        return self.query_run_details('WHERE d.run_id = ?', (run_id,))
+    
+    def get_file_history(self, filename):
+        """Get every action recorded for a file across runs (uses the filename index)"""
+        return self.query_run_details('WHERE d.filename = ?', (filename,))
+    
+    def query_run_details(self, where, params):
+        """
+        Fetch run_details rows and rebuild their classification dicts
+        
+        Args:
+            where: WHERE clause on run_details aliased as d
+            params: Query parameters
+        
+        Returns:
+            List of dicts with id, run_id, filename, classification,
+            action_taken, action_status and timestamp
+        """
+        with self._lock:
+            self.flush()
+            conn = self.connect()
+            rows = conn.execute(f'''
+                SELECT d.id, d.run_id, d.filename, d.category, d.confidence_score,
+                       d.classification_status, d.keywords_matched, d.reasoning, d.extra,
+                       d.classification_result, d.action_taken, d.action_status, d.timestamp
+                FROM run_details d {where} ORDER BY d.id
+            ''', params).fetchall()
+            scores = {}
+            for detail_id, category, score in conn.execute(f'''
+                SELECT s.detail_id, s.category, s.score
+                FROM run_detail_scores s JOIN run_details d ON d.id = s.detail_id {where}
+            ''', params):
+                scores.setdefault(detail_id, {})[category] = score
+        
+        details = []
+        for (detail_id, run_id, filename, category, confidence_score, classification_status,
+             keywords_matched, reasoning, extra, blob, action_taken, action_status, timestamp) in rows:
+            if blob is not None:
+                # Row written before schema v2 that could not be migrated
+                classification = json.loads(blob)
+            else:
+                extra = json.loads(extra) if extra else {}
+                if not isinstance(extra, dict):
+                    classification = extra
+                else:
+                    classification = {
+                        "filename": filename,
+                        "category": category,
+                        "confidence_score": confidence_score,
+                        "keywords_matched": json.loads(keywords_matched) if keywords_matched else [],
+                        "reasoning": reasoning,
+                        "all_scores": scores.get(detail_id, {}),
+                        "status": classification_status,
+                        **extra
+                    }
+            details.append({
+                "id": detail_id,
+                "run_id": run_id,
+                "filename": filename,
+                "classification": classification,
+                "action_taken": action_taken,
+                "action_status": action_status,
+                "timestamp": timestamp
+            })
+        return details
     
     def clear_database(self):
         """Clear all data from database (use with caution!)"""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM run_details')
-        cursor.execute('DELETE FROM runs')
-        cursor.execute('DELETE FROM processed_files')
-        conn.commit()
-        conn.close()
+        with self._lock:
+            self._pending = []
+            conn = self.connect()
+            conn.execute('BEGIN')
+            conn.execute('DELETE FROM run_detail_scores')
+            conn.execute('DELETE FROM run_details')
+            conn.execute('DELETE FROM runs')
+            conn.execute('DELETE FROM processed_files')
+            conn.execute('DELETE FROM file_fingerprints')
+            conn.execute('DELETE FROM drive_folders')
+            conn.execute('DELETE FROM drive_sync')
+            conn.execute('COMMIT')
         print("⚠️  Database cleared")
 
 
@@ -242,3 +828,5 @@ if __name__ == "__main__":
     # Test retrieve summary
     summary = manager.get_run_summary(run_number)
     print(f"Run summary: {summary}")
+    
+    manager.close()